@@ -0,0 +1,352 @@
+"""
+ALT Landmark Heuristics (A*, Landmarks, Triangle inequality)
+
+A static map is preprocessed once: k landmark cells are chosen by
+farthest-point selection and the exact distance from every landmark to every
+cell is stored. For any landmark L the triangle inequality gives an
+admissible, consistent lower bound on the distance between n and t:
+
+    h(n, t) = max over L of |d(L, t) - d(L, n)|
+
+On maze-like maps with long detours this is far tighter than Manhattan
+distance, which ignores walls, so A* stops degenerating into Dijkstra.
+
+Preprocessing: O(k * (V + E) log V) time, O(k * V) space
+Query heuristic: O(k) per call
+
+Distance tables are flat `array` buffers (4 bytes per cell per landmark for
+unit-cost movement, 8 for octile) and can be saved to / loaded from disk so
+a static map is preprocessed only once.
+"""
+
+import heapq
+import math
+import struct
+import zlib
+from array import array
+from collections import deque
+
+from astar import MOVEMENT_MODELS
+
+# Sentinel stored for cells a landmark cannot reach in integer tables
+UNREACHABLE = 0xFFFFFFFF
+
+_MAGIC = b'ALT1'
+_HEADER = struct.Struct('<4sIIIB?cI')
+
+# Movement model <-> header byte; unit-cost models use BFS and 'I' tables
+_MODEL_CODES = {'cardinal': 0, 'octile': 1, 'diagonal': 2}
+_MODEL_NAMES = {code: name for name, code in _MODEL_CODES.items()}
+_UNIT_COST = ('cardinal', 'diagonal')
+
+
+def _moves(movement):
+    """Return neighbour offsets (dr, dc, cost) for a movement model."""
+    if movement not in MOVEMENT_MODELS:
+        raise ValueError(f"Unknown movement model: {movement}")
+    return MOVEMENT_MODELS[movement][0]
+
+
+def grid_checksum(grid):
+    """
+    CRC32 of the wall layout, stored with the tables to detect stale files.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+
+    Returns:
+        int: Checksum of the grid cells
+    """
+    return zlib.crc32(bytes(1 if cell else 0 for row in grid for cell in row))
+
+
+def landmark_distances(grid, source, movement='cardinal', corner_cutting=False):
+    """
+    Exact distance from one cell to every cell of the grid.
+
+    Unit-cost movement (cardinal, diagonal) uses BFS, octile movement
+    uses Dijkstra.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+        source (tuple): Landmark position (row, col)
+        movement (str): 'cardinal', 'octile' or 'diagonal'
+        corner_cutting (bool): Allow diagonal steps between two walls'
+            corners (must match the search the table is used with)
+
+    Returns:
+        array: Flat distances indexed by row * cols + col; UNREACHABLE
+        ('I' tables) or inf ('d' tables) for cells that cannot be reached
+    """
+    rows, cols = len(grid), len(grid[0])
+    moves = _moves(movement)
+    source_index = source[0] * cols + source[1]
+
+    if movement in _UNIT_COST:
+        dist = array('I', [UNREACHABLE]) * (rows * cols)
+        dist[source_index] = 0
+        queue = deque([source_index])
+        while queue:
+            index = queue.popleft()
+            row, col = divmod(index, cols)
+            next_dist = dist[index] + 1
+            for dr, dc, _ in moves:
+                new_row, new_col = row + dr, col + dc
+                if not (0 <= new_row < rows and 0 <= new_col < cols and grid[new_row][new_col] == 0):
+                    continue
+                if dr != 0 and dc != 0 and not corner_cutting and (
+                        grid[row][new_col] != 0 or grid[new_row][col] != 0):
+                    continue
+                new_index = new_row * cols + new_col
+                if dist[new_index] == UNREACHABLE:
+                    dist[new_index] = next_dist
+                    queue.append(new_index)
+        return dist
+
+    dist = array('d', [math.inf]) * (rows * cols)
+    dist[source_index] = 0.0
+    pq = [(0.0, source_index)]
+    while pq:
+        current_dist, index = heapq.heappop(pq)
+        if current_dist > dist[index]:
+            continue
+        row, col = divmod(index, cols)
+        for dr, dc, step_cost in moves:
+            new_row, new_col = row + dr, col + dc
+            if not (0 <= new_row < rows and 0 <= new_col < cols and grid[new_row][new_col] == 0):
+                continue
+            if dr != 0 and dc != 0 and not corner_cutting and (
+                    grid[row][new_col] != 0 or grid[new_row][col] != 0):
+                continue
+            new_index = new_row * cols + new_col
+            new_dist = current_dist + step_cost
+            if new_dist < dist[new_index]:
+                dist[new_index] = new_dist
+                heapq.heappush(pq, (new_dist, new_index))
+    return dist
+
+
+class LandmarkTable:
+    """
+    Precomputed landmark distance tables for one static grid.
+
+    Build with build_landmarks() or LandmarkTable.load(). The heuristic()
+    method has the same (a, b) signature as the Manhattan `heuristic` of
+    the grid pathfinders and can be passed wherever they accept a
+    `heuristic_fn`.
+    """
+
+    def __init__(self, rows, cols, movement, corner_cutting, landmarks, tables, checksum=0):
+        self.rows = rows
+        self.cols = cols
+        self.movement = movement
+        self.corner_cutting = corner_cutting
+        self.landmarks = landmarks
+        self.tables = tables
+        self.checksum = checksum
+
+    def heuristic(self, a, b):
+        """
+        Admissible ALT lower bound on the distance between two cells.
+
+        Args:
+            a (tuple): First point (row, col)
+            b (tuple): Second point (row, col)
+
+        Returns:
+            float: max over landmarks of |d(L, b) - d(L, a)|; inf if a and
+            b lie in different connected regions
+        """
+        index_a = a[0] * self.cols + a[1]
+        index_b = b[0] * self.cols + b[1]
+        unreachable = UNREACHABLE if self.movement in _UNIT_COST else math.inf
+        best = 0
+        for dist in self.tables:
+            da, db = dist[index_a], dist[index_b]
+            if da == unreachable or db == unreachable:
+                if da != db:
+                    # Exactly one of the cells is connected to this landmark
+                    return math.inf
+                continue
+            bound = da - db if da > db else db - da
+            if bound > best:
+                best = bound
+        return best
+
+    __call__ = heuristic
+
+    def save(self, path):
+        """
+        Write the tables to a binary file.
+
+        Layout: fixed header, landmark positions as uint32 pairs, then the
+        k flat distance arrays in native `array` format (little-endian).
+
+        Args:
+            path (str): Destination file path
+        """
+        typecode = 'I' if self.movement in _UNIT_COST else 'd'
+        with open(path, 'wb') as handle:
+            handle.write(_HEADER.pack(
+                _MAGIC, self.rows, self.cols, len(self.landmarks),
+                _MODEL_CODES[self.movement],
+                self.corner_cutting, typecode.encode(), self.checksum,
+            ))
+            positions = array('I', [v for landmark in self.landmarks for v in landmark])
+            _to_little_endian(positions).tofile(handle)
+            for dist in self.tables:
+                _to_little_endian(dist).tofile(handle)
+
+    @classmethod
+    def load(cls, path, grid=None):
+        """
+        Read tables written by save().
+
+        Args:
+            path (str): Source file path
+            grid (list): Optional grid to verify the tables against
+
+        Returns:
+            LandmarkTable: The loaded tables
+
+        Raises:
+            ValueError: If the file is not a landmark table or does not
+                match the given grid
+        """
+        with open(path, 'rb') as handle:
+            magic, rows, cols, k, model, corner_cutting, typecode, checksum = \
+                _HEADER.unpack(handle.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a landmark table file")
+            typecode = typecode.decode()
+            positions = array('I')
+            positions.fromfile(handle, 2 * k)
+            _to_little_endian(positions)
+            tables = []
+            for _ in range(k):
+                dist = array(typecode)
+                dist.fromfile(handle, rows * cols)
+                tables.append(_to_little_endian(dist))
+
+        if grid is not None:
+            if (len(grid), len(grid[0])) != (rows, cols) or grid_checksum(grid) != checksum:
+                raise ValueError("Landmark table does not match the grid")
+
+        landmarks = [(positions[2 * i], positions[2 * i + 1]) for i in range(k)]
+        movement = _MODEL_NAMES[model]
+        return cls(rows, cols, movement, corner_cutting, landmarks, tables, checksum)
+
+
+def _to_little_endian(values):
+    """Byteswap an array in place on big-endian hosts (file format is LE)."""
+    if struct.pack('=I', 1) != struct.pack('<I', 1):
+        values.byteswap()
+    return values
+
+
+def build_landmarks(grid, k=8, movement='cardinal', corner_cutting=False):
+    """
+    Choose k landmarks by farthest-point selection and compute their tables.
+
+    The first landmark is the cell farthest from the first walkable cell;
+    each next landmark is the cell whose distance to the nearest chosen
+    landmark is largest. Cells no landmark reaches yet count as infinitely
+    far, so every disconnected region receives a landmark before any
+    region receives a second one.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+        k (int): Number of landmarks
+        movement (str): 'cardinal' (4-connected, unit cost), 'octile'
+            (8-connected, diagonal cost sqrt(2)) or 'diagonal' (8-connected,
+            unit cost); the same models as astar.MOVEMENT_MODELS
+        corner_cutting (bool): Allow diagonal steps past wall corners
+            (jump_point_search moves this way, astar does not)
+
+    Returns:
+        LandmarkTable: Landmark positions and distance tables
+
+    Raises:
+        ValueError: If the grid is empty, has no walkable cell, k < 1 or
+            the movement model is unknown
+    """
+    if not grid or not grid[0]:
+        raise ValueError("Grid cannot be empty")
+    if k < 1:
+        raise ValueError("At least one landmark is required")
+
+    rows, cols = len(grid), len(grid[0])
+    walkable = [r * cols + c for r in range(rows) for c in range(cols) if grid[r][c] == 0]
+    if not walkable:
+        raise ValueError("Grid has no walkable cell")
+
+    unreachable = UNREACHABLE if movement in _UNIT_COST else math.inf
+
+    def farthest(nearest):
+        best_index, best_dist = walkable[0], -1
+        for index in walkable:
+            d = nearest[index]
+            d = math.inf if d == unreachable else d
+            if d > best_dist:
+                best_index, best_dist = index, d
+        return best_index, best_dist
+
+    # Seed: farthest cell from an arbitrary walkable cell
+    seed = divmod(walkable[0], cols)
+    seed_index, _ = farthest(landmark_distances(grid, seed, movement, corner_cutting))
+
+    landmarks = []
+    tables = []
+    nearest = None
+    candidate = seed_index
+    while len(landmarks) < min(k, len(walkable)):
+        landmark = divmod(candidate, cols)
+        dist = landmark_distances(grid, landmark, movement, corner_cutting)
+        landmarks.append(landmark)
+        tables.append(dist)
+        nearest = dist if nearest is None else array(
+            dist.typecode, map(min, nearest, dist))
+        candidate, candidate_dist = farthest(nearest)
+        if candidate_dist == 0:
+            # Every walkable cell is already a landmark
+            break
+
+    return LandmarkTable(rows, cols, movement, corner_cutting, landmarks, tables,
+                         grid_checksum(grid))
+
+
+# Example usage and test
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from astar import astar_search
+
+    # Serpentine maze: long corridors joined at alternating ends, so the
+    # Manhattan heuristic is badly misled by the walls
+    size = 41
+    maze = [[0] * size for _ in range(size)]
+    for r in range(1, size, 4):
+        for c in range(size):
+            maze[r][c] = 1
+        gap = size - 1 if (r // 4) % 2 == 0 else 0
+        maze[r][gap] = 0
+
+    start_pos, end_pos = (0, 0), (size - 1, 0)
+
+    table = build_landmarks(maze, k=8)
+    print(f"Landmarks: {table.landmarks}")
+
+    manhattan = astar_search(maze, start_pos, end_pos)
+    alt = astar_search(maze, start_pos, end_pos, heuristic_fn=table.heuristic)
+    print(f"Manhattan A*: cost {manhattan.cost}, expansions {manhattan.expansions}")
+    print(f"ALT A*:       cost {alt.cost}, expansions {alt.expansions}")
+    print(f"Expansion reduction: {1 - alt.expansions / manhattan.expansions:.1%}")
+
+    # Persist once, reload for later queries on the same static map
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'maze.alt')
+        table.save(path)
+        loaded = LandmarkTable.load(path, grid=maze)
+        print(f"Reloaded {len(loaded.landmarks)} landmarks, "
+              f"{os.path.getsize(path)} bytes on disk")
+        assert loaded.heuristic(start_pos, end_pos) == table.heuristic(start_pos, end_pos)
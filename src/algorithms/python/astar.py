@@ -1,4 +1,19 @@
 import heapq
+import math
+from collections import namedtuple
+
+SQRT2 = math.sqrt(2)
+
+# Step events of astar_steps(): cell pushed on the heap, cell expanded, cell
+# on the final path (the same codes in every pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+# Result of a single A* run: the path, its total cost and how many nodes
+# were expanded (moved to the closed set) before the goal was reached
+AStarResult = namedtuple('AStarResult', ['path', 'cost', 'expansions'])
+
 
 def heuristic(a, b):
     """
@@ -14,100 +29,407 @@ def heuristic(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
-def astar(grid, start, end):
+def octile_heuristic(a, b):
     """
-    A* Search Algorithm for Pathfinding
-    Time Complexity: O(b^d) where b is branching factor and d is depth
-    Space Complexity: O(b^d)
+    Calculate octile distance: exact cost on an open 8-connected grid where
+    straight steps cost 1 and diagonal steps cost sqrt(2).
     
-    A* is an informed search algorithm that uses heuristics to guide its search.
-    It combines the benefits of Dijkstra's algorithm and greedy best-first search.
+    Args:
+        a (tuple): First point (row, col)
+        b (tuple): Second point (row, col)
+        
+    Returns:
+        float: Octile distance
+    """
+    dr, dc = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+
+
+def chebyshev_heuristic(a, b):
+    """
+    Calculate Chebyshev distance: exact cost on an open 8-connected grid
+    where every step, straight or diagonal, costs 1.
     
-    The algorithm uses:
-    - g(n): Cost from start to current node
-    - h(n): Estimated cost from current node to end (heuristic)
-    - f(n): Total estimated cost = g(n) + h(n)
+    Args:
+        a (tuple): First point (row, col)
+        b (tuple): Second point (row, col)
+        
+    Returns:
+        int: Chebyshev distance
+    """
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+
+CARDINAL_MOVES = [(-1, 0, 1), (1, 0, 1), (0, -1, 1), (0, 1, 1)]
+
+# Movement models: name -> (moves as (dr, dc, cost), matching heuristic)
+MOVEMENT_MODELS = {
+    'cardinal': (CARDINAL_MOVES, heuristic),
+    'octile': (
+        CARDINAL_MOVES + [(-1, -1, SQRT2), (-1, 1, SQRT2), (1, -1, SQRT2), (1, 1, SQRT2)],
+        octile_heuristic,
+    ),
+    'diagonal': (
+        CARDINAL_MOVES + [(-1, -1, 1), (-1, 1, 1), (1, -1, 1), (1, 1, 1)],
+        chebyshev_heuristic,
+    ),
+}
+
+
+def astar_search(grid, start, end, movement='cardinal', weight=1.0, dynamic=False,
+                 heuristic_fn=None, components=None, stats=None, path_builder=None, swamps=None):
+    """
+    A* search engine with a closed set, deep-first tie-breaking and
+    bounded-suboptimal weighted modes.
+    
+    Nodes are ordered by f, ties are broken toward the larger g (the node
+    deeper in the search), so plateaus of equal f are crossed along a
+    single line instead of being expanded breadth-first. Once a node is
+    popped it is closed and never expanded again.
+    
+    Weighted modes trade optimality for speed:
+    - weight w > 1: f = g + w * h, the path costs at most w times the optimum
+    - dynamic=True (Pohl's dynamic weighting): f = g + (1 + e * (1 - d/N)) * h
+      with e = w - 1, d the node depth and N = h(start); the inflation fades
+      out near the goal and the same w bound holds
+    
+    Diagonal models never cut corners: a diagonal step is only allowed when
+    both cells it squeezes between are walkable.
     
     Args:
         grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
         start (tuple): Starting position (row, col)
         end (tuple): Target position (row, col)
+        movement (str): 'cardinal' (4-connected), 'octile' (8-connected,
+            diagonal cost sqrt(2)) or 'diagonal' (8-connected, diagonal cost 1)
+        weight (float): Heuristic weight w >= 1 (1 = optimal A*)
+        dynamic (bool): Use dynamic weighting instead of a constant weight
+        heuristic_fn (callable): Optional admissible h(a, b) replacing the
+            movement model's distance, e.g. LandmarkTable.heuristic from
+            alt_landmarks.py built for the same movement model without
+            corner cutting
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented copy of the search records its counters
+        path_builder (callable): Optional path_builder(start, end, came_from)
+            that builds the returned path from the parent links (came_from
+            maps each reached cell but start to the previous one), e.g.
+            CompactPath.from_parents from path_encoding.py
+        swamps (SwampTable): Optional dead-end regions from swamp_pruning.py
+            built for this grid; regions without an endpoint are skipped
         
     Returns:
-        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+        AStarResult: (path, cost, expansions); path is a list of (row, col)
+        tuples or what path_builder returns; path and cost are None if no
+        path exists
+        
+    Raises:
+        ValueError: If the movement model is unknown, weight < 1 or
+            heuristic_fn belongs to a table built for other moves
     """
+    if movement not in MOVEMENT_MODELS:
+        raise ValueError(f"Unknown movement model: {movement}")
+    if weight < 1:
+        raise ValueError("Heuristic weight must be >= 1")
+    
+    moves, h = MOVEMENT_MODELS[movement]
+    if heuristic_fn is not None:
+        # Landmark tables record the moves they were built for; distances
+        # from other moves are not admissible for this search
+        table = getattr(heuristic_fn, '__self__', heuristic_fn)
+        if getattr(table, 'movement', movement) != movement or getattr(table, 'corner_cutting', False):
+            raise ValueError("heuristic_fn was built for a different movement model")
+        h = heuristic_fn
+    if components is not None and not components.connected(start, end):
+        return AStarResult(None, None, 0)
+    if swamps is not None:
+        grid = swamps.prune(grid, start, end)
+    diagonal = movement != 'cardinal'
+    if stats is not None:
+        return _astar_search_with_stats(grid, start, end, moves, h, diagonal, weight, dynamic, stats,
+                                        path_builder)
     rows, cols = len(grid), len(grid[0])
     
-    # Priority queue: stores (f_score, g_score, row, col)
-    # f_score is used for priority, g_score is used as tiebreaker
-    pq = [(0, 0, start[0], start[1])]
+    # Dynamic weighting: epsilon fades with depth over the anticipated depth N
+    epsilon = weight - 1
+    anticipated_depth = max(chebyshev_heuristic(start, end) if diagonal else heuristic(start, end), 1)
+    depths = {start: 0}
+    
+    def priority(node, g):
+        h_score = h(node, end)
+        if dynamic:
+            fade = max(0.0, 1 - depths[node] / anticipated_depth)
+            return g + (1 + epsilon * fade) * h_score
+        return g + weight * h_score
+    
+    # Priority queue: stores (f_score, -g_score, row, col)
+    # Negated g makes the deeper node win ties on f
+    pq = [(priority(start, 0), 0, start[0], start[1])]
     
     # Dictionary to store g_score (cost from start) for each cell
     g_scores = {start: 0}
     
-    # Dictionary to store f_score (g + h) for each cell
-    f_scores = {start: heuristic(start, end)}
-    
     # Dictionary to reconstruct the path
     came_from = {}
     
-    # Set to track cells in the open set
-    open_set = {start}
-    
-    # Directions: up, down, left, right
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    # Cells already expanded; stale heap entries for them are skipped
+    closed = set()
+    expansions = 0
     
     while pq:
-        current_f, current_g, row, col = heapq.heappop(pq)
+        _, neg_g, row, col = heapq.heappop(pq)
         current = (row, col)
         
-        # Remove from open set
-        open_set.discard(current)
+        if current in closed:
+            continue
+        
+        # Skip stale entries superseded by a cheaper push; with dynamic
+        # weighting the priority is not monotone in g, so a stale entry can
+        # surface before the better one and must not close the cell
+        if -neg_g > g_scores[current]:
+            continue
         
         # If we reached the end, reconstruct the path
         if current == end:
+            if path_builder is not None:
+                return AStarResult(path_builder(start, end, came_from), -neg_g, expansions)
             path = []
             while current in came_from:
                 path.append(current)
                 current = came_from[current]
             path.append(start)
-            return path[::-1]  # Reverse to get start -> end
+            return AStarResult(path[::-1], -neg_g, expansions)  # Reverse to get start -> end
         
-        # Skip if we've already found a better path to this cell
-        if current_g > g_scores.get(current, float('inf')):
-            continue
+        closed.add(current)
+        expansions += 1
+        current_g = -neg_g
         
-        # Explore all 4 directions
-        for dr, dc in directions:
+        for dr, dc, step_cost in moves:
             new_row, new_col = row + dr, col + dc
             neighbor = (new_row, new_col)
             
             # Check if the new position is valid
-            if (0 <= new_row < rows and 
-                0 <= new_col < cols and 
-                grid[new_row][new_col] == 0):
-                
-                # Calculate tentative g_score (cost from start to neighbor)
-                tentative_g = current_g + 1
+            if not (0 <= new_row < rows and
+                    0 <= new_col < cols and
+                    grid[new_row][new_col] == 0):
+                continue
+            if neighbor in closed:
+                continue
+            
+            # No corner cutting through walls on diagonal steps
+            if dr != 0 and dc != 0 and (grid[row][new_col] != 0 or grid[new_row][col] != 0):
+                continue
+            
+            # Calculate tentative g_score (cost from start to neighbor)
+            tentative_g = current_g + step_cost
+            
+            # If we found a better path to this neighbor
+            if tentative_g < g_scores.get(neighbor, float('inf')):
+                came_from[neighbor] = current
+                g_scores[neighbor] = tentative_g
+                if dynamic:
+                    depths[neighbor] = depths[current] + 1
+                heapq.heappush(pq, (priority(neighbor, tentative_g), -tentative_g, new_row, new_col))
+    
+    # No path found
+    return AStarResult(None, None, expansions)
+
+
+def astar_steps(grid, start, end, movement='cardinal', weight=1.0):
+    """
+    Step-by-step A* for visualizers and streaming servers.
+    
+    A generator with the same search order as astar_search() that yields
+    one event per search step instead of running to completion: stop
+    iterating to pause, iterate again to resume and call close() to
+    cancel. Nothing but the search state is kept.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        movement (str): 'cardinal', 'octile' or 'diagonal'
+        weight (float): Heuristic weight w >= 1 (1 = optimal A*)
+        
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN (also for a cheaper re-push),
+        EVENT_CLOSE or EVENT_PATH (the path cells from start to end)
+        
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+        
+    Raises:
+        ValueError: If the movement model is unknown or weight < 1
+    """
+    if movement not in MOVEMENT_MODELS:
+        raise ValueError(f"Unknown movement model: {movement}")
+    if weight < 1:
+        raise ValueError("Heuristic weight must be >= 1")
+    moves, h = MOVEMENT_MODELS[movement]
+    rows, cols = len(grid), len(grid[0])
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    
+    pq = [(weight * h(start, end), 0, start[0], start[1])]
+    g_scores = {start: 0}
+    came_from = {}
+    closed = set()
+    yield start[0] * cols + start[1], EVENT_OPEN
+    
+    while pq:
+        _, neg_g, row, col = heapq.heappop(pq)
+        current = (row, col)
+        if current in closed or -neg_g > g_scores[current]:
+            continue
+        
+        if current == end:
+            path = [end]
+            while path[-1] in came_from:
+                path.append(came_from[path[-1]])
+            path.reverse()
+            for path_row, path_col in path:
+                yield path_row * cols + path_col, EVENT_PATH
+            return path
+        
+        closed.add(current)
+        yield row * cols + col, EVENT_CLOSE
+        current_g = -neg_g
+        
+        for dr, dc, step_cost in moves:
+            new_row, new_col = row + dr, col + dc
+            neighbor = (new_row, new_col)
+            if not (0 <= new_row < rows and
+                    0 <= new_col < cols and
+                    grid[new_row][new_col] == 0):
+                continue
+            if neighbor in closed:
+                continue
+            if dr != 0 and dc != 0 and (grid[row][new_col] != 0 or grid[new_row][col] != 0):
+                continue
+            
+            tentative_g = current_g + step_cost
+            if tentative_g < g_scores.get(neighbor, float('inf')):
+                came_from[neighbor] = current
+                g_scores[neighbor] = tentative_g
+                heapq.heappush(pq, (tentative_g + weight * h(neighbor, end), -tentative_g, new_row, new_col))
+                yield new_row * cols + new_col, EVENT_OPEN
+    
+    return None
+
+
+def _astar_search_with_stats(grid, start, end, moves, h, diagonal, weight, dynamic, stats,
+                             path_builder):
+    """astar_search() with counters; a separate copy so the plain search pays nothing."""
+    rows, cols = len(grid), len(grid[0])
+    epsilon = weight - 1
+    anticipated_depth = max(chebyshev_heuristic(start, end) if diagonal else heuristic(start, end), 1)
+    depths = {start: 0}
+    
+    def priority(node, g):
+        h_score = h(node, end)
+        if dynamic:
+            fade = max(0.0, 1 - depths[node] / anticipated_depth)
+            return g + (1 + epsilon * fade) * h_score
+        return g + weight * h_score
+    
+    pq = [(priority(start, 0), 0, start[0], start[1])]
+    g_scores = {start: 0}
+    came_from = {}
+    closed = set()
+    expansions, pushes, pops, stale, peak = 0, 1, 0, 0, 1
+    
+    try:
+        while pq:
+            _, neg_g, row, col = heapq.heappop(pq)
+            pops += 1
+            current = (row, col)
+            if current in closed or -neg_g > g_scores[current]:
+                stale += 1
+                continue
+            
+            if current == end:
+                if path_builder is not None:
+                    return AStarResult(path_builder(start, end, came_from), -neg_g, expansions)
+                path = []
+                while current in came_from:
+                    path.append(current)
+                    current = came_from[current]
+                path.append(start)
+                return AStarResult(path[::-1], -neg_g, expansions)
+            
+            closed.add(current)
+            expansions += 1
+            current_g = -neg_g
+            
+            for dr, dc, step_cost in moves:
+                new_row, new_col = row + dr, col + dc
+                neighbor = (new_row, new_col)
+                if not (0 <= new_row < rows and
+                        0 <= new_col < cols and
+                        grid[new_row][new_col] == 0):
+                    continue
+                if neighbor in closed:
+                    continue
+                if dr != 0 and dc != 0 and (grid[row][new_col] != 0 or grid[new_row][col] != 0):
+                    continue
                 
-                # If we found a better path to this neighbor
+                tentative_g = current_g + step_cost
                 if tentative_g < g_scores.get(neighbor, float('inf')):
-                    # Update path
                     came_from[neighbor] = current
                     g_scores[neighbor] = tentative_g
-                    
-                    # Calculate f_score = g + h
-                    h_score = heuristic(neighbor, end)
-                    f_score = tentative_g + h_score
-                    f_scores[neighbor] = f_score
-                    
-                    # Add to open set if not already there
-                    if neighbor not in open_set:
-                        open_set.add(neighbor)
-                        heapq.heappush(pq, (f_score, tentative_g, new_row, new_col))
+                    if dynamic:
+                        depths[neighbor] = depths[current] + 1
+                    heapq.heappush(pq, (priority(neighbor, tentative_g), -tentative_g, new_row, new_col))
+                    pushes += 1
+            if len(pq) > peak:
+                peak = len(pq)
+        return AStarResult(None, None, expansions)
+    finally:
+        # Closed cells are never reopened
+        stats.record(expansions, pushes, pops, stale, peak, 0)
+
+
+def astar(grid, start, end, movement='cardinal', weight=1.0, dynamic=False, heuristic_fn=None,
+          components=None, stats=None, path_builder=None, swamps=None):
+    """
+    A* Search Algorithm for Pathfinding
+    Time Complexity: O(b^d) where b is branching factor and d is depth
+    Space Complexity: O(b^d)
     
-    # No path found
-    return None
+    A* is an informed search algorithm that uses heuristics to guide its search.
+    It combines the benefits of Dijkstra's algorithm and greedy best-first search.
+    
+    The algorithm uses:
+    - g(n): Cost from start to current node
+    - h(n): Estimated cost from current node to end (heuristic)
+    - f(n): Total estimated cost = g(n) + h(n)
+    
+    See astar_search() for the movement models and weighted modes; use it
+    directly when the cost and expansion count are needed.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        movement (str): 'cardinal', 'octile' or 'diagonal'
+        weight (float): Heuristic weight w >= 1 (1 = optimal A*)
+        dynamic (bool): Use dynamic weighting instead of a constant weight
+        heuristic_fn (callable): Optional h(a, b) replacing the default heuristic
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py
+        path_builder (callable): Optional path_builder(start, end, came_from)
+            building the returned path, e.g. CompactPath.from_parents
+        swamps (SwampTable): Optional dead-end regions from swamp_pruning.py
+        
+    Returns:
+        list: Path from start to end as list of (row, col) tuples (or what
+        path_builder returns), or None if no path exists
+    """
+    return astar_search(grid, start, end, movement, weight, dynamic, heuristic_fn, components,
+                        stats, path_builder, swamps).path
 
 
 # Example usage and test
@@ -152,3 +474,21 @@ if __name__ == "__main__":
             print(row_str)
 
 
+    
+    # Compare expansions of the optimal and bounded-suboptimal modes on an
+    # open map with a wall in the way
+    open_grid = [[0] * 60 for _ in range(60)]
+    for r in range(10, 50):
+        open_grid[r][30] = 1
+    
+    print("\nExpansions on a 60x60 map (mode: cost, expansions):")
+    for label, options in [
+        ("A*", {}),
+        ("weighted w=1.5", {'weight': 1.5}),
+        ("weighted w=3", {'weight': 3}),
+        ("dynamic w=3", {'weight': 3, 'dynamic': True}),
+        ("octile A*", {'movement': 'octile'}),
+        ("octile w=2", {'movement': 'octile', 'weight': 2}),
+    ]:
+        result = astar_search(open_grid, (30, 0), (30, 59), **options)
+        print(f"  {label}: {result.cost:.2f}, {result.expansions}")
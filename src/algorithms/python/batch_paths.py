@@ -0,0 +1,303 @@
+"""
+Batch Pathfinding
+
+Answers many (start, end) queries against one static grid. The grid is
+validated and packed into a flat wall buffer once; with a process pool the
+buffer is placed in `multiprocessing.shared_memory` so every worker reads
+the same bytes instead of receiving its own copy of the grid.
+
+Queries that share a start cell share one search tree: a single A* (or
+Dijkstra) run from the source settles its targets one after another,
+keeping every closed cell for the next target. A* uses the distance to the
+nearest target that is still pending as its heuristic; the minimum of
+consistent heuristics is consistent, so closed cells stay optimal when a
+target is reached and the open list is re-prioritised for the rest.
+
+Results are streamed back as they complete, each with the seconds its
+search tree took to settle the target.
+"""
+
+import heapq
+import math
+import os
+import time
+from array import array
+from collections import namedtuple
+
+from astar import MOVEMENT_MODELS
+
+# One answered query: its position in the input, the endpoints, the path
+# and cost (None if unreachable) and the seconds spent until it was settled
+PathResult = namedtuple('PathResult', ['index', 'start', 'end', 'path', 'cost', 'seconds'])
+
+ALGORITHMS = ('astar', 'dijkstra')
+
+# Above this many pending targets the nearest-target heuristic costs more
+# than it saves; the shared tree grows as plain Dijkstra until fewer remain
+MAX_HEURISTIC_TARGETS = 16
+
+# Shards per worker: more shards stream results sooner and balance better
+SHARDS_PER_WORKER = 4
+
+# Wall buffer of the current worker process, set by _attach_grid
+_worker_grid = None
+
+
+def pack_grid(grid):
+    """
+    Validate a grid and pack it into one byte per cell (1 = wall).
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+
+    Returns:
+        tuple: (walls, rows, cols) with walls a bytes object indexed by
+        row * cols + col
+
+    Raises:
+        ValueError: If the grid is empty or its rows differ in length
+    """
+    if not grid or not grid[0]:
+        raise ValueError("Grid cannot be empty")
+    rows, cols = len(grid), len(grid[0])
+    if any(len(row) != cols for row in grid):
+        raise ValueError("All grid rows must have the same length")
+    return bytes(1 if cell else 0 for row in grid for cell in row), rows, cols
+
+
+def search_from(walls, rows, cols, source, targets, algorithm='astar', movement='cardinal'):
+    """
+    Answer every query from one source with a single shared search tree.
+
+    Args:
+        walls (bytes-like): Packed grid from pack_grid (or a view of it)
+        rows (int): Grid height
+        cols (int): Grid width
+        source (tuple): Common start position (row, col)
+        targets (list): (query index, end position) pairs
+        algorithm (str): 'astar' or 'dijkstra'
+        movement (str): 'cardinal', 'octile' or 'diagonal' (see astar)
+
+    Returns:
+        list: PathResult for every target, in the order they were settled
+    """
+    moves, h = MOVEMENT_MODELS[movement]
+    unit_cost = movement != 'octile'
+    t0 = time.perf_counter()
+    results = []
+
+    source_index = source[0] * cols + source[1]
+    # Target cell index -> queries ending there
+    pending = {}
+    for query_index, end in targets:
+        end_index = end[0] * cols + end[1]
+        if walls[source_index] or walls[end_index]:
+            results.append(PathResult(query_index, source, end, None, None, 0.0))
+        else:
+            pending.setdefault(end_index, []).append((query_index, end))
+    if not pending:
+        return results
+
+    size = rows * cols
+    g = array('d', [math.inf]) * size
+    parent = array('i', [-1]) * size
+    closed = bytearray(size)
+    open_cells = {source_index}
+    g[source_index] = 0.0
+
+    def estimate(index):
+        if algorithm == 'dijkstra' or len(pending) > MAX_HEURISTIC_TARGETS:
+            return 0
+        cell = divmod(index, cols)
+        return min(h(cell, divmod(target, cols)) for target in pending)
+
+    # Heap entries: (f, -g, index); the deeper node wins ties on f
+    pq = [(estimate(source_index), 0.0, source_index)]
+
+    while pq and pending:
+        _, neg_g, index = heapq.heappop(pq)
+        if closed[index] or -neg_g > g[index]:
+            continue
+        closed[index] = 1
+        open_cells.discard(index)
+
+        if index in pending:
+            path = []
+            current = index
+            while current != -1:
+                path.append(divmod(current, cols))
+                current = parent[current]
+            path.reverse()
+            cost = int(g[index]) if unit_cost else g[index]
+            elapsed = time.perf_counter() - t0
+            for query_index, end in pending.pop(index):
+                results.append(PathResult(query_index, source, end, list(path), cost, elapsed))
+            if not pending:
+                break
+            if algorithm == 'astar':
+                # The nearest remaining target changed: re-prioritise the open list
+                pq = [(g[cell] + estimate(cell), -g[cell], cell) for cell in open_cells]
+                heapq.heapify(pq)
+
+        row, col = divmod(index, cols)
+        for dr, dc, step_cost in moves:
+            new_row, new_col = row + dr, col + dc
+            if not (0 <= new_row < rows and 0 <= new_col < cols):
+                continue
+            new_index = new_row * cols + new_col
+            if walls[new_index] or closed[new_index]:
+                continue
+            # No corner cutting through walls on diagonal steps
+            if dr != 0 and dc != 0 and (walls[row * cols + new_col] or walls[new_row * cols + col]):
+                continue
+            new_g = g[index] + step_cost
+            if new_g < g[new_index]:
+                g[new_index] = new_g
+                parent[new_index] = index
+                open_cells.add(new_index)
+                heapq.heappush(pq, (new_g + estimate(new_index), -new_g, new_index))
+
+    elapsed = time.perf_counter() - t0
+    for queries in pending.values():
+        for query_index, end in queries:
+            results.append(PathResult(query_index, source, end, None, None, elapsed))
+    return results
+
+
+def _attach_grid(name):
+    """Pool initializer: map the shared wall buffer read-only."""
+    global _worker_grid
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(name=name)
+    # Keep the block referenced so the mapping outlives this function
+    _worker_grid = (block, block.buf.toreadonly())
+
+
+def _run_shard(shard, rows, cols, algorithm, movement):
+    """Answer one shard of (source, targets) groups in a worker."""
+    walls = _worker_grid[1]
+    results = []
+    for source, targets in shard:
+        results.extend(search_from(walls, rows, cols, source, targets, algorithm, movement))
+    return results
+
+
+def _shards(groups, total, workers):
+    """Split source groups into shards of roughly equal query counts."""
+    target_size = max(1, math.ceil(total / (workers * SHARDS_PER_WORKER)))
+    shard, size = [], 0
+    for group in groups:
+        shard.append(group)
+        size += len(group[1])
+        if size >= target_size:
+            yield shard
+            shard, size = [], 0
+    if shard:
+        yield shard
+
+
+def find_paths(grid, queries, algorithm='astar', workers=None, movement='cardinal'):
+    """
+    Answer a batch of (start, end) queries on one grid.
+
+    The grid is validated and packed once. Queries are grouped by start
+    cell (each group shares one search tree) and the groups are sharded
+    across a process pool that reads the grid from shared memory. With
+    workers=1 everything runs in the calling process, which also works
+    where multiprocessing is unavailable (e.g. Pyodide).
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        queries (iterable): (start, end) position pairs
+        algorithm (str): 'astar' or 'dijkstra'
+        workers (int): Worker processes (None = os.cpu_count(), 1 = inline)
+        movement (str): 'cardinal', 'octile' or 'diagonal' (see astar)
+
+    Yields:
+        PathResult: One per query, as soon as its shard completes (not in
+        input order; use the index field to match queries)
+
+    Raises:
+        ValueError: If the grid, a position, the algorithm, the movement
+            model or the worker count is invalid
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if movement not in MOVEMENT_MODELS:
+        raise ValueError(f"Unknown movement model: {movement}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    walls, rows, cols = pack_grid(grid)
+    groups = {}
+    total = 0
+    for index, (start, end) in enumerate(queries):
+        start, end = tuple(start), tuple(end)
+        for name, cell in (("Start", start), ("End", end)):
+            if not (0 <= cell[0] < rows and 0 <= cell[1] < cols):
+                raise ValueError(f"{name} position {cell} of query {index} out of bounds")
+        groups.setdefault(start, []).append((index, end))
+        total += 1
+    return _stream(walls, rows, cols, list(groups.items()), total, algorithm, workers, movement)
+
+
+def _stream(walls, rows, cols, groups, total, algorithm, workers, movement):
+    """Generator behind find_paths, so input errors are raised eagerly."""
+    if workers == 1 or len(groups) <= 1:
+        for source, targets in groups:
+            yield from search_from(walls, rows, cols, source, targets, algorithm, movement)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(create=True, size=len(walls))
+    try:
+        block.buf[:len(walls)] = walls
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_grid,
+                                 initargs=(block.name,)) as pool:
+            futures = [pool.submit(_run_shard, shard, rows, cols, algorithm, movement)
+                       for shard in _shards(groups, total, workers)]
+            try:
+                for future in as_completed(futures):
+                    yield from future.result()
+            finally:
+                # Stopped early (or failed): drop the shards not started yet
+                for future in futures:
+                    future.cancel()
+    finally:
+        block.close()
+        block.unlink()
+
+
+# Example usage and benchmark
+if __name__ == "__main__":
+    import random
+    from astar import astar_search
+
+    size = 200
+    rng = random.Random(7)
+    grid = [[1 if rng.random() < 0.25 else 0 for _ in range(size)] for _ in range(size)]
+    free = [(r, c) for r in range(size) for c in range(size) if grid[r][c] == 0]
+    # A few depots serving many destinations each, like a delivery backend
+    depots = rng.sample(free, 16)
+    queries = [(rng.choice(depots), rng.choice(free)) for _ in range(400)]
+
+    t0 = time.perf_counter()
+    expected = [astar_search(grid, start, end).cost for start, end in queries]
+    print(f"{len(queries)} astar_search calls: {time.perf_counter() - t0:.2f}s")
+
+    for workers in (1, 4):
+        t0 = time.perf_counter()
+        first = None
+        answers = {}
+        for result in find_paths(grid, queries, workers=workers):
+            if first is None:
+                first = time.perf_counter() - t0
+            answers[result.index] = result.cost
+        elapsed = time.perf_counter() - t0
+        same = all(answers[i] == cost for i, cost in enumerate(expected))
+        print(f"find_paths workers={workers}: {elapsed:.2f}s (first result after "
+              f"{first * 1000:.0f}ms), costs match astar: {same}")
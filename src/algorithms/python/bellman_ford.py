@@ -1,4 +1,17 @@
-def bellman_ford(grid, start, end):
+from collections import deque
+
+# Step events of bellman_ford_steps(): distance of a cell lowered, cell
+# relaxed from, cell on the final path (the same codes in every
+# pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+# Directions: up, down, left, right
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def bellman_ford(grid, start, end, mode='sweep', weights=None, components=None, stats=None):
     """
     Bellman-Ford Algorithm for Pathfinding
     Time Complexity: O(VE) where V is vertices and E is edges
@@ -6,17 +19,59 @@ def bellman_ford(grid, start, end):
     
     Single-source shortest path algorithm using iterative relaxation.
     Can handle negative edge weights and detect negative cycles.
-    Runs V-1 iterations, relaxing all edges in each iteration.
+    
+    Modes:
+    - 'sweep': relax every cell in row-major order, up to V-1 rounds
+    - 'spfa': queue-based Bellman-Ford (Shortest Path Faster Algorithm)
+      that only relaxes cells whose distance changed, with the SLF (small
+      label first) and LLL (large label last) queue heuristics; a
+      relaxation chain of V edges proves a negative cycle
+    - 'numpy': vectorized rounds that relax the whole distance array
+      against its four shifted copies at once (requires NumPy)
+    
+    Moving into a cell costs weights[row][col] (1 everywhere if weights is
+    None). Weights may be negative; two adjacent walkable cells whose
+    weights sum to less than zero already form a negative cycle (stepping
+    back and forth between them).
     
     Args:
         grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
         start (tuple): Starting position (row, col)
         end (tuple): Target position (row, col)
-        
+        mode (str): 'sweep', 'spfa' or 'numpy'
+        weights (list): Optional 2D grid of signed costs for entering each cell
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented copy of the sweep records its counters
+            (expansions count cells relaxed from, summed over the rounds;
+            the sweep has no frontier)
+    
     Returns:
         list: Path from start to end as list of (row, col) tuples, or None if no path exists
+    
+    Raises:
+        ValueError: If the mode is unknown, weights do not match the grid,
+            a negative cycle is reachable from start or stats are requested
+            for a mode other than 'sweep'
+        ImportError: If mode='numpy' and NumPy is not installed
     """
+    if mode not in ('sweep', 'spfa', 'numpy'):
+        raise ValueError(f"Unknown mode: {mode}")
+    if stats is not None and mode != 'sweep':
+        raise ValueError("stats are only collected for mode='sweep'")
     rows, cols = len(grid), len(grid[0])
+    if weights is not None and (len(weights) != rows or any(len(row) != cols for row in weights)):
+        raise ValueError("Weights must have the same shape as the grid")
+    if components is not None and not components.connected(start, end):
+        return None
+    
+    if mode == 'spfa':
+        return _spfa(grid, start, end, weights)
+    if mode == 'numpy':
+        return _numpy_rounds(grid, start, end, weights)
+    if stats is not None:
+        return _sweep_with_stats(grid, start, end, weights, stats)
     
     # Initialize distances: Infinity for all cells except start
     distances = [[float('inf')] * cols for _ in range(rows)]
@@ -25,13 +80,11 @@ def bellman_ford(grid, start, end):
     # Parent tracking for path reconstruction
     came_from = {}
     
-    # Directions: up, down, left, right
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    
-    # Bellman-Ford: V-1 iterations (V = rows * cols)
+    # Bellman-Ford: V-1 iterations (V = rows * cols); a cell that still
+    # improves in iteration V lies on or behind a negative cycle
     max_iterations = rows * cols - 1
     
-    for iteration in range(1, max_iterations + 1):
+    for iteration in range(1, max_iterations + 2):
         updated = False
         
         # Relax all edges in this iteration
@@ -42,7 +95,7 @@ def bellman_ford(grid, start, end):
                     continue
                 
                 # Check all neighbors (4-directional)
-                for dr, dc in directions:
+                for dr, dc in DIRECTIONS:
                     new_row = row + dr
                     new_col = col + dc
                     
@@ -51,7 +104,7 @@ def bellman_ford(grid, start, end):
                         0 <= new_col < cols and 
                         grid[new_row][new_col] == 0):
                         
-                        edge_weight = 1  # Uniform weight for grid
+                        edge_weight = 1 if weights is None else weights[new_row][new_col]
                         new_dist = distances[row][col] + edge_weight
                         
                         # Relax edge if distance can be improved
@@ -63,6 +116,8 @@ def bellman_ford(grid, start, end):
         # Early termination: if no updates, distances are finalized
         if not updated:
             break
+    else:
+        raise ValueError("Negative cycle reachable from start")
     
     # Reconstruct path if reachable
     if distances[end[0]][end[1]] == float('inf'):
@@ -82,6 +137,266 @@ def bellman_ford(grid, start, end):
     return path[::-1]  # Reverse to get start -> end
 
 
+def bellman_ford_steps(grid, start, end, weights=None):
+    """
+    Step-by-step Bellman-Ford ('sweep' mode) for visualizers and streaming servers.
+    
+    A generator that yields one event per relaxation step instead of
+    running to completion: stop iterating to pause, iterate again to
+    resume and call close() to cancel. Nothing but the distance table is
+    kept. Every round reports each reached cell again, so a cell is closed
+    once per round.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        weights (list): Optional 2D grid of signed costs for entering each cell
+    
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN (distance lowered), EVENT_CLOSE (cell
+        relaxed from) or EVENT_PATH (the path cells from start to end,
+        after the last round)
+    
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+    
+    Raises:
+        ValueError: If weights do not match the grid or a negative cycle is
+            reachable from start
+    """
+    rows, cols = len(grid), len(grid[0])
+    if weights is not None and (len(weights) != rows or any(len(row) != cols for row in weights)):
+        raise ValueError("Weights must have the same shape as the grid")
+    if grid[start[0]][start[1]] != 0:
+        return None
+    
+    distances = [[float('inf')] * cols for _ in range(rows)]
+    distances[start[0]][start[1]] = 0
+    came_from = {}
+    yield start[0] * cols + start[1], EVENT_OPEN
+    
+    for iteration in range(1, rows * cols + 1):
+        updated = False
+        for row in range(rows):
+            for col in range(cols):
+                if distances[row][col] == float('inf') or grid[row][col] == 1:
+                    continue
+                yield row * cols + col, EVENT_CLOSE
+                for dr, dc in DIRECTIONS:
+                    new_row = row + dr
+                    new_col = col + dc
+                    if (0 <= new_row < rows and 
+                        0 <= new_col < cols and 
+                        grid[new_row][new_col] == 0):
+                        
+                        edge_weight = 1 if weights is None else weights[new_row][new_col]
+                        new_dist = distances[row][col] + edge_weight
+                        if new_dist < distances[new_row][new_col]:
+                            distances[new_row][new_col] = new_dist
+                            came_from[(new_row, new_col)] = (row, col)
+                            updated = True
+                            yield new_row * cols + new_col, EVENT_OPEN
+        if not updated:
+            break
+    else:
+        raise ValueError("Negative cycle reachable from start")
+    
+    if distances[end[0]][end[1]] == float('inf'):
+        return None
+    path = [end]
+    while path[-1] != start:
+        path.append(came_from[path[-1]])
+    path.reverse()
+    for path_row, path_col in path:
+        yield path_row * cols + path_col, EVENT_PATH
+    return path
+
+
+def _sweep_with_stats(grid, start, end, weights, stats):
+    """Sweep rounds with counters; a separate copy so the plain sweep pays nothing."""
+    rows, cols = len(grid), len(grid[0])
+    distances = [[float('inf')] * cols for _ in range(rows)]
+    distances[start[0]][start[1]] = 0
+    came_from = {}
+    # Cells relaxed from in an earlier round or earlier in this one
+    expanded = set()
+    expansions = reopenings = 0
+    
+    try:
+        for iteration in range(1, rows * cols + 1):
+            updated = False
+            for row in range(rows):
+                for col in range(cols):
+                    if distances[row][col] == float('inf') or grid[row][col] == 1:
+                        continue
+                    expansions += 1
+                    expanded.add((row, col))
+                    for dr, dc in DIRECTIONS:
+                        new_row = row + dr
+                        new_col = col + dc
+                        if (0 <= new_row < rows and 
+                            0 <= new_col < cols and 
+                            grid[new_row][new_col] == 0):
+                            
+                            edge_weight = 1 if weights is None else weights[new_row][new_col]
+                            new_dist = distances[row][col] + edge_weight
+                            if new_dist < distances[new_row][new_col]:
+                                if (new_row, new_col) in expanded:
+                                    reopenings += 1
+                                distances[new_row][new_col] = new_dist
+                                came_from[(new_row, new_col)] = (row, col)
+                                updated = True
+            if not updated:
+                break
+        else:
+            raise ValueError("Negative cycle reachable from start")
+    finally:
+        stats.record(expansions, 0, 0, 0, 0, reopenings)
+    
+    if distances[end[0]][end[1]] == float('inf'):
+        return None
+    path = []
+    current = end
+    while current != start:
+        path.append(current)
+        if current not in came_from:
+            return None
+        current = came_from[current]
+    path.append(start)
+    return path[::-1]
+
+
+def _spfa(grid, start, end, weights):
+    """
+    Queue-based Bellman-Ford over flat cell indices.
+    
+    SLF: a cell entering the queue with a distance below the front's goes
+    to the front. LLL: front cells whose distance is above the queue
+    average are rotated to the back before one is processed.
+    """
+    rows, cols = len(grid), len(grid[0])
+    size = rows * cols
+    start_index = start[0] * cols + start[1]
+    
+    distances = [float('inf')] * size
+    parent = [-1] * size
+    in_queue = bytearray(size)
+    # Edges on the relaxation chain that set each distance
+    relaxations = [0] * size
+    
+    distances[start_index] = 0
+    queue = deque([start_index])
+    in_queue[start_index] = 1
+    queued_sum = 0
+    
+    while queue:
+        # LLL: at most one full rotation, so a cell is always processed
+        average = queued_sum / len(queue)
+        for _ in range(len(queue) - 1):
+            if distances[queue[0]] <= average:
+                break
+            queue.append(queue.popleft())
+        index = queue.popleft()
+        in_queue[index] = 0
+        queued_sum -= distances[index]
+        
+        row, col = divmod(index, cols)
+        for dr, dc in DIRECTIONS:
+            new_row, new_col = row + dr, col + dc
+            if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] != 0:
+                continue
+            new_index = new_row * cols + new_col
+            new_dist = distances[index] + (1 if weights is None else weights[new_row][new_col])
+            if new_dist >= distances[new_index]:
+                continue
+            
+            # A shortest path visits each cell at most once, so a chain of
+            # V relaxations has to go around a negative cycle (counting
+            # chain length rather than enqueues stays valid under SLF/LLL)
+            relaxations[new_index] = relaxations[index] + 1
+            if relaxations[new_index] >= size:
+                raise ValueError("Negative cycle reachable from start")
+            parent[new_index] = index
+            if in_queue[new_index]:
+                queued_sum += new_dist - distances[new_index]
+                distances[new_index] = new_dist
+                continue
+            distances[new_index] = new_dist
+            queued_sum += new_dist
+            in_queue[new_index] = 1
+            # SLF: small labels jump the queue
+            if queue and new_dist < distances[queue[0]]:
+                queue.appendleft(new_index)
+            else:
+                queue.append(new_index)
+    
+    end_index = end[0] * cols + end[1]
+    if distances[end_index] == float('inf'):
+        return None
+    path = []
+    index = end_index
+    while index != -1:
+        path.append(divmod(index, cols))
+        index = parent[index]
+    return path[::-1]
+
+
+def _numpy_rounds(grid, start, end, weights):
+    """
+    Vectorized Bellman-Ford: every round relaxes all cells against the
+    distance array shifted one step in each of the four directions.
+    """
+    try:
+        import numpy as np
+    except ImportError as error:
+        raise ImportError("mode='numpy' requires NumPy") from error
+    
+    rows, cols = len(grid), len(grid[0])
+    walls = np.asarray(grid) != 0
+    cost = np.ones((rows, cols)) if weights is None else np.asarray(weights, dtype=float)
+    # Entering a wall is impossible; leaving one is never needed because
+    # walls never get a finite distance
+    cost = np.where(walls, np.inf, cost)
+    
+    distances = np.full((rows, cols), np.inf)
+    distances[start] = 0
+    # Index into DIRECTIONS of the step that reached each cell
+    parent_dir = np.full((rows, cols), -1, dtype=np.int8)
+    
+    # Source and target windows: target[r, c] is entered from source[r - dr, c - dc]
+    windows = []
+    for dr, dc in DIRECTIONS:
+        source = (slice(max(0, -dr), rows - max(0, dr)), slice(max(0, -dc), cols - max(0, dc)))
+        target = (slice(max(0, dr), rows - max(0, -dr)), slice(max(0, dc), cols - max(0, -dc)))
+        windows.append((source, target))
+    
+    for _ in range(rows * cols):
+        updated = False
+        for code, (source, target) in enumerate(windows):
+            candidate = distances[source] + cost[target]
+            better = candidate < distances[target]
+            if better.any():
+                distances[target][better] = candidate[better]
+                parent_dir[target][better] = code
+                updated = True
+        if not updated:
+            break
+    else:
+        raise ValueError("Negative cycle reachable from start")
+    
+    if not np.isfinite(distances[end]):
+        return None
+    path = [end]
+    current = end
+    while current != start:
+        dr, dc = DIRECTIONS[parent_dir[current]]
+        current = (current[0] - dr, current[1] - dc)
+        path.append(current)
+    return path[::-1]
+
+
 # Example usage and test
 if __name__ == "__main__":
     # Create a sample grid (0 = walkable, 1 = wall)
@@ -103,5 +418,22 @@ if __name__ == "__main__":
         print(f"Path: {path}")
     else:
         print("No path found")
-
-
+    
+    # Signed per-cell weights: the middle row is a cheap corridor
+    weights = [
+        [3, 3, 3, 3, 3],
+        [1, 1, 1, 1, 1],
+        [1, -1, 2, -1, 1],
+        [1, 1, 1, 1, 1],
+        [3, 3, 3, 3, 3]
+    ]
+    path = bellman_ford(test_grid, start_pos, end_pos, mode='spfa', weights=weights)
+    cost = sum(weights[r][c] for r, c in path[1:])
+    print(f"\nSPFA with signed weights: cost {cost}, path {path}")
+    
+    # Two adjacent cells at -1: stepping back and forth lowers the cost forever
+    weights[2][2] = -1
+    try:
+        bellman_ford(test_grid, start_pos, end_pos, mode='spfa', weights=weights)
+    except ValueError as error:
+        print(f"Detected: {error}")
@@ -1,6 +1,13 @@
 from collections import deque
 
-def bfs(grid, start, end):
+# Step events of bfs_steps(): cell added to the queue, cell expanded, cell
+# on the final path (the same codes in every pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+
+def bfs(grid, start, end, components=None, stats=None, path_builder=None):
     """
     Breadth-First Search (BFS) Pathfinding Algorithm
     Time Complexity: O(V + E) where V is vertices and E is edges
@@ -13,27 +20,41 @@ def bfs(grid, start, end):
         grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
         start (tuple): Starting position (row, col)
         end (tuple): Target position (row, col)
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented copy of the search records its counters
+        path_builder (callable): Optional path_builder(start, end, parents)
+            that builds the returned path from the parent links (parents
+            maps each reached cell to the previous one), e.g.
+            CompactPath.from_parents from path_encoding.py
         
     Returns:
-        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+        list: Path from start to end as list of (row, col) tuples (or what
+        path_builder returns), or None if no path exists
     """
+    if components is not None and not components.connected(start, end):
+        return None
+    if stats is not None:
+        return _bfs_with_stats(grid, start, end, stats, path_builder)
+    
     rows, cols = len(grid), len(grid[0])
     
-    # Queue for BFS: stores (row, col, path)
-    queue = deque([(start[0], start[1], [start])])
+    # Queue for BFS: stores (row, col)
+    queue = deque([start])
     
-    # Set to track visited cells
-    visited = {start}
+    # Previous cell of every visited cell (also the visited set)
+    parents = {start: None}
     
     # Directions: up, down, left, right
     directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
     
     while queue:
-        row, col, path = queue.popleft()
+        row, col = queue.popleft()
         
         # Check if we reached the end
         if (row, col) == end:
-            return path
+            return _build_path(start, end, parents, path_builder)
         
         # Explore all 4 directions
         for dr, dc in directions:
@@ -43,16 +64,119 @@ def bfs(grid, start, end):
             if (0 <= new_row < rows and 
                 0 <= new_col < cols and 
                 grid[new_row][new_col] == 0 and 
-                (new_row, new_col) not in visited):
+                (new_row, new_col) not in parents):
                 
-                visited.add((new_row, new_col))
-                new_path = path + [(new_row, new_col)]
-                queue.append((new_row, new_col, new_path))
+                parents[(new_row, new_col)] = (row, col)
+                queue.append((new_row, new_col))
     
     # No path found
     return None
 
 
+def _build_path(start, end, parents, path_builder):
+    """Path from start to end through the parent links, as a list or via path_builder."""
+    if path_builder is not None:
+        return path_builder(start, end, parents)
+    path = []
+    cell = end
+    while cell is not None:
+        path.append(cell)
+        cell = parents[cell]
+    return path[::-1]
+
+
+def bfs_steps(grid, start, end):
+    """
+    Step-by-step BFS for visualizers and streaming servers.
+    
+    A generator that yields one event per search step instead of running
+    to completion: stop iterating to pause, iterate again to resume and
+    call close() to cancel. Nothing but the search state is kept, so a
+    huge search never builds a full trace in memory.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN, EVENT_CLOSE or EVENT_PATH (the path
+        cells from start to end, after the goal is reached)
+        
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+    """
+    rows, cols = len(grid), len(grid[0])
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    
+    queue = deque([start])
+    parents = {start: None}
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    yield start[0] * cols + start[1], EVENT_OPEN
+    
+    while queue:
+        row, col = queue.popleft()
+        if (row, col) == end:
+            path = []
+            cell = end
+            while cell is not None:
+                path.append(cell)
+                cell = parents[cell]
+            path.reverse()
+            for path_row, path_col in path:
+                yield path_row * cols + path_col, EVENT_PATH
+            return path
+        
+        yield row * cols + col, EVENT_CLOSE
+        for dr, dc in directions:
+            new_row, new_col = row + dr, col + dc
+            if (0 <= new_row < rows and 
+                0 <= new_col < cols and 
+                grid[new_row][new_col] == 0 and 
+                (new_row, new_col) not in parents):
+                
+                parents[(new_row, new_col)] = (row, col)
+                queue.append((new_row, new_col))
+                yield new_row * cols + new_col, EVENT_OPEN
+    
+    return None
+
+
+def _bfs_with_stats(grid, start, end, stats, path_builder):
+    """bfs() with counters; a separate copy so the plain search pays nothing."""
+    rows, cols = len(grid), len(grid[0])
+    queue = deque([start])
+    parents = {start: None}
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    expansions, pushes, pops, peak = 0, 1, 0, 1
+    
+    try:
+        while queue:
+            row, col = queue.popleft()
+            pops += 1
+            if (row, col) == end:
+                return _build_path(start, end, parents, path_builder)
+            
+            expansions += 1
+            for dr, dc in directions:
+                new_row, new_col = row + dr, col + dc
+                if (0 <= new_row < rows and 
+                    0 <= new_col < cols and 
+                    grid[new_row][new_col] == 0 and 
+                    (new_row, new_col) not in parents):
+                    
+                    parents[(new_row, new_col)] = (row, col)
+                    queue.append((new_row, new_col))
+                    pushes += 1
+            if len(queue) > peak:
+                peak = len(queue)
+        return None
+    finally:
+        stats.record(expansions, pushes, pops, 0, peak, 0)
+
+
 # Example usage and test
 if __name__ == "__main__":
     # Create a sample grid (0 = walkable, 1 = wall)
@@ -1,6 +1,86 @@
-from collections import deque
+import heapq
+from collections import deque, namedtuple
 
-def bidirectional_search(grid, start, end):
+# Result of a bidirectional run: the path, its cost and the nodes expanded
+# by the search from the start and by the search from the end
+BidirectionalResult = namedtuple(
+    'BidirectionalResult', ['path', 'cost', 'forward_expansions', 'backward_expansions'])
+
+# Step events of bidirectional_search_steps(): cell added to either queue,
+# cell expanded, cell on the final path (the same codes in every
+# pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+# Directions: up, down, left, right
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def bidirectional_search_engine(grid, start, end, mode='alternate', weights=None, components=None,
+                                stats=None):
+    """
+    Bidirectional search engine with per-side expansion counts.
+    
+    Modes:
+    - 'alternate': one BFS pop per side in turn, stopping at the first
+      touch without comparing other meetings (the original behaviour)
+    - 'balanced': level-synchronous BFS that always expands a whole level
+      of the side with the smaller frontier. When a level touches the
+      other side, the rest of that level is still expanded and the
+      cheapest meeting is kept, which makes the path optimal
+    - 'nba_star': New Bidirectional A* (Pijls and Post) for weighted grids.
+      Each side runs A* with a front-to-end heuristic toward the opposite
+      endpoint, keeps the best meeting cost L seen so far and rejects nodes
+      that cannot beat it (g + h >= L, or g + F_other - h_other >= L where
+      F_other is the other side's lowest f). It stops when either open list
+      is empty and returns an optimal path
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        mode (str): 'alternate', 'balanced' or 'nba_star'
+        weights (list): Optional 2D grid of non-negative costs for entering
+            each cell ('nba_star' only; unit costs if None)
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented copy of the 'alternate' search records
+            its counters (the frontier is both queues together)
+        
+    Returns:
+        BidirectionalResult: (path, cost, forward_expansions,
+        backward_expansions); path and cost are None if no path exists
+        
+    Raises:
+        ValueError: If the mode is unknown, weights are given for a BFS
+            mode or contain negative costs, or stats are requested for a
+            mode other than 'alternate'
+    """
+    if mode not in ('alternate', 'balanced', 'nba_star'):
+        raise ValueError(f"Unknown mode: {mode}")
+    if weights is not None and mode != 'nba_star':
+        raise ValueError("Weights are only supported by mode='nba_star'")
+    if stats is not None and mode != 'alternate':
+        raise ValueError("stats are only collected for mode='alternate'")
+    if components is not None and not components.connected(start, end):
+        return BidirectionalResult(None, None, 0, 0)
+    
+    if mode == 'nba_star':
+        return _nba_star(grid, start, end, weights)
+    
+    if stats is not None:
+        path, forward_expansions, backward_expansions = _alternate_with_stats(grid, start, end, stats)
+    else:
+        search = _alternate_search if mode == 'alternate' else _balanced_search
+        path, forward_expansions, backward_expansions = search(grid, start, end)
+    cost = len(path) - 1 if path else None
+    return BidirectionalResult(path, cost, forward_expansions, backward_expansions)
+
+
+def bidirectional_search(grid, start, end, mode='alternate', weights=None, components=None,
+                         stats=None):
     """
     Bidirectional Search Pathfinding Algorithm
     Time Complexity: O(b^(d/2)) where b is branching factor and d is depth
@@ -10,19 +90,105 @@ def bidirectional_search(grid, start, end):
     When the searches meet, we've found the shortest path. Significantly reduces search space.
     Works best for unweighted graphs where shortest path is guaranteed.
     
+    See bidirectional_search_engine() for the modes and per-side expansion counts.
+    
     Args:
         grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
         start (tuple): Starting position (row, col)
         end (tuple): Target position (row, col)
+        mode (str): 'alternate', 'balanced' or 'nba_star'
+        weights (list): Optional 2D grid of cell entry costs ('nba_star' only)
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py ('alternate' only)
         
     Returns:
         list: Path from start to end as list of (row, col) tuples, or None if no path exists
     """
+    return bidirectional_search_engine(grid, start, end, mode, weights, components, stats).path
+
+
+def bidirectional_search_steps(grid, start, end):
+    """
+    Step-by-step bidirectional search ('alternate' mode) for visualizers
+    and streaming servers.
+    
+    A generator that yields one event per search step instead of running
+    to completion: stop iterating to pause, iterate again to resume and
+    call close() to cancel. Nothing but the search state is kept. Both
+    sides report with the same event codes.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN, EVENT_CLOSE or EVENT_PATH (the path
+        cells from start to end, after the two searches meet)
+        
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+    """
+    rows, cols = len(grid), len(grid[0])
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    if start == end:
+        yield start[0] * cols + start[1], EVENT_PATH
+        return [start]
+    
+    queues = [deque([start]), deque([end])]
+    parents = [{start: None}, {end: None}]
+    yield start[0] * cols + start[1], EVENT_OPEN
+    yield end[0] * cols + end[1], EVENT_OPEN
+    meeting_point = None
+    side = 1
+    
+    while queues[0] and queues[1] and not meeting_point:
+        side = 1 - side
+        current_parent, opposite_parent = parents[side], parents[1 - side]
+        current = queues[side].popleft()
+        yield current[0] * cols + current[1], EVENT_CLOSE
+        
+        for dr, dc in DIRECTIONS:
+            new_row, new_col = current[0] + dr, current[1] + dc
+            if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] == 1:
+                continue
+            new_pos = (new_row, new_col)
+            if new_pos in current_parent:
+                continue
+            current_parent[new_pos] = current
+            if new_pos in opposite_parent:
+                meeting_point = new_pos
+                break
+            queues[side].append(new_pos)
+            yield new_row * cols + new_col, EVENT_OPEN
+    
+    if not meeting_point:
+        return None
+    path = []
+    node = meeting_point
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+    node = parents[1][meeting_point]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    for row, col in path:
+        yield row * cols + col, EVENT_PATH
+    return path
+
+
+def _alternate_search(grid, start, end):
+    """Alternate one pop per side; returns (path, forward, backward expansions)."""
     rows, cols = len(grid), len(grid[0])
     
     # Check if start and end are the same
     if start == end:
-        return [start]
+        return [start], 0, 0
     
     # Forward search (from start)
     forward_queue = deque([start])
@@ -34,11 +200,9 @@ def bidirectional_search(grid, start, end):
     backward_visited = {end}
     backward_parent = {end: None}
     
-    # Directions: up, down, left, right
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    
     meeting_point = None
     iteration = 0
+    expansions = [0, 0]
     
     while forward_queue and backward_queue and not meeting_point:
         iteration += 1
@@ -63,9 +227,10 @@ def bidirectional_search(grid, start, end):
             continue
             
         current = current_queue.popleft()
+        expansions[iteration % 2 == 0] += 1
         
         # Explore neighbors
-        for dr, dc in directions:
+        for dr, dc in DIRECTIONS:
             new_row, new_col = current[0] + dr, current[1] + dc
             
             # Check bounds
@@ -113,9 +278,220 @@ def bidirectional_search(grid, start, end):
         
         # Combine paths
         full_path = forward_path + backward_path
-        return full_path
+        return full_path, expansions[0], expansions[1]
+    
+    return None, expansions[0], expansions[1]  # No path found
+
+
+def _alternate_with_stats(grid, start, end, stats):
+    """_alternate_search() with counters; a separate copy so the plain search pays nothing."""
+    rows, cols = len(grid), len(grid[0])
+    if start == end:
+        return [start], 0, 0
+    
+    queues = [deque([start]), deque([end])]
+    parents = [{start: None}, {end: None}]
+    meeting_point = None
+    iteration = 0
+    expansions = [0, 0]
+    pushes, pops, peak = 2, 0, 2
+    
+    try:
+        while queues[0] and queues[1] and not meeting_point:
+            iteration += 1
+            side = 0 if iteration % 2 == 1 else 1
+            current_queue, current_parent = queues[side], parents[side]
+            opposite_parent = parents[1 - side]
+            
+            current = current_queue.popleft()
+            pops += 1
+            expansions[side] += 1
+            for dr, dc in DIRECTIONS:
+                new_row, new_col = current[0] + dr, current[1] + dc
+                if (new_row < 0 or new_row >= rows or 
+                    new_col < 0 or new_col >= cols):
+                    continue
+                if grid[new_row][new_col] == 1:
+                    continue
+                new_pos = (new_row, new_col)
+                if new_pos in current_parent:
+                    continue
+                if new_pos in opposite_parent:
+                    meeting_point = new_pos
+                    current_parent[new_pos] = current
+                    break
+                current_parent[new_pos] = current
+                current_queue.append(new_pos)
+                pushes += 1
+            if len(queues[0]) + len(queues[1]) > peak:
+                peak = len(queues[0]) + len(queues[1])
+    finally:
+        stats.record(expansions[0] + expansions[1], pushes, pops, 0, peak, 0)
+    
+    if not meeting_point:
+        return None, expansions[0], expansions[1]
+    forward_path = []
+    current = meeting_point
+    while current is not None:
+        forward_path.append(current)
+        current = parents[0][current]
+    forward_path.reverse()
+    backward_path = []
+    current = parents[1][meeting_point]
+    while current is not None:
+        backward_path.append(current)
+        current = parents[1][current]
+    return forward_path + backward_path, expansions[0], expansions[1]
+
+
+def _balanced_search(grid, start, end):
+    """Level-synchronous BFS on the smaller frontier; returns (path, forward, backward expansions)."""
+    rows, cols = len(grid), len(grid[0])
+    if start == end:
+        return [start], 0, 0
+    
+    # Per side: current frontier level, parent map (also the visited set),
+    # distance of every visited cell and depth of the frontier level
+    frontiers = [[start], [end]]
+    parents = [{start: None}, {end: None}]
+    distances = [{start: 0}, {end: 0}]
+    depths = [0, 0]
+    expansions = [0, 0]
+    
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, other = parents[side], parents[1 - side]
+        distance, other_distance = distances[side], distances[1 - side]
+        
+        best_cost, meeting = float('inf'), None
+        next_level = []
+        for current in frontiers[side]:
+            expansions[side] += 1
+            for dr, dc in DIRECTIONS:
+                new_row, new_col = current[0] + dr, current[1] + dc
+                if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] == 1:
+                    continue
+                new_pos = (new_row, new_col)
+                if new_pos in other:
+                    cost = depths[side] + 1 + other_distance[new_pos]
+                    if cost < best_cost:
+                        best_cost, meeting = cost, (current, new_pos)
+                    continue
+                if new_pos in parent:
+                    continue
+                parent[new_pos] = current
+                distance[new_pos] = depths[side] + 1
+                next_level.append(new_pos)
+        
+        if meeting is not None:
+            # Every meeting in this level was compared: the best one is optimal
+            near, far = meeting
+            half = []
+            node = near
+            while node is not None:
+                half.append(node)
+                node = parent[node]
+            rest = []
+            node = far
+            while node is not None:
+                rest.append(node)
+                node = other[node]
+            if side == 0:
+                path = half[::-1] + rest
+            else:
+                path = rest[::-1] + half
+            return path, expansions[0], expansions[1]
+        
+        frontiers[side] = next_level
+        depths[side] += 1
+    
+    return None, expansions[0], expansions[1]
+
+
+def _nba_star(grid, start, end, weights):
+    """New Bidirectional A*; returns a BidirectionalResult."""
+    rows, cols = len(grid), len(grid[0])
+    if weights is not None:
+        walkable_weights = [
+            weights[r][c] for r in range(rows) for c in range(cols) if grid[r][c] == 0
+        ]
+        if any(w < 0 for w in walkable_weights):
+            raise ValueError("mode='nba_star' requires non-negative weights")
+        min_weight = min(walkable_weights, default=0)
+    else:
+        min_weight = 1
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return BidirectionalResult(None, None, 0, 0)
+    if start == end:
+        return BidirectionalResult([start], 0, 0, 0)
+    
+    def entry_cost(cell):
+        return 1 if weights is None else weights[cell[0]][cell[1]]
+    
+    # Side 0 searches from start toward end, side 1 from end toward start;
+    # h[side] is the Manhattan distance to the side's target scaled by the
+    # cheapest cell, which keeps it consistent
+    targets = (end, start)
+    
+    def h(side, cell):
+        target = targets[side]
+        return (abs(cell[0] - target[0]) + abs(cell[1] - target[1])) * min_weight
+    
+    g = [{start: 0}, {end: 0}]
+    parents = [{start: None}, {end: None}]
+    open_lists = [[(h(0, start), start)], [(h(1, end), end)]]
+    # Cells taken out of consideration (expanded or rejected) by either side
+    done = set()
+    best, meeting = float('inf'), None
+    expansions = [0, 0]
     
-    return None  # No path found
+    while open_lists[0] and open_lists[1]:
+        side = 0 if len(open_lists[0]) <= len(open_lists[1]) else 1
+        other = 1 - side
+        f, current = heapq.heappop(open_lists[side])
+        if current in done or f > g[side][current] + h(side, current):
+            continue  # Stale entry or already settled
+        done.add(current)
+        
+        g_current = g[side][current]
+        other_f = open_lists[other][0][0] if open_lists[other] else float('inf')
+        if (g_current + h(side, current) >= best or
+                g_current + other_f - h(other, current) >= best):
+            continue  # Rejected: cannot lie on a path cheaper than best
+        
+        expansions[side] += 1
+        for dr, dc in DIRECTIONS:
+            new_row, new_col = current[0] + dr, current[1] + dc
+            if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] != 0:
+                continue
+            neighbor = (new_row, new_col)
+            if neighbor in done:
+                continue
+            # Forward steps pay for the cell entered; backward steps pay
+            # for the cell left, which is entered on the real path
+            step = entry_cost(neighbor) if side == 0 else entry_cost(current)
+            tentative = g_current + step
+            if tentative < g[side].get(neighbor, float('inf')):
+                g[side][neighbor] = tentative
+                parents[side][neighbor] = current
+                heapq.heappush(open_lists[side], (tentative + h(side, neighbor), neighbor))
+                if neighbor in g[other] and tentative + g[other][neighbor] < best:
+                    best, meeting = tentative + g[other][neighbor], neighbor
+    
+    if meeting is None:
+        return BidirectionalResult(None, None, expansions[0], expansions[1])
+    
+    path = []
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+    node = parents[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    return BidirectionalResult(path, best, expansions[0], expansions[1])
 
 
 # Example usage and testing
@@ -139,5 +515,22 @@ if __name__ == "__main__":
         print(f"Path length: {len(path)}")
     else:
         print("No path found")
-
-
+    
+    # Asymmetric map: the start sits at the far end of two one-cell
+    # corridors that open into a hall, so its frontier stays tiny while the
+    # end's frontier spreads through the hall
+    hall = [[0] * 14 for _ in range(10)]
+    for c in range(13):
+        hall[1][c] = 1
+        hall[3][c + 1] = 1
+    start_pos, end_pos = (0, 0), (9, 9)
+    
+    for mode in ('alternate', 'balanced', 'nba_star'):
+        result = bidirectional_search_engine(hall, start_pos, end_pos, mode=mode)
+        print(f"{mode:9} cost {result.cost}, expansions forward "
+              f"{result.forward_expansions}, backward {result.backward_expansions}")
+    
+    # Weighted hall: entering a cell of the middle rows costs 4
+    weights = [[4 if 4 <= r <= 6 and c > 2 else 1 for c in range(14)] for r in range(10)]
+    result = bidirectional_search_engine(hall, start_pos, end_pos, mode='nba_star', weights=weights)
+    print(f"weighted nba_star cost {result.cost}")
@@ -1,5 +1,5 @@
 import heapq
-from typing import List, Tuple, Optional, Dict, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 def heuristic(a: Tuple[int, int], b: Tuple[int, int]) -> int:
@@ -22,6 +22,7 @@ def calculate_key(
     g_values: Dict[Tuple[int, int], float],
     rhs_values: Dict[Tuple[int, int], float],
     km: int,
+    heuristic_fn: Callable[[Tuple[int, int], Tuple[int, int]], float] = heuristic,
 ) -> Tuple[float, float]:
     """
     Calculate D* Lite priority key for a node.
@@ -34,17 +35,380 @@ def calculate_key(
         g_values (dict): g-value mapping (cost from node to start)
         rhs_values (dict): rhs-value mapping (lookahead cost)
         km (int): Key modifier (for incremental updates)
+        heuristic_fn (callable): Heuristic h(a, b), Manhattan by default
         
     Returns:
         tuple: Key as (k1, k2) for priority queue ordering
     """
     min_val = min(g_values.get(node, float('inf')), rhs_values.get(node, float('inf')))
-    k1 = min_val + heuristic(start, node) + km
+    k1 = min_val + heuristic_fn(start, node) + km
     k2 = min_val
     return (k1, k2)
 
 
-def d_star_lite(grid: List[List[int]], start: Tuple[int, int], end: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+Cell = Tuple[int, int]
+INF = float('inf')
+
+# Step events of compute_steps() and d_star_lite_steps(): vertex queued,
+# vertex expanded, cell on the final path (the same codes in every
+# pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+# Directions: up, down, left, right
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+class DStarLitePlanner:
+    """
+    Persistent D* Lite planner for a robot moving on a changing grid.
+    
+    The planner searches backward from the goal and keeps its g/rhs values,
+    priority queue and key modifier km between calls:
+    
+    - update_cells(changes) applies wall edits and re-evaluates only the
+      edited cells and their neighbours
+    - move_start(new_start) moves the robot and accumulates km, so queued
+      keys stay valid lower bounds without re-keying the queue
+    - next_step() repairs the plan lazily (ComputeShortestPath touches only
+      the vertices made inconsistent since the last call) and returns the
+      next cell to move to
+    
+    Replanning therefore costs time proportional to the region the changes
+    affect, not to the size of the map.
+    
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall); kept by reference
+            and edited through update_cells()
+        start (tuple): Robot position (row, col)
+        goal (tuple): Goal position (row, col)
+        heuristic_fn (callable): Admissible, consistent h(a, b)
+        
+    Raises:
+        ValueError: If grid is empty or positions are out of bounds
+    """
+    
+    def __init__(
+        self,
+        grid: List[List[int]],
+        start: Cell,
+        goal: Cell,
+        heuristic_fn: Callable[[Cell, Cell], float] = heuristic,
+    ) -> None:
+        if not grid or not grid[0]:
+            raise ValueError("Grid cannot be empty")
+        self.grid = grid
+        self.rows, self.cols = len(grid), len(grid[0])
+        for name, cell in (("Start", start), ("End", goal)):
+            if not self._in_bounds(cell):
+                raise ValueError(f"{name} position {cell} out of bounds")
+        
+        self.start = start
+        self.goal = goal
+        self.heuristic_fn = heuristic_fn
+        self.km = 0
+        self.last_start = start
+        
+        self.g_values: Dict[Cell, float] = {}
+        self.rhs_values: Dict[Cell, float] = {goal: 0}
+        
+        # Heap of (key, counter, node); queued[node] is the node's current
+        # key, heap entries with any other key are stale
+        self.pq: List[Tuple[Tuple[float, float], int, Cell]] = []
+        self.queued: Dict[Cell, Tuple[float, float]] = {}
+        self.counter = 0
+        
+        # Vertices expanded by ComputeShortestPath since construction
+        self.expansions = 0
+        
+        self._push(goal)
+    
+    def _in_bounds(self, cell: Cell) -> bool:
+        return 0 <= cell[0] < self.rows and 0 <= cell[1] < self.cols
+    
+    def _neighbors(self, cell: Cell) -> List[Cell]:
+        return [
+            (cell[0] + dr, cell[1] + dc)
+            for dr, dc in DIRECTIONS
+            if 0 <= cell[0] + dr < self.rows and 0 <= cell[1] + dc < self.cols
+        ]
+    
+    def _cost(self, a: Cell, b: Cell) -> float:
+        """Edge cost: 1 between two walkable cells, infinite otherwise."""
+        if self.grid[a[0]][a[1]] != 0 or self.grid[b[0]][b[1]] != 0:
+            return INF
+        return 1
+    
+    def _key(self, node: Cell) -> Tuple[float, float]:
+        return calculate_key(node, self.start, self.g_values, self.rhs_values,
+                             self.km, self.heuristic_fn)
+    
+    def _push(self, node: Cell) -> None:
+        key = self._key(node)
+        self.queued[node] = key
+        heapq.heappush(self.pq, (key, self.counter, node))
+        self.counter += 1
+    
+    def _top(self) -> Optional[Tuple[Tuple[float, float], Cell]]:
+        """Smallest live entry, discarding stale ones on the way."""
+        while self.pq:
+            key, _, node = self.pq[0]
+            if self.queued.get(node) == key:
+                return key, node
+            heapq.heappop(self.pq)
+        return None
+    
+    def _update_vertex(self, node: Cell) -> None:
+        if node != self.goal:
+            self.rhs_values[node] = min(
+                (self._cost(node, s) + self.g_values.get(s, INF) for s in self._neighbors(node)),
+                default=INF,
+            )
+        if self.g_values.get(node, INF) != self.rhs_values.get(node, INF):
+            self._push(node)
+        else:
+            self.queued.pop(node, None)
+    
+    def compute_shortest_path(self) -> None:
+        """Expand inconsistent vertices until the start is consistent and settled."""
+        while True:
+            top = self._top()
+            start_key = self._key(self.start)
+            start_consistent = self.rhs_values.get(self.start, INF) == self.g_values.get(self.start, INF)
+            if top is None or (top[0] >= start_key and start_consistent):
+                return
+            
+            k_old, u = top
+            k_new = self._key(u)
+            if k_old < k_new:
+                # Key grew since it was queued (km moved on): requeue
+                self._push(u)
+                continue
+            
+            heapq.heappop(self.pq)
+            del self.queued[u]
+            self.expansions += 1
+            
+            g_u, rhs_u = self.g_values.get(u, INF), self.rhs_values.get(u, INF)
+            if g_u > rhs_u:
+                # Over-consistent: settle g and propagate to predecessors
+                self.g_values[u] = rhs_u
+                for s in self._neighbors(u):
+                    self._update_vertex(s)
+            else:
+                # Under-consistent: invalidate and re-evaluate u and predecessors
+                self.g_values[u] = INF
+                self._update_vertex(u)
+                for s in self._neighbors(u):
+                    self._update_vertex(s)
+    
+    def compute_steps(self) -> Iterator[Tuple[int, int]]:
+        """
+        compute_shortest_path() as a generator of (cell_index, event_code)
+        pairs: EVENT_CLOSE for every expanded vertex, EVENT_OPEN for every
+        vertex it queues. The planner stays consistent between steps, so
+        the repair can be paused, resumed or abandoned (the next call
+        continues it).
+        """
+        cols = self.cols
+        while True:
+            top = self._top()
+            start_key = self._key(self.start)
+            start_consistent = self.rhs_values.get(self.start, INF) == self.g_values.get(self.start, INF)
+            if top is None or (top[0] >= start_key and start_consistent):
+                return
+            
+            k_old, u = top
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u)
+                continue
+            
+            heapq.heappop(self.pq)
+            del self.queued[u]
+            self.expansions += 1
+            yield u[0] * cols + u[1], EVENT_CLOSE
+            
+            g_u, rhs_u = self.g_values.get(u, INF), self.rhs_values.get(u, INF)
+            if g_u > rhs_u:
+                self.g_values[u] = rhs_u
+                updated = self._neighbors(u)
+            else:
+                self.g_values[u] = INF
+                updated = [u] + self._neighbors(u)
+            for s in updated:
+                self._update_vertex(s)
+                if s in self.queued:
+                    yield s[0] * cols + s[1], EVENT_OPEN
+    
+    def update_cells(self, changes: Iterable[Tuple[Cell, int]]) -> None:
+        """
+        Apply wall edits and mark the affected vertices inconsistent.
+        
+        Args:
+            changes (iterable): ((row, col), value) pairs, value 0 = walkable, 1 = wall
+        """
+        affected = set()
+        for cell, value in changes:
+            if self.grid[cell[0]][cell[1]] == value:
+                continue
+            self.grid[cell[0]][cell[1]] = value
+            affected.add(cell)
+            affected.update(self._neighbors(cell))
+        for node in affected:
+            self._update_vertex(node)
+    
+    def move_start(self, new_start: Cell) -> None:
+        """
+        Move the robot, accumulating the key modifier km.
+        
+        Args:
+            new_start (tuple): New robot position (row, col)
+        """
+        self.km += self.heuristic_fn(self.last_start, new_start)
+        self.last_start = new_start
+        self.start = new_start
+    
+    def next_step(self) -> Optional[Cell]:
+        """
+        Replan if needed and return the next cell on a shortest path.
+        
+        Returns:
+            tuple: Next cell to move to, the start itself at the goal, or
+            None if the goal is unreachable
+        """
+        self.compute_shortest_path()
+        if self.start == self.goal:
+            return self.start
+        if self.g_values.get(self.start, INF) == INF:
+            return None
+        
+        best, best_cost = None, INF
+        for s in self._neighbors(self.start):
+            cost = self._cost(self.start, s) + self.g_values.get(s, INF)
+            if cost < best_cost:
+                best, best_cost = s, cost
+        return best
+    
+    def path(self) -> Optional[List[Cell]]:
+        """
+        Replan if needed and return the whole current path.
+        
+        Returns:
+            list: Path from the robot position to the goal, or None if no path exists
+        """
+        self.compute_shortest_path()
+        if self.g_values.get(self.start, INF) == INF:
+            return None
+        
+        path = [self.start]
+        current = self.start
+        while current != self.goal:
+            best, best_cost = None, INF
+            for s in self._neighbors(current):
+                cost = self._cost(current, s) + self.g_values.get(s, INF)
+                if cost < best_cost:
+                    best, best_cost = s, cost
+            if best is None:
+                return None
+            current = best
+            path.append(current)
+        return path
+
+
+def d_star_lite_steps(
+    grid: List[List[int]],
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    heuristic_fn: Callable[[Tuple[int, int], Tuple[int, int]], float] = heuristic,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Step-by-step D* Lite planning for visualizers and streaming servers.
+    
+    A generator that yields one event per search step instead of running
+    to completion: stop iterating to pause, iterate again to resume and
+    call close() to cancel. Replanning after map changes can be streamed
+    the same way with DStarLitePlanner.compute_steps().
+    
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall/obstacle)
+        start (tuple): Starting position (row, col)
+        end (tuple): Goal position (row, col)
+        heuristic_fn (callable): Admissible h(a, b), Manhattan by default
+        
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN, EVENT_CLOSE or EVENT_PATH (the path
+        cells from start to end). The search runs backward from the goal.
+        
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+        
+    Raises:
+        ValueError: If grid is empty or positions are out of bounds
+    """
+    planner = DStarLitePlanner(grid, start, end, heuristic_fn)
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    cols = planner.cols
+    yield end[0] * cols + end[1], EVENT_OPEN
+    yield from planner.compute_steps()
+    path = planner.path()
+    if path is not None:
+        for row, col in path:
+            yield row * cols + col, EVENT_PATH
+    return path
+
+
+class _InstrumentedPlanner(DStarLitePlanner):
+    """
+    DStarLitePlanner that also counts queue operations.
+    
+    Only d_star_lite(stats=...) builds one, so the plain planner's methods
+    carry no counters. Every expansion pops its entry, so pops are the
+    expansions plus the stale entries discarded by _top().
+    """
+    
+    def __init__(self, *args: Any) -> None:
+        self.pushes = 0
+        self.stale = 0
+        self.peak_frontier = 0
+        self.reopenings = 0
+        super().__init__(*args)
+    
+    def _push(self, node: Cell) -> None:
+        # A vertex that already has a g-value was expanded before
+        if node in self.g_values and node not in self.queued:
+            self.reopenings += 1
+        super()._push(node)
+        self.pushes += 1
+        if len(self.pq) > self.peak_frontier:
+            self.peak_frontier = len(self.pq)
+    
+    def _top(self) -> Optional[Tuple[Tuple[float, float], Cell]]:
+        while self.pq:
+            key, _, node = self.pq[0]
+            if self.queued.get(node) == key:
+                return key, node
+            heapq.heappop(self.pq)
+            self.stale += 1
+        return None
+    
+    def record(self, stats: Any) -> None:
+        """Report the counters to a SearchStats-like collector."""
+        stats.record(self.expansions, self.pushes, self.expansions + self.stale, self.stale,
+                     self.peak_frontier, self.reopenings)
+
+
+def d_star_lite(
+    grid: List[List[int]],
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    heuristic_fn: Callable[[Tuple[int, int], Tuple[int, int]], float] = heuristic,
+    components: Optional[Any] = None,
+    stats: Optional[Any] = None,
+) -> Optional[List[Tuple[int, int]]]:
     """
     D* Lite Pathfinding Algorithm
     
@@ -59,21 +423,31 @@ def d_star_lite(grid: List[List[int]], start: Tuple[int, int], end: Tuple[int, i
     - Maintains g-values (costs) and rhs-values (lookahead costs)
     - Detects consistency violations and updates only affected nodes
     - Uses priority queue with two-part keys for ordering
-    - Supports incremental replanning (not shown in this static version)
+    - Supports incremental replanning through DStarLitePlanner
     
     Algorithm Steps:
     1. Initialize: Set rhs(goal) = 0, all other rhs = ∞, all g = ∞
     2. Insert goal in priority queue with calculated key
-    3. While priority queue not empty:
+    3. While the top key < key(start) or start is inconsistent:
        a. Pop node u with minimum key
-       b. If u is over-consistent (g > rhs): Update g, add neighbors to queue
-       c. If u is under-consistent (g < rhs): Set g = ∞, re-evaluate and add to queue
+       b. If u is over-consistent (g > rhs): Update g, update predecessors
+       c. If u is under-consistent (g < rhs): Set g = ∞, update u and predecessors
     4. Reconstruct path from start to goal using g-values
     
+    This function plans once; DStarLitePlanner keeps the search state
+    alive to replan after map changes and robot moves.
+    
     Args:
         grid (list): 2D grid (0 = walkable, 1 = wall/obstacle)
         start (tuple): Starting position (row, col)
         end (tuple): Goal position (row, col)
+        heuristic_fn (callable): Admissible h(a, b), Manhattan by default; a
+            cardinal LandmarkTable from alt_landmarks.py can be passed here
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented planner records its counters
+            (reopenings are expanded vertices made inconsistent again)
         
     Returns:
         list: Path from start to end as list of tuples, or None if no path exists
@@ -81,183 +455,47 @@ def d_star_lite(grid: List[List[int]], start: Tuple[int, int], end: Tuple[int, i
     Raises:
         ValueError: If grid is empty or positions are out of bounds
     """
-    if not grid or not grid[0]:
-        raise ValueError("Grid cannot be empty")
-    
-    rows, cols = len(grid), len(grid[0])
-    
-    # Validate start and end positions
-    if not (0 <= start[0] < rows and 0 <= start[1] < cols):
-        raise ValueError(f"Start position {start} out of bounds")
-    if not (0 <= end[0] < rows and 0 <= end[1] < cols):
-        raise ValueError(f"End position {end} out of bounds")
-    
-    # Handle start == end case
-    if start == end:
-        return [start]
-    
-    # Initialize g-values and rhs-values for all nodes
-    g_values: Dict[Tuple[int, int], float] = {}
-    rhs_values: Dict[Tuple[int, int], float] = {}
-    
-    # Priority queue: (key, counter, node) for stable sorting
-    # Using counter to break ties and ensure FIFO order for equal keys
-    pq: List[Tuple[Tuple[float, float], int, Tuple[int, int]]] = []
-    counter = 0
-    
-    # Set of nodes in priority queue (for lazy deletion)
-    in_queue: Set[Tuple[int, int]] = set()
-    
-    # Initialize: rhs(goal) = 0, all others = ∞
-    rhs_values[end] = 0
-    key = calculate_key(end, start, g_values, rhs_values, 0)
-    heapq.heappush(pq, (key, counter, end))
-    in_queue.add(end)
-    counter += 1
-    
-    # Directions: up, down, left, right
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    
-    # ComputeShortestPath: main D* Lite loop
-    while pq:
-        # Pop minimum key node
-        (k_old, _, u) = heapq.heappop(pq)
-        in_queue.discard(u)
-        
-        # Lazy deletion: verify key is current
-        k_new = calculate_key(u, start, g_values, rhs_values, 0)
-        if k_old > k_new:
-            # Outdated entry, re-insert with new key
-            heapq.heappush(pq, (k_new, counter, u))
-            in_queue.add(u)
-            counter += 1
-            continue
-        
-        # Check termination condition: key >= start's key AND start is consistent
-        start_key = calculate_key(start, start, g_values, rhs_values, 0)
-        if k_new >= start_key and rhs_values.get(start, float('inf')) == g_values.get(start, float('inf')):
-            # Shortest path found
-            break
-        
-        g_u = g_values.get(u, float('inf'))
-        rhs_u = rhs_values.get(u, float('inf'))
-        
-        if g_u > rhs_u:
-            # Over-consistent: update g-value
-            g_values[u] = rhs_u
-            
-            # Update predecessors (nodes that could reach u)
-            for dr, dc in directions:
-                s = (u[0] + dr, u[1] + dc)
-                
-                # Check bounds
-                if not (0 <= s[0] < rows and 0 <= s[1] < cols):
-                    continue
-                
-                # Skip if wall
-                if grid[s[0]][s[1]] == 1:
-                    continue
-                
-                # Skip goal node
-                if s == end:
-                    continue
-                
-                # Update rhs(s) = min(rhs(s), g(u) + 1)
-                old_rhs = rhs_values.get(s, float('inf'))
-                new_rhs = min(old_rhs, g_values.get(u, float('inf')) + 1)
-                rhs_values[s] = new_rhs
-                
-                # If s inconsistent, add to queue
-                if g_values.get(s, float('inf')) != rhs_values[s]:
-                    key_s = calculate_key(s, start, g_values, rhs_values, 0)
-                    heapq.heappush(pq, (key_s, counter, s))
-                    in_queue.add(s)
-                    counter += 1
-        else:
-            # Under-consistent: set g to infinity and re-evaluate
-            g_values[u] = float('inf')
-            
-            # Re-evaluate u itself
-            if u != end:
-                old_rhs = rhs_values.get(u, float('inf'))
-                # Find minimum rhs based on neighbors
-                min_rhs = float('inf')
-                for dr, dc in directions:
-                    s = (u[0] + dr, u[1] + dc)
-                    if 0 <= s[0] < rows and 0 <= s[1] < cols and grid[s[0]][s[1]] == 0:
-                        min_rhs = min(min_rhs, g_values.get(s, float('inf')) + 1)
-                rhs_values[u] = min_rhs
-            
-            # Update u if needed
-            if g_values.get(u, float('inf')) != rhs_values.get(u, float('inf')):
-                key_u = calculate_key(u, start, g_values, rhs_values, 0)
-                heapq.heappush(pq, (key_u, counter, u))
-                in_queue.add(u)
-                counter += 1
-            
-            # Re-evaluate predecessors
-            for dr, dc in directions:
-                s = (u[0] + dr, u[1] + dc)
-                
-                # Check bounds
-                if not (0 <= s[0] < rows and 0 <= s[1] < cols):
-                    continue
-                
-                # Skip if wall
-                if grid[s[0]][s[1]] == 1:
-                    continue
-                
-                # Skip goal
-                if s == end:
-                    continue
-                
-                # Recalculate rhs(s)
-                min_rhs = float('inf')
-                for dr2, dc2 in directions:
-                    s2 = (s[0] + dr2, s[1] + dc2)
-                    if 0 <= s2[0] < rows and 0 <= s2[1] < cols and grid[s2[0]][s2[1]] == 0:
-                        min_rhs = min(min_rhs, g_values.get(s2, float('inf')) + 1)
-                rhs_values[s] = min_rhs
-                
-                # If inconsistent, add to queue
-                if g_values.get(s, float('inf')) != rhs_values[s]:
-                    key_s = calculate_key(s, start, g_values, rhs_values, 0)
-                    heapq.heappush(pq, (key_s, counter, s))
-                    in_queue.add(s)
-                    counter += 1
-    
-    # No path found
-    if g_values.get(start, float('inf')) == float('inf'):
+    planner_class = DStarLitePlanner if stats is None else _InstrumentedPlanner
+    planner = planner_class(grid, start, end, heuristic_fn)
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
         return None
+    if components is not None and not components.connected(start, end):
+        return None
+    if stats is None:
+        return planner.path()
+    try:
+        return planner.path()
+    finally:
+        planner.record(stats)
+
+
+# Example usage and benchmark
+if __name__ == "__main__":
+    # A robot crosses a small room; a wall it did not know about appears
+    # across its planned route after the first steps
+    world = [[0] * 8 for _ in range(6)]
+    robot, goal = (0, 0), (0, 7)
+    planner = DStarLitePlanner([row[:] for row in world], robot, goal)
     
-    # Reconstruct path from start to end
-    path = [start]
-    current = start
+    print(f"Initial plan: {planner.path()}")
+    print(f"Expansions: {planner.expansions}")
     
-    while current != end:
-        # Find neighbor with minimum g-value
-        min_g = float('inf')
-        next_node = None
-        
-        for dr, dc in directions:
-            neighbor = (current[0] + dr, current[1] + dc)
-            
-            if not (0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols):
-                continue
-            
-            if grid[neighbor[0]][neighbor[1]] == 1:
-                continue
-            
-            g_neighbor = g_values.get(neighbor, float('inf'))
-            if g_neighbor < min_g:
-                min_g = g_neighbor
-                next_node = neighbor
-        
-        if next_node is None or min_g == float('inf'):
-            # No valid next node - shouldn't happen if algorithm is correct
-            return None
+    trail = [robot]
+    revealed = False
+    while robot != goal:
+        step = planner.next_step()
+        if step is None:
+            print("Goal became unreachable")
+            break
+        robot = step
+        planner.move_start(robot)
+        trail.append(robot)
         
-        current = next_node
-        path.append(current)
+        if not revealed and len(trail) == 3:
+            # Sensors reveal a wall with a single gap in the bottom row
+            planner.update_cells([((r, 4), 1) for r in range(5)])
+            revealed = True
+            print(f"Wall revealed at {robot}, new plan: {planner.path()}")
+            print(f"Expansions after repair: {planner.expansions}")
     
-    return path
+    print(f"Route driven: {trail}")
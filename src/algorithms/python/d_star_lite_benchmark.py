@@ -0,0 +1,122 @@
+"""
+D* Lite replanning benchmark
+
+A robot walks from one corner of a rooms map to the other while its
+sensors reveal new obstacles after every step. DStarLitePlanner repairs its
+plan incrementally; the baseline reruns astar_search from scratch on the
+same map at every step. Kept out of d_star_lite.py so the code panel's demo
+stays small and runs without sibling imports.
+"""
+
+import random
+import time
+
+from astar import astar_search
+from d_star_lite import DStarLitePlanner
+
+
+def rooms_map(size=150, room=15, seed=5):
+    """
+    Square map split into rooms with two doors in every wall segment.
+
+    Args:
+        size (int): Side length of the map
+        room (int): Room side length (wall spacing)
+        seed (int): Seed for door placement
+
+    Returns:
+        list: 2D grid (0 = walkable, 1 = wall)
+    """
+    rng = random.Random(seed)
+    world = [[0] * size for _ in range(size)]
+    for r in range(0, size, room):
+        for c in range(size):
+            world[r][c] = world[c][r] = 1
+    for r in range(0, size, room):
+        for c in range(0, size, room):
+            for _ in range(2):
+                world[r][min(size - 1, c + rng.randrange(1, room))] = 0
+                world[min(size - 1, r + rng.randrange(1, room))][c] = 0
+    return world
+
+
+def benchmark_replanning(world, robot, goal, obstacles_per_step=2, sensor_range=6, seed=5):
+    """
+    Drive a robot to the goal, comparing D* Lite repairs with fresh A* runs.
+
+    Args:
+        world (list): 2D grid, modified in place as obstacles appear
+        robot (tuple): Starting position (row, col)
+        goal (tuple): Target position (row, col)
+        obstacles_per_step (int): Obstacles revealed after each step
+        sensor_range (int): Max row/column offset of revealed obstacles
+        seed (int): Seed for obstacle placement
+
+    Returns:
+        dict: Step count, initial plan cost and the replanning totals of
+        both planners (seconds and expansions)
+    """
+    rng = random.Random(seed)
+    rows, cols = len(world), len(world[0])
+    planner = DStarLitePlanner([row[:] for row in world], robot, goal)
+
+    t0 = time.perf_counter()
+    planner.next_step()
+    initial_time = time.perf_counter() - t0
+    initial_expansions = planner.expansions
+
+    replan_time = astar_time = 0.0
+    astar_expansions = steps = 0
+    reached = True
+    while robot != goal:
+        t0 = time.perf_counter()
+        step = planner.next_step()
+        replan_time += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        fresh = astar_search(world, robot, goal)
+        astar_time += time.perf_counter() - t0
+        astar_expansions += fresh.expansions
+
+        if step is None:
+            reached = False
+            break
+        robot = step
+        planner.move_start(robot)
+        steps += 1
+
+        changes = []
+        for _ in range(obstacles_per_step):
+            cell = (robot[0] + rng.randint(-sensor_range, sensor_range),
+                    robot[1] + rng.randint(-sensor_range, sensor_range))
+            if 0 <= cell[0] < rows and 0 <= cell[1] < cols and cell not in (robot, goal):
+                changes.append((cell, 1))
+                world[cell[0]][cell[1]] = 1
+        planner.update_cells(changes)
+
+    return {
+        'steps': steps,
+        'reached': reached,
+        'initial_time': initial_time,
+        'initial_expansions': initial_expansions,
+        'replan_time': replan_time,
+        'replan_expansions': planner.expansions - initial_expansions,
+        'astar_time': astar_time,
+        'astar_expansions': astar_expansions,
+    }
+
+
+if __name__ == "__main__":
+    size = 150
+    world = rooms_map(size)
+    stats = benchmark_replanning(world, (1, 1), (size - 2, size - 2))
+
+    print(f"Initial plan: {stats['initial_time'] * 1000:.0f}ms, "
+          f"{stats['initial_expansions']} expansions")
+    if not stats['reached']:
+        print("Goal became unreachable")
+    print(f"{stats['steps']} steps on a {size}x{size} rooms map with obstacles appearing each step")
+    print(f"D* Lite replanning: {stats['replan_time'] * 1000:.0f}ms, "
+          f"{stats['replan_expansions']} expansions")
+    print(f"Fresh astar calls:  {stats['astar_time'] * 1000:.0f}ms, "
+          f"{stats['astar_expansions']} expansions")
@@ -1,6 +1,22 @@
 import heapq
+from array import array
+from collections import namedtuple
 
-def dijkstra(grid, start, end):
+# Step events of dijkstra_steps(): cell pushed on the heap, cell expanded,
+# cell on the final path (the same codes in every pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+# One answer of a multi-target query: the target cell, its cost from the
+# start and the path to it
+TargetResult = namedtuple('TargetResult', ['target', 'cost', 'path'])
+
+# Cost of cells the search did not reach in the flat distance arrays
+UNREACHED = -1
+
+
+def dijkstra(grid, start, end, components=None, stats=None, path_builder=None, swamps=None):
     """
     Dijkstra's Algorithm for Pathfinding
     Time Complexity: O((V + E) log V) where V is vertices and E is edges
@@ -13,10 +29,28 @@ def dijkstra(grid, start, end):
         grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
         start (tuple): Starting position (row, col)
         end (tuple): Target position (row, col)
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented copy of the search records its counters
+        path_builder (callable): Optional path_builder(start, end, came_from)
+            that builds the returned path from the parent links (came_from
+            maps each reached cell but start to the previous one), e.g.
+            CompactPath.from_parents from path_encoding.py
+        swamps (SwampTable): Optional dead-end regions from swamp_pruning.py
+            built for this grid; regions without an endpoint are skipped
         
     Returns:
-        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+        list: Path from start to end as list of (row, col) tuples (or what
+        path_builder returns), or None if no path exists
     """
+    if components is not None and not components.connected(start, end):
+        return None
+    if swamps is not None:
+        grid = swamps.prune(grid, start, end)
+    if stats is not None:
+        return _dijkstra_with_stats(grid, start, end, stats, path_builder)
+    
     rows, cols = len(grid), len(grid[0])
     
     # Priority queue: stores (distance, row, col)
@@ -36,6 +70,8 @@ def dijkstra(grid, start, end):
         
         # If we reached the end, reconstruct the path
         if (row, col) == end:
+            if path_builder is not None:
+                return path_builder(start, end, came_from)
             path = []
             current = end
             while current in came_from:
@@ -70,6 +106,267 @@ def dijkstra(grid, start, end):
     return None
 
 
+def dijkstra_steps(grid, start, end):
+    """
+    Step-by-step Dijkstra for visualizers and streaming servers.
+    
+    A generator that yields one event per search step instead of running
+    to completion: stop iterating to pause, iterate again to resume and
+    call close() to cancel. Nothing but the search state is kept.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN (also for a cheaper re-push),
+        EVENT_CLOSE or EVENT_PATH (the path cells from start to end)
+        
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+    """
+    rows, cols = len(grid), len(grid[0])
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    
+    pq = [(0, start[0], start[1])]
+    distances = {start: 0}
+    came_from = {}
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    yield start[0] * cols + start[1], EVENT_OPEN
+    
+    while pq:
+        current_dist, row, col = heapq.heappop(pq)
+        if current_dist > distances[(row, col)]:
+            continue
+        
+        if (row, col) == end:
+            path = [end]
+            while path[-1] in came_from:
+                path.append(came_from[path[-1]])
+            path.reverse()
+            for path_row, path_col in path:
+                yield path_row * cols + path_col, EVENT_PATH
+            return path
+        
+        yield row * cols + col, EVENT_CLOSE
+        for dr, dc in directions:
+            new_row, new_col = row + dr, col + dc
+            if (0 <= new_row < rows and 
+                0 <= new_col < cols and 
+                grid[new_row][new_col] == 0):
+                
+                new_dist = current_dist + 1
+                if new_dist < distances.get((new_row, new_col), float('inf')):
+                    distances[(new_row, new_col)] = new_dist
+                    came_from[(new_row, new_col)] = (row, col)
+                    heapq.heappush(pq, (new_dist, new_row, new_col))
+                    yield new_row * cols + new_col, EVENT_OPEN
+    
+    return None
+
+
+def _dijkstra_with_stats(grid, start, end, stats, path_builder):
+    """dijkstra() with counters; a separate copy so the plain search pays nothing."""
+    rows, cols = len(grid), len(grid[0])
+    pq = [(0, start[0], start[1])]
+    distances = {start: 0}
+    came_from = {}
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    expansions, pushes, pops, stale, peak = 0, 1, 0, 0, 1
+    
+    try:
+        while pq:
+            current_dist, row, col = heapq.heappop(pq)
+            pops += 1
+            
+            if (row, col) == end:
+                if path_builder is not None:
+                    return path_builder(start, end, came_from)
+                path = []
+                current = end
+                while current in came_from:
+                    path.append(current)
+                    current = came_from[current]
+                path.append(start)
+                return path[::-1]
+            
+            if current_dist > distances.get((row, col), float('inf')):
+                stale += 1
+                continue
+            
+            expansions += 1
+            for dr, dc in directions:
+                new_row, new_col = row + dr, col + dc
+                if (0 <= new_row < rows and 
+                    0 <= new_col < cols and 
+                    grid[new_row][new_col] == 0):
+                    
+                    new_dist = current_dist + 1
+                    if new_dist < distances.get((new_row, new_col), float('inf')):
+                        distances[(new_row, new_col)] = new_dist
+                        came_from[(new_row, new_col)] = (row, col)
+                        heapq.heappush(pq, (new_dist, new_row, new_col))
+                        pushes += 1
+            if len(pq) > peak:
+                peak = len(pq)
+        return None
+    finally:
+        stats.record(expansions, pushes, pops, stale, peak, 0)
+
+
+def dijkstra_nearest(grid, start, targets):
+    """
+    Path to the closest of many target cells with a single search.
+    
+    One Dijkstra search from start stops at the first target it settles,
+    instead of one dijkstra() call per target.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        targets (iterable): Candidate target positions (row, col); walls
+            never match
+        
+    Returns:
+        TargetResult: (target, cost, path) of the closest target, or None if
+        no target is reachable
+        
+    Raises:
+        ValueError: If a target is outside the grid
+    """
+    results = dijkstra_k_nearest(grid, start, targets, 1)
+    return results[0] if results else None
+
+
+def dijkstra_k_nearest(grid, start, targets, k):
+    """
+    Paths to the k closest of many target cells with a single search.
+    
+    The search settles cells in order of cost and stops as soon as k
+    targets (or every target) have been settled.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        targets (iterable): Candidate target positions (row, col); walls
+            never match and repeated cells count once
+        k (int): Number of targets to find
+        
+    Returns:
+        list: TargetResult (target, cost, path) for up to k targets, closest
+        first (fewer if fewer are reachable)
+        
+    Raises:
+        ValueError: If k < 1 or a target is outside the grid
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    rows, cols = len(grid), len(grid[0])
+    
+    # Target cell index -> target position
+    pending = {}
+    for row, col in targets:
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError(f"Target {(row, col)} is outside the grid")
+        if grid[row][col] == 0:
+            pending[row * cols + col] = (row, col)
+    if not pending or grid[start[0]][start[1]] != 0:
+        return []
+    
+    dist = array('i', [UNREACHED]) * (rows * cols)
+    parent = array('i', [-1]) * (rows * cols)
+    results = []
+    for index in _settle(grid, start, dist, parent):
+        target = pending.pop(index, None)
+        if target is None:
+            continue
+        path = []
+        current = index
+        while current != -1:
+            path.append(divmod(current, cols))
+            current = parent[current]
+        results.append(TargetResult(target, dist[index], path[::-1]))
+        if len(results) == k or not pending:
+            break
+    return results
+
+
+def dijkstra_within(grid, start, radius):
+    """
+    Cost of every cell within a radius of start.
+    
+    The search never pushes a cell beyond the radius, so it only touches
+    the cells it reports.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        radius (int): Largest cost to report
+        
+    Returns:
+        array: Flat array('i') indexed by row * cols + col holding the cost
+        from start, UNREACHED (-1) for walls and cells farther than radius
+        
+    Raises:
+        ValueError: If radius is negative
+    """
+    if radius < 0:
+        raise ValueError("Radius must be >= 0")
+    rows, cols = len(grid), len(grid[0])
+    dist = array('i', [UNREACHED]) * (rows * cols)
+    if grid[start[0]][start[1]] == 0:
+        for _ in _settle(grid, start, dist, None, radius):
+            pass
+    return dist
+
+
+def _settle(grid, start, dist, parent, radius=None):
+    """
+    Dijkstra over flat arrays shared with the caller, one settled cell at a time.
+    
+    Fills dist (and parent, unless None) in place, both indexed by
+    row * cols + col and UNREACHED / -1 for cells not reached yet. The
+    caller stops iterating once it has what it needs.
+    
+    Yields:
+        int: Index of each cell once its cost is final, cheapest first
+    """
+    rows, cols = len(grid), len(grid[0])
+    start_index = start[0] * cols + start[1]
+    dist[start_index] = 0
+    pq = [(0, start_index)]
+    
+    # Directions: up, down, left, right
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    
+    while pq:
+        current_dist, index = heapq.heappop(pq)
+        if current_dist > dist[index]:
+            continue
+        yield index
+        
+        new_dist = current_dist + 1
+        if radius is not None and new_dist > radius:
+            continue
+        row, col = divmod(index, cols)
+        for dr, dc in directions:
+            new_row, new_col = row + dr, col + dc
+            if (0 <= new_row < rows and 
+                0 <= new_col < cols and 
+                grid[new_row][new_col] == 0):
+                
+                new_index = new_row * cols + new_col
+                old_dist = dist[new_index]
+                if old_dist == UNREACHED or new_dist < old_dist:
+                    dist[new_index] = new_dist
+                    if parent is not None:
+                        parent[new_index] = index
+                    heapq.heappush(pq, (new_dist, new_index))
+
+
 # Example usage and test
 if __name__ == "__main__":
     # Create a sample grid (0 = walkable, 1 = wall)
@@ -99,3 +396,12 @@ if __name__ == "__main__":
     # Test with weighted grid (if you want to extend it)
     print("\nNote: This implementation treats all cells as equal weight (1).")
     print("For weighted grids, modify the grid to store weights instead of 0/1.")
+    
+    # Closest of several targets, the two closest and every cell within 3
+    targets = [(4, 0), (0, 4), (2, 2)]
+    nearest = dijkstra_nearest(test_grid, start_pos, targets)
+    print(f"\nNearest of {targets}: {nearest.target} at cost {nearest.cost}")
+    print(f"Two nearest: {[(t.target, t.cost) for t in dijkstra_k_nearest(test_grid, start_pos, targets, 2)]}")
+    costs = dijkstra_within(test_grid, start_pos, 3)
+    cols = len(test_grid[0])
+    print(f"Cells within cost 3: {[divmod(i, cols) for i, c in enumerate(costs) if c != UNREACHED]}")
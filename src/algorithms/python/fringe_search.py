@@ -0,0 +1,249 @@
+"""
+Fringe Search
+
+Fringe Search sits between A* and IDA*. Like IDA* it works in threshold
+iterations and never sorts its open list, but instead of restarting every
+iteration from the start it keeps the fringe of the previous iteration in a
+doubly linked list ("now" and "later" share one list: nodes over the
+threshold are left in place for the next iteration) and caches g and the
+parent of every visited cell, so no cell is re-expanded through a path that
+is not cheaper.
+
+All state lives in flat arrays indexed by row * cols + col: the g cache,
+parents and the next/prev links of the fringe list. There is no heap and no
+per-node tuple, so memory is a few bytes per cell regardless of how wide
+the frontier grows.
+
+Movement matches astar: 4-connected, unit cost, Manhattan heuristic (which
+is consistent, so the returned paths are optimal).
+
+Time Complexity: O(V * I) worst case for I threshold iterations, usually
+close to A*
+Space Complexity: O(V)
+"""
+
+import math
+from array import array
+from collections import namedtuple
+
+# Result of a Fringe Search run: the path, its cost, the number of node
+# expansions and the number of threshold iterations
+FringeResult = namedtuple('FringeResult', ['path', 'cost', 'expansions', 'iterations'])
+
+# Directions: up, down, left, right
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Link value meaning "no node" at either end of the fringe list
+NIL = -1
+
+
+def heuristic(a, b):
+    """
+    Calculate Manhattan distance heuristic between two points.
+
+    Args:
+        a (tuple): First point (row, col)
+        b (tuple): Second point (row, col)
+
+    Returns:
+        int: Manhattan distance
+    """
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def fringe_search_engine(grid, start, end, heuristic_fn=heuristic):
+    """
+    Fringe Search engine.
+
+    Each iteration walks the fringe list from its head. A node whose f
+    exceeds the threshold stays in the list for the next iteration and
+    lowers the next threshold candidate; otherwise it is expanded: every
+    child reached more cheaply than its cached g is (re)inserted right
+    after the node, so it is visited later in the same iteration, and the
+    node itself leaves the list.
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        heuristic_fn (callable): Consistent h(a, b) for 4-connected unit moves
+
+    Returns:
+        FringeResult: (path, cost, expansions, iterations); path and cost
+        are None if no path exists
+
+    Raises:
+        ValueError: If grid is empty or positions are out of bounds
+    """
+    if not grid or not grid[0]:
+        raise ValueError("Grid cannot be empty")
+    rows, cols = len(grid), len(grid[0])
+    for name, cell in (("Start", start), ("End", end)):
+        if not (0 <= cell[0] < rows and 0 <= cell[1] < cols):
+            raise ValueError(f"{name} position {cell} out of bounds")
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return FringeResult(None, None, 0, 0)
+
+    size = rows * cols
+    start_index = start[0] * cols + start[1]
+    end_index = end[0] * cols + end[1]
+
+    # Per-cell cache: g (inf = never reached) and parent index
+    g_cache = array('d', [math.inf]) * size
+    parent = array('i', [NIL]) * size
+    # Fringe list links; in_fringe marks the cells currently linked
+    next_link = array('i', [NIL]) * size
+    prev_link = array('i', [NIL]) * size
+    in_fringe = bytearray(size)
+
+    g_cache[start_index] = 0
+    in_fringe[start_index] = 1
+    head = start_index
+
+    threshold = heuristic_fn(start, end)
+    expansions = iterations = 0
+
+    while head != NIL:
+        iterations += 1
+        next_threshold = math.inf
+        node = head
+
+        while node != NIL:
+            row, col = divmod(node, cols)
+            g = g_cache[node]
+            f = g + heuristic_fn((row, col), end)
+            if f > threshold:
+                # Later: keep it for the next iteration
+                if f < next_threshold:
+                    next_threshold = f
+                node = next_link[node]
+                continue
+
+            if node == end_index:
+                path = []
+                while node != NIL:
+                    path.append(divmod(node, cols))
+                    node = parent[node]
+                return FringeResult(path[::-1], g, expansions, iterations)
+
+            # Now: expand, inserting children right after this node
+            expansions += 1
+            child_g = g + 1
+            for dr, dc in DIRECTIONS:
+                new_row, new_col = row + dr, col + dc
+                if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] != 0:
+                    continue
+                child = new_row * cols + new_col
+                if child_g >= g_cache[child]:
+                    continue
+                g_cache[child] = child_g
+                parent[child] = node
+
+                if in_fringe[child]:
+                    # Unlink from its old position
+                    before, after = prev_link[child], next_link[child]
+                    if before != NIL:
+                        next_link[before] = after
+                    else:
+                        head = after
+                    if after != NIL:
+                        prev_link[after] = before
+                in_fringe[child] = 1
+                after = next_link[node]
+                prev_link[child] = node
+                next_link[child] = after
+                next_link[node] = child
+                if after != NIL:
+                    prev_link[after] = child
+
+            # Remove the expanded node; continue with whatever follows it
+            before, after = prev_link[node], next_link[node]
+            if before != NIL:
+                next_link[before] = after
+            else:
+                head = after
+            if after != NIL:
+                prev_link[after] = before
+            in_fringe[node] = 0
+            node = after
+
+        threshold = next_threshold
+
+    return FringeResult(None, None, expansions, iterations)
+
+
+def fringe_search(grid, start, end):
+    """
+    Fringe Search with the same signature as astar.
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+
+    Returns:
+        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+    """
+    return fringe_search_engine(grid, start, end).path
+
+
+# Example usage and benchmark
+if __name__ == "__main__":
+    import random
+    import time
+    import tracemalloc
+    from astar import astar_search
+    from ida_star import ida_star_search
+
+    def maze(size, seed):
+        """Perfect maze carved by randomized depth-first search (odd size)."""
+        rng = random.Random(seed)
+        grid = [[1] * size for _ in range(size)]
+        stack = [(1, 1)]
+        grid[1][1] = 0
+        while stack:
+            row, col = stack[-1]
+            options = [(row + dr, col + dc, dr // 2, dc // 2)
+                       for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                       if 0 < row + dr < size - 1 and 0 < col + dc < size - 1
+                       and grid[row + dr][col + dc] == 1]
+            if not options:
+                stack.pop()
+                continue
+            new_row, new_col, wr, wc = rng.choice(options)
+            grid[row + wr][col + wc] = grid[new_row][new_col] = 0
+            stack.append((new_row, new_col))
+        return grid
+
+    def open_room(size):
+        """Open room with one wall the search has to walk around."""
+        grid = [[0] * size for _ in range(size)]
+        for row in range(size // 4, size):
+            grid[row][size // 2] = 1
+        return grid
+
+    def measure(search):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        path = search()
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return path, elapsed, peak
+
+    maps = [
+        ("maze 41x41", maze(41, 1), (1, 1), (39, 39)),
+        ("open room 24x24", open_room(24), (23, 0), (23, 23)),
+    ]
+    for name, grid, start_pos, end_pos in maps:
+        rows, cols = len(grid), len(grid[0])
+        print(f"{name}, {start_pos} -> {end_pos}:")
+        searches = [
+            ("astar", lambda: astar_search(grid, start_pos, end_pos).path),
+            ("ida_star", lambda: ida_star_search(grid, start_pos, end_pos, rows, cols).path),
+            ("fringe", lambda: fringe_search(grid, start_pos, end_pos)),
+        ]
+        for label, search in searches:
+            path, elapsed, peak = measure(search)
+            length = len(path) - 1 if path else None
+            print(f"  {label:9} cost {length}, {elapsed * 1000:7.1f}ms, peak {peak / 1024:6.1f} KiB")
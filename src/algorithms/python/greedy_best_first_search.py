@@ -26,20 +26,108 @@ def manhattan_distance(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
-def greedy_best_first_search(grid, start, end):
+# Maps with more cells than this track visited cells in a sparse dict
+# instead of a dense bitmap, so short hops on huge maps stay cheap
+DENSE_STATE_LIMIT = 1 << 20
+
+# Step events of greedy_best_first_search_steps(): cell pushed on the heap,
+# cell expanded, cell on the final path (the same codes in every
+# pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+# Directions: up, down, left, right
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+class _SearchState:
+    """
+    Visited flags and parent links, allocated lazily.
+    
+    Parents always live in a dict holding only the cells reached. Visited
+    flags use a bytearray bitmap on maps up to DENSE_STATE_LIMIT cells and
+    the parent dict itself beyond that.
+    """
+    
+    def __init__(self, rows, cols, start):
+        self.cols = cols
+        self.parent = {start: None}
+        self.bitmap = bytearray(rows * cols) if rows * cols <= DENSE_STATE_LIMIT else None
+        if self.bitmap is not None:
+            self.bitmap[start[0] * cols + start[1]] = 1
+    
+    def visited(self, row, col):
+        if self.bitmap is not None:
+            return self.bitmap[row * self.cols + col] == 1
+        return (row, col) in self.parent
+    
+    def visit(self, row, col, parent):
+        if self.bitmap is not None:
+            self.bitmap[row * self.cols + col] = 1
+        self.parent[(row, col)] = parent
+    
+    def forget(self, row, col):
+        """Drop a cell that was discarded from the open list."""
+        if self.bitmap is not None:
+            self.bitmap[row * self.cols + col] = 0
+        del self.parent[(row, col)]
+    
+    def path_to(self, cell):
+        path = []
+        while cell is not None:
+            path.append(cell)
+            cell = self.parent[cell]
+        path.reverse()
+        return path
+
+
+def greedy_best_first_search(grid, start, end, beam_width=None, max_open=None, components=None,
+                             stats=None):
     """
     Greedy Best-First Search pathfinding algorithm.
     
+    Cells are expanded in order of their Manhattan distance to the goal.
+    Two bounded modes trade completeness for memory and latency on very
+    large grids:
+    - max_open: the open list never holds more than max_open cells; when
+      it overflows, the worst half is discarded (and may be rediscovered)
+    - beam_width: beam search; every step expands the whole beam and keeps
+      only the beam_width successors closest to the goal, so memory and
+      work per step are bounded by the beam
+    
+    Both modes can miss a path that exists.
+    
     Args:
-        grid (list): 2D grid (not used for pathfinding, but kept for consistency)
+        grid (list): 2D grid (0 = walkable, 1 = wall)
         start (tuple): Starting position (row, col)
         end (tuple): Ending position (row, col)
+        beam_width (int): Optional beam width; enables beam search
+        max_open (int): Optional hard cap on open-list entries (greedy mode)
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented copy of the greedy loop records its
+            counters (not available with beam_width)
     
     Returns:
-        list: Path from start to end, or None if no path exists
+        list: Path from start to end, or None if no path exists (or none was
+        found within the bounds)
+    
+    Raises:
+        ValueError: If beam_width or max_open is smaller than 1, or stats
+            are requested for beam search
     """
+    if beam_width is not None and beam_width < 1:
+        raise ValueError("beam_width must be at least 1")
+    if max_open is not None and max_open < 1:
+        raise ValueError("max_open must be at least 1")
+    if stats is not None and beam_width is not None:
+        raise ValueError("stats are not collected in beam search")
     if not start or not end:
         return None
+    if components is not None and not components.connected(start, end):
+        return None
     
     rows = len(grid)
     cols = len(grid[0]) if rows > 0 else 0
@@ -51,57 +139,175 @@ def greedy_best_first_search(grid, start, end):
         end[1] < 0 or end[1] >= cols):
         return None
     
+    # Walls cannot be entered or left
+    if grid[start[0]][start[1]] == 1 or grid[end[0]][end[1]] == 1:
+        return None
+    
     # Check if start and end are the same
     if start == end:
         return [start]
     
+    state = _SearchState(rows, cols, start)
+    if beam_width is not None:
+        return _beam_search(grid, start, end, beam_width, state)
+    if stats is not None:
+        return _greedy_with_stats(grid, start, end, max_open, state, stats)
+    
     # Priority queue based on heuristic distance to goal
     # Each element: (heuristic, row, col)
     open_set = [(manhattan_distance(start, end), start[0], start[1])]
-    heapq.heapify(open_set)
-    
-    visited = [[False for _ in range(cols)] for _ in range(rows)]
-    parent = [[None for _ in range(cols)] for _ in range(rows)]
-    
-    visited[start[0]][start[1]] = True
-    
-    # Directions: up, down, left, right
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
     
     while open_set:
         h, row, col = heapq.heappop(open_set)
         
         # Check if we reached the goal
         if (row, col) == end:
-            # Reconstruct path
-            path = []
-            current = end
-            while current != start:
-                path.append(current)
-                current = parent[current[0]][current[1]]
-            path.append(start)
-            path.reverse()
-            return path
+            return state.path_to(end)
         
         # Explore neighbors
-        for d_row, d_col in directions:
+        for d_row, d_col in DIRECTIONS:
             new_row, new_col = row + d_row, col + d_col
             
-            # Check bounds
+            # Check bounds, walls and visited cells
             if (0 <= new_row < rows and 0 <= new_col < cols and
-                not visited[new_row][new_col]):
+                grid[new_row][new_col] == 0 and
+                not state.visited(new_row, new_col)):
                 
-                visited[new_row][new_col] = True
-                parent[new_row][new_col] = (row, col)
+                state.visit(new_row, new_col, (row, col))
                 
                 # Add to open set with heuristic as priority
                 heuristic = manhattan_distance((new_row, new_col), end)
                 heapq.heappush(open_set, (heuristic, new_row, new_col))
+        
+        if max_open is not None and len(open_set) > max_open:
+            # Keep the best half; a sorted list is a valid heap
+            keep = max(1, max_open // 2)
+            open_set.sort()
+            for _, dropped_row, dropped_col in open_set[keep:]:
+                state.forget(dropped_row, dropped_col)
+            del open_set[keep:]
     
     # No path found
     return None
 
 
+def greedy_best_first_search_steps(grid, start, end):
+    """
+    Step-by-step greedy best-first search for visualizers and streaming servers.
+    
+    A generator with the same search order as greedy_best_first_search()
+    that yields one event per search step instead of running to
+    completion: stop iterating to pause, iterate again to resume and call
+    close() to cancel. Nothing but the search state is kept.
+    
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Ending position (row, col)
+    
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN, EVENT_CLOSE or EVENT_PATH (the path
+        cells from start to end)
+    
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+    """
+    rows, cols = len(grid), len(grid[0])
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    
+    state = _SearchState(rows, cols, start)
+    open_set = [(manhattan_distance(start, end), start[0], start[1])]
+    yield start[0] * cols + start[1], EVENT_OPEN
+    
+    while open_set:
+        h, row, col = heapq.heappop(open_set)
+        if (row, col) == end:
+            path = state.path_to(end)
+            for path_row, path_col in path:
+                yield path_row * cols + path_col, EVENT_PATH
+            return path
+        
+        yield row * cols + col, EVENT_CLOSE
+        for d_row, d_col in DIRECTIONS:
+            new_row, new_col = row + d_row, col + d_col
+            if (0 <= new_row < rows and 0 <= new_col < cols and
+                grid[new_row][new_col] == 0 and
+                not state.visited(new_row, new_col)):
+                
+                state.visit(new_row, new_col, (row, col))
+                heapq.heappush(open_set, (manhattan_distance((new_row, new_col), end), new_row, new_col))
+                yield new_row * cols + new_col, EVENT_OPEN
+    
+    return None
+
+
+def _greedy_with_stats(grid, start, end, max_open, state, stats):
+    """Greedy loop with counters; a separate copy so the plain search pays nothing."""
+    rows, cols = len(grid), len(grid[0])
+    open_set = [(manhattan_distance(start, end), start[0], start[1])]
+    expansions, pushes, pops, peak = 0, 1, 0, 1
+    
+    try:
+        while open_set:
+            h, row, col = heapq.heappop(open_set)
+            pops += 1
+            if (row, col) == end:
+                return state.path_to(end)
+            
+            expansions += 1
+            for d_row, d_col in DIRECTIONS:
+                new_row, new_col = row + d_row, col + d_col
+                if (0 <= new_row < rows and 0 <= new_col < cols and
+                    grid[new_row][new_col] == 0 and
+                    not state.visited(new_row, new_col)):
+                    
+                    state.visit(new_row, new_col, (row, col))
+                    heapq.heappush(open_set, (manhattan_distance((new_row, new_col), end), new_row, new_col))
+                    pushes += 1
+            if len(open_set) > peak:
+                peak = len(open_set)
+            
+            if max_open is not None and len(open_set) > max_open:
+                keep = max(1, max_open // 2)
+                open_set.sort()
+                for _, dropped_row, dropped_col in open_set[keep:]:
+                    state.forget(dropped_row, dropped_col)
+                del open_set[keep:]
+        return None
+    finally:
+        # Cells are visited once (discarded ones are forgotten, not closed)
+        stats.record(expansions, pushes, pops, 0, peak, 0)
+
+
+def _beam_search(grid, start, end, beam_width, state):
+    """Beam search over the greedy heuristic; returns the path or None."""
+    rows, cols = len(grid), len(grid[0])
+    beam = [start]
+    
+    while beam:
+        candidates = []
+        for row, col in beam:
+            for d_row, d_col in DIRECTIONS:
+                new_row, new_col = row + d_row, col + d_col
+                if (0 <= new_row < rows and 0 <= new_col < cols and
+                    grid[new_row][new_col] == 0 and
+                    not state.visited(new_row, new_col)):
+                    state.visit(new_row, new_col, (row, col))
+                    if (new_row, new_col) == end:
+                        return state.path_to(end)
+                    candidates.append((manhattan_distance((new_row, new_col), end), new_row, new_col))
+        
+        # Keep the beam_width best successors, forget the rest
+        candidates.sort()
+        for _, dropped_row, dropped_col in candidates[beam_width:]:
+            state.forget(dropped_row, dropped_col)
+        beam = [(row, col) for _, row, col in candidates[:beam_width]]
+    
+    return None
+
+
 # Example usage and testing
 if __name__ == "__main__":
     # Example grid (5x5)
@@ -125,6 +331,20 @@ if __name__ == "__main__":
     else:
         print("No path found!")
     
+    print()
+    
+    # Walls are respected; beam search keeps only the best 2 cells per step
+    walled = [
+        [0, 0, 0, 0, 0],
+        [0, 1, 1, 1, 0],
+        [0, 0, 0, 1, 0],
+        [1, 1, 0, 1, 0],
+        [0, 0, 0, 0, 0]
+    ]
+    for beam_width in (None, 2):
+        path = greedy_best_first_search(walled, start, end, beam_width=beam_width)
+        print(f"Walled grid, beam_width={beam_width}: {path}")
+    
     print()
     print("Note: Greedy Best-First Search may not find the shortest path,")
     print("but it's often faster than optimal algorithms like A*.")
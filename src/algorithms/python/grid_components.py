@@ -0,0 +1,286 @@
+"""
+Grid Connected-Component Labeling
+
+Every pathfinder explores the whole region it can reach before it reports
+that the goal is unreachable; for bellman_ford and ida_star that is their
+worst case. Labeling the walkable cells once answers "are these two cells
+connected?" in O(1), so an unreachable query can be rejected before any
+search starts.
+
+Labels are built with a scanline flood fill and stored in a flat
+`array('i')` (one int per cell, -1 for walls). The map can change
+afterwards:
+- removing a wall joins the labels around it; labels are merged with a
+  union-find over label ids, so no cell is relabeled
+- adding a wall may split its component. Breadth-first searches start
+  from the new wall's neighbours in lockstep; pieces that finish without
+  meeting the others get a new label, and the search stops as soon as only
+  one piece is still growing, so the cost is bounded by the smaller pieces
+
+Connectivity is 4-neighbour by default, which matches every pathfinder
+that does not cut corners (diagonal steps in astar need both side cells
+free, so they never connect more than 4-neighbour steps do). Use
+diagonal=True for jump_point_search, which steps diagonally between two
+walls' corners. Pathfinders accept the index through their `components`
+argument.
+"""
+
+from array import array
+from collections import deque
+
+# Label of wall cells
+WALL = -1
+
+CARDINAL_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL_OFFSETS = CARDINAL_OFFSETS + ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+class GridComponents:
+    """
+    Connected-component labels of a grid, kept up to date as walls change.
+
+    Attributes:
+        rows (int): Grid height
+        cols (int): Grid width
+        diagonal (bool): Whether diagonal neighbours are connected
+    """
+
+    def __init__(self, grid, diagonal=False):
+        """
+        Label every walkable cell of the grid.
+
+        Args:
+            grid (list): 2D grid (0 = walkable, 1 = wall)
+            diagonal (bool): Connect diagonal neighbours (corner cutting)
+
+        Raises:
+            ValueError: If the grid is empty or its rows differ in length
+        """
+        if not grid or not grid[0]:
+            raise ValueError("Grid cannot be empty")
+        self.rows, self.cols = len(grid), len(grid[0])
+        if any(len(row) != self.cols for row in grid):
+            raise ValueError("All grid rows must have the same length")
+        self.diagonal = diagonal
+        self._offsets = DIAGONAL_OFFSETS if diagonal else CARDINAL_OFFSETS
+
+        size = self.rows * self.cols
+        self._walls = bytearray(1 if cell else 0 for row in grid for cell in row)
+        self._labels = array('i', [WALL]) * size
+        # Union-find over label ids: parent label of every label
+        self._parent = array('i')
+
+        for index in range(size):
+            if not self._walls[index] and self._labels[index] == WALL:
+                self._fill(index, self._new_label())
+
+    def _new_label(self):
+        self._parent.append(len(self._parent))
+        return len(self._parent) - 1
+
+    def _find(self, label):
+        parent = self._parent
+        while parent[label] != label:
+            # Path halving
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def _fill(self, index, label):
+        """Scanline flood fill of the unlabeled region around index."""
+        rows, cols = self.rows, self.cols
+        walls, labels = self._walls, self._labels
+        # Diagonal connectivity reaches one column past each end of a span
+        reach = 1 if self.diagonal else 0
+        stack = [index]
+        while stack:
+            index = stack.pop()
+            if labels[index] != WALL:
+                continue
+            row, col = divmod(index, cols)
+            row_start = row * cols
+            left = col
+            while left > 0 and not walls[row_start + left - 1] and labels[row_start + left - 1] == WALL:
+                left -= 1
+            right = col
+            while right < cols - 1 and not walls[row_start + right + 1] and labels[row_start + right + 1] == WALL:
+                right += 1
+            for position in range(row_start + left, row_start + right + 1):
+                labels[position] = label
+
+            # Seed one cell per run of unlabeled open cells above and below
+            for next_row in (row - 1, row + 1):
+                if not 0 <= next_row < rows:
+                    continue
+                next_start = next_row * cols
+                in_run = False
+                for next_col in range(max(0, left - reach), min(cols, right + reach + 1)):
+                    position = next_start + next_col
+                    if walls[position] or labels[position] != WALL:
+                        in_run = False
+                    elif not in_run:
+                        stack.append(position)
+                        in_run = True
+
+    def _neighbors(self, index):
+        row, col = divmod(index, self.cols)
+        for dr, dc in self._offsets:
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
+                new_index = new_row * self.cols + new_col
+                if not self._walls[new_index]:
+                    yield new_index
+
+    def _index(self, cell):
+        row, col = cell
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"Position {cell} out of bounds")
+        return row * self.cols + col
+
+    def label(self, cell):
+        """
+        Component id of a cell.
+
+        Args:
+            cell (tuple): Position (row, col)
+
+        Returns:
+            int: Component id (equal for connected cells), or WALL
+        """
+        label = self._labels[self._index(cell)]
+        return WALL if label == WALL else self._find(label)
+
+    def connected(self, a, b):
+        """
+        Whether a path between two cells can exist.
+
+        Args:
+            a (tuple): First position (row, col)
+            b (tuple): Second position (row, col)
+
+        Returns:
+            bool: True if both cells are walkable and in the same component
+        """
+        label_a = self.label(a)
+        return label_a != WALL and label_a == self.label(b)
+
+    def remove_wall(self, cell):
+        """Make a cell walkable, joining the components around it."""
+        index = self._index(cell)
+        if not self._walls[index]:
+            return
+        self._walls[index] = 0
+        roots = {self._find(self._labels[neighbor]) for neighbor in self._neighbors(index)}
+        if not roots:
+            self._labels[index] = self._new_label()
+            return
+        root = roots.pop()
+        for other in roots:
+            self._parent[other] = root
+        self._labels[index] = root
+
+    def add_wall(self, cell):
+        """Make a cell a wall, splitting its component if it was a cut cell."""
+        index = self._index(cell)
+        if self._walls[index]:
+            return
+        self._walls[index] = 1
+        self._labels[index] = WALL
+        starts = list(self._neighbors(index))
+        if len(starts) < 2:
+            return
+
+        # One breadth-first search per neighbour, advanced in lockstep.
+        # Searches that meet are merged (group union-find); a group whose
+        # queue runs dry is a separate piece
+        group_parent = list(range(len(starts)))
+        queues = [deque([start]) for start in starts]
+        members = [[start] for start in starts]
+        owner = {start: group for group, start in enumerate(starts)}
+
+        def group_of(group):
+            while group_parent[group] != group:
+                group = group_parent[group]
+            return group
+
+        active = set(range(len(starts)))
+        for group, start in enumerate(starts):
+            # Neighbours may already touch each other
+            for neighbor in self._neighbors(start):
+                other = owner.get(neighbor)
+                if other is not None and group_of(other) != group_of(group):
+                    self._merge(group_of(other), group_of(group), group_parent, queues, members, active)
+
+        while len(active) > 1:
+            for group in list(active):
+                if group not in active:
+                    continue
+                if not queues[group]:
+                    # Finished without meeting the others: a new component
+                    active.discard(group)
+                    label = self._new_label()
+                    for member in members[group]:
+                        self._labels[member] = label
+                    if len(active) == 1:
+                        break
+                    continue
+                current = queues[group].popleft()
+                for neighbor in self._neighbors(current):
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = group
+                        queues[group].append(neighbor)
+                        members[group].append(neighbor)
+                    else:
+                        other = group_of(other)
+                        if other != group:
+                            self._merge(other, group, group_parent, queues, members, active)
+                            group = other
+
+    @staticmethod
+    def _merge(keep, drop, group_parent, queues, members, active):
+        group_parent[drop] = keep
+        queues[keep].extend(queues[drop])
+        members[keep].extend(members[drop])
+        queues[drop] = members[drop] = None
+        active.discard(drop)
+
+    def update_cells(self, changes):
+        """
+        Apply wall changes.
+
+        Args:
+            changes (iterable): (cell, value) pairs, value 0 = walkable,
+                anything else = wall (the format DStarLitePlanner uses)
+        """
+        for cell, value in changes:
+            if value:
+                self.add_wall(cell)
+            else:
+                self.remove_wall(cell)
+
+
+# Example usage and test
+if __name__ == "__main__":
+    import time
+    from bellman_ford import bellman_ford
+
+    size = 60
+    grid = [[0] * size for _ in range(size)]
+    # A wall splits the map in two, with one gap near the top
+    for row in range(2, size):
+        grid[row][size // 2] = 1
+
+    components = GridComponents(grid)
+    start_pos, end_pos = (size - 1, 0), (size - 1, size - 1)
+    print(f"Connected with the gap open: {components.connected(start_pos, end_pos)}")
+
+    grid[1][size // 2] = grid[0][size // 2] = 1
+    components.update_cells([((1, size // 2), 1), ((0, size // 2), 1)])
+    print(f"Connected after closing the gap: {components.connected(start_pos, end_pos)}")
+
+    for label, kwargs in (("without", {}), ("with", {'components': components})):
+        t0 = time.perf_counter()
+        path = bellman_ford(grid, start_pos, end_pos, **kwargs)
+        print(f"bellman_ford {label} components: {path}, "
+              f"{(time.perf_counter() - t0) * 1000:.1f}ms")
@@ -0,0 +1,353 @@
+"""
+Memory-mapped Grid Maps
+
+A 16k x 16k map as a list of lists of ints costs gigabytes before any
+search starts. This module stores maps in a packed binary file and
+memory-maps it, so opening a map takes constant time and cells are paged
+in by the operating system only when a search reads them.
+
+File layout (little-endian):
+- 16-byte header: magic b'BFGM', format version (1), bits per cell (8 or
+  1), two reserved bytes, rows (uint32), cols (uint32)
+- cell data, row by row. With 8 bits per cell every cell is one byte
+  (0 = walkable, 1 = wall). With 1 bit per cell every row is padded to a
+  whole number of bytes and cell `col` is bit `col % 8` (least
+  significant first) of byte `col // 8` of its row
+
+MappedGrid exposes the file as a read-only grid: `len(grid)`,
+`grid[row][col]`, row slices and iteration over rows work as on a list
+of lists, so it can be passed to the pathfinders as is. Pathfinders that
+edit the grid (DStarLitePlanner.update_cells) need a writable copy.
+
+Converters write the format from a list-of-lists grid (write_grid) or
+stream it from a MovingAI `.map` text file one row at a time
+(convert_movingai_map), so neither side ever holds the whole map as
+Python objects.
+"""
+
+import mmap
+import struct
+
+MAGIC = b'BFGM'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHII')
+
+# Supported bits per cell
+CELL_BITS = (8, 1)
+
+# MovingAI terrain: '.', 'G' and 'S' are passable; '@', 'O', 'T' and 'W'
+# (out of bounds, trees, water) are walls for the grid pathfinders
+PASSABLE_TERRAIN = frozenset('.GS')
+
+# bytes.translate tables: MovingAI terrain -> 0/1 cell bytes, cell bytes ->
+# ASCII binary digits (for packing a row into one integer)
+_TERRAIN_CELLS = bytes(0 if chr(code) in PASSABLE_TERRAIN else 1 for code in range(256))
+_CELL_DIGITS = bytes(b'01'[min(code, 1)] for code in range(256))
+
+
+def read_movingai_header(lines, path):
+    """
+    Consume the header of a MovingAI `.map` file, up to its 'map' line.
+
+    Args:
+        lines (iterator): Lines of the file (str); left positioned on the
+            first map row
+        path (str): File name for error messages
+
+    Returns:
+        tuple: (height, width)
+
+    Raises:
+        ValueError: If the header is malformed
+    """
+    header = {}
+    for line in lines:
+        line = line.strip()
+        if line == 'map':
+            break
+        key, _, value = line.partition(' ')
+        header[key] = value
+    else:
+        raise ValueError(f"{path}: missing 'map' line")
+    try:
+        return int(header['height']), int(header['width'])
+    except (KeyError, ValueError) as error:
+        raise ValueError(f"{path}: malformed header") from error
+
+
+class _BitRow:
+    """Read-only view of one bit-packed row."""
+
+    __slots__ = ('_buffer', '_base', '_cols')
+
+    def __init__(self, buffer, base, cols):
+        self._buffer = buffer
+        self._base = base
+        self._cols = cols
+
+    def __len__(self):
+        return self._cols
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            # Pathfinders that cut sub-grids or pack lines slice rows
+            buffer, base = self._buffer, self._base
+            return [(buffer[base + (index >> 3)] >> (index & 7)) & 1
+                    for index in range(*col.indices(self._cols))]
+        if col < 0:
+            col += self._cols
+        if not 0 <= col < self._cols:
+            raise IndexError("column index out of range")
+        return (self._buffer[self._base + (col >> 3)] >> (col & 7)) & 1
+
+    def __iter__(self):
+        for col in range(self._cols):
+            yield (self._buffer[self._base + (col >> 3)] >> (col & 7)) & 1
+
+
+class MappedGrid:
+    """
+    Read-only grid backed by a memory-mapped packed map file.
+
+    Rows are views into the mapping, created on first access: a memoryview
+    (8 bits per cell) or a bit-row view (1 bit per cell). Writing to a cell
+    raises TypeError.
+
+    Attributes:
+        rows (int): Grid height
+        cols (int): Grid width
+        bits (int): Bits per cell (8 or 1)
+        cells (memoryview): Read-only cell data; with 8 bits per cell this
+            is a flat wall buffer indexed by row * cols + col, as taken by
+            batch_paths.search_from
+    """
+
+    def __init__(self, path):
+        """
+        Map a packed map file; nothing but the header is read.
+
+        Args:
+            path (str): File written by write_grid or convert_movingai_map
+
+        Raises:
+            ValueError: If the file is not a packed map or is truncated
+        """
+        with open(path, 'rb') as handle:
+            try:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                # Empty files cannot be mapped
+                raise ValueError(f"{path}: not a packed map file") from error
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError(f"{path}: not a packed map file")
+        magic, version, bits, _, rows, cols = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or bits not in CELL_BITS or not rows or not cols:
+            self._map.close()
+            raise ValueError(f"{path}: not a packed map file")
+
+        self.rows, self.cols, self.bits = rows, cols, bits
+        self._stride = cols if bits == 8 else (cols + 7) // 8
+        if len(self._map) < HEADER.size + rows * self._stride:
+            self._map.close()
+            raise ValueError(f"{path}: truncated map data")
+        self.cells = memoryview(self._map)[HEADER.size:HEADER.size + rows * self._stride]
+        self._views = {}
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        view = self._views.get(row)
+        if view is None:
+            if row < 0:
+                row += self.rows
+            if not 0 <= row < self.rows:
+                raise IndexError("row index out of range")
+            base = row * self._stride
+            if self.bits == 8:
+                view = self.cells[base:base + self.cols]
+            else:
+                view = _BitRow(self.cells, base, self.cols)
+            self._views[row] = view
+        return view
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield self[row]
+
+    def to_list(self):
+        """
+        Copy the grid into a list of lists (for pathfinders that edit it).
+
+        Returns:
+            list: 2D grid (0 = walkable, 1 = wall)
+        """
+        return [list(row) for row in self]
+
+    def close(self):
+        """Unmap the file; row views handed out before must not be used afterwards."""
+        for view in self._views.values():
+            if isinstance(view, memoryview):
+                view.release()
+        self._views.clear()
+        self.cells.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_grid(path):
+    """
+    Memory-map a packed map file as a read-only grid.
+
+    Args:
+        path (str): File written by write_grid or convert_movingai_map
+
+    Returns:
+        MappedGrid: Grid view of the file (usable as a context manager)
+
+    Raises:
+        ValueError: If the file is not a packed map or is truncated
+    """
+    return MappedGrid(path)
+
+
+def _pack_row(cells, cols, bits):
+    """Encode one row of 0/1 cell bytes for the file."""
+    if bits == 8:
+        return cells
+    # Cell c becomes bit c of a little-endian integer: reverse the row so
+    # the first cell is the last (least significant) binary digit
+    return int(cells[::-1].translate(_CELL_DIGITS), 2).to_bytes((cols + 7) // 8, 'little')
+
+
+def _write(path, rows, cols, bits, packed_rows):
+    if bits not in CELL_BITS:
+        raise ValueError(f"bits must be one of {CELL_BITS}")
+    with open(path, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, bits, 0, rows, cols))
+        for cells in packed_rows:
+            handle.write(_pack_row(cells, cols, bits))
+
+
+def write_grid(grid, path, bits=8):
+    """
+    Write a list-of-lists grid as a packed map file.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, anything else = wall)
+        path (str): Output file
+        bits (int): Bits per cell, 8 or 1
+
+    Raises:
+        ValueError: If the grid is empty, its rows differ in length or bits
+            is not supported
+    """
+    if not grid or not grid[0]:
+        raise ValueError("Grid cannot be empty")
+    rows, cols = len(grid), len(grid[0])
+    if any(len(row) != cols for row in grid):
+        raise ValueError("All grid rows must have the same length")
+    _write(path, rows, cols, bits, (bytes(1 if cell else 0 for cell in row) for row in grid))
+
+
+def convert_movingai_map(map_path, path, bits=8):
+    """
+    Convert a MovingAI `.map` file into a packed map file, one row at a time.
+
+    Terrain is classified by PASSABLE_TERRAIN, as in
+    pathfinding_benchmark.load_movingai_map.
+
+    Args:
+        map_path (str): MovingAI `.map` file
+        path (str): Output file
+        bits (int): Bits per cell, 8 or 1
+
+    Raises:
+        ValueError: If the header is malformed, the map has the wrong size
+            or bits is not supported
+    """
+    with open(map_path, 'rb') as handle:
+        height, width = read_movingai_header(
+            (line.decode('ascii', 'replace') for line in handle), map_path)
+        if not height or not width:
+            raise ValueError(f"{map_path}: empty map")
+
+        def rows():
+            count = 0
+            for line in handle:
+                line = line.rstrip(b'\r\n')
+                if not line:
+                    continue
+                if count == height:
+                    break
+                if len(line) != width:
+                    raise ValueError(f"{map_path}: expected {height} rows of {width} cells")
+                count += 1
+                yield line.translate(_TERRAIN_CELLS)
+            if count != height:
+                raise ValueError(f"{map_path}: expected {height} rows of {width} cells")
+
+        _write(path, height, width, bits, rows())
+
+
+# Example usage and benchmark
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+    from astar import astar_search
+    from hpa_star import hpa_star
+    from jump_point_search import jump_point_search
+
+    size = 1000
+    rng = random.Random(11)
+    grid = [[1 if rng.random() < 0.25 else 0 for _ in range(size)] for _ in range(size)]
+    grid[0][0] = grid[size - 1][size - 1] = 0
+    start_pos, end_pos = (0, 0), (size - 1, size - 1)
+    reference = astar_search(grid, start_pos, end_pos)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for bits in CELL_BITS:
+            path = os.path.join(directory, f"map{bits}.grid")
+            t0 = time.perf_counter()
+            write_grid(grid, path, bits)
+            written = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            with open_grid(path) as mapped:
+                opened = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                result = astar_search(mapped, start_pos, end_pos)
+                searched = time.perf_counter() - t0
+            print(f"{bits} bit(s)/cell: {os.path.getsize(path):,} bytes, written in "
+                  f"{written:.2f}s, opened in {opened * 1e6:.0f}us, astar {searched:.2f}s, "
+                  f"same cost: {result.cost == reference.cost}")
+
+        # Pathfinders that slice rows (Block JPS packs lines, HPA* cuts
+        # cluster sub-grids) on a 1-bit map
+        small = [row[:160] for row in grid[:160]]
+        small_end = (159, 159)
+        small[159][159] = 0
+        path = os.path.join(directory, "small1.grid")
+        write_grid(small, path, bits=1)
+        with open_grid(path) as mapped:
+            for name, search in (("jump_point_search (block)",
+                                  lambda g: jump_point_search(g, start_pos, small_end, scan='block')),
+                                 ("hpa_star", lambda g: hpa_star(g, start_pos, small_end))):
+                found = search(mapped)
+                print(f"{name} on 1-bit map: {len(found)} cells, same path: {found == search(small)}")
+
+        # A small MovingAI map converted without building a list of lists
+        map_path = os.path.join(directory, "tiny.map")
+        with open(map_path, 'w') as handle:
+            handle.write("type octile\nheight 3\nwidth 5\nmap\n..@..\n.T@..\n.....\n")
+        convert_movingai_map(map_path, os.path.join(directory, "tiny.grid"), bits=1)
+        with open_grid(os.path.join(directory, "tiny.grid")) as mapped:
+            print(f"tiny.map as a grid: {mapped.to_list()}")
@@ -0,0 +1,343 @@
+"""
+Hierarchical Pathfinding A* (HPA*)
+
+HPA* answers queries on large grids by searching a small abstract graph
+instead of the full grid:
+
+1. The grid is partitioned into square clusters.
+2. Entrances are found on every border between two adjacent clusters:
+   each maximal run of cell pairs that are walkable on both sides becomes
+   one transition (its middle pair) or, for wide runs, two transitions
+   (its end pairs). Transition cells are the abstract nodes.
+3. Inside each cluster the cost between every pair of its abstract nodes
+   is precomputed with a BFS restricted to the cluster.
+
+A query temporarily links start and goal to the abstract nodes of their
+clusters, runs A* on the abstract graph and then refines every abstract
+edge with `astar` on the cluster it crosses. Paths are near-optimal (the
+abstraction only allows crossing borders at transitions), typically within
+a few percent of the optimum.
+
+When a wall changes only the cluster containing the cell is recomputed:
+the entrances on its four borders and the intra-cluster costs of it and
+of the neighbours sharing those borders.
+
+Preprocessing: O(V * t) where t is the number of transitions per cluster
+Query: abstract search over O(V / c^2 * t) nodes plus local refinement
+"""
+
+import heapq
+from collections import deque
+
+from astar import astar, heuristic
+
+# Runs of walkable border pairs wider than this get two transitions
+MAX_ENTRANCE_WIDTH = 6
+
+
+class HierarchicalGrid:
+    """
+    Abstract graph of a 4-connected unit-cost grid for HPA* queries.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall); kept by reference and
+            modified through set_cell()
+        cluster_size (int): Side length of the square clusters
+    """
+
+    def __init__(self, grid, cluster_size=16):
+        if not grid or not grid[0]:
+            raise ValueError("Grid cannot be empty")
+        if cluster_size < 2:
+            raise ValueError("Cluster size must be at least 2")
+
+        self.grid = grid
+        self.rows, self.cols = len(grid), len(grid[0])
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+
+        # (cluster_a, cluster_b) -> list of (cell_a, cell_b) transitions,
+        # with cluster_a the upper or left one
+        self.borders = {}
+        # Abstract node -> set of transition partners in adjacent clusters
+        self.inter_edges = {}
+        # Cluster -> {node: {other_node: cost}} within that cluster
+        self.intra_edges = {}
+
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                if cr + 1 < self.cluster_rows:
+                    self._build_border((cr, cc), (cr + 1, cc))
+                if cc + 1 < self.cluster_cols:
+                    self._build_border((cr, cc), (cr, cc + 1))
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                self._build_intra_edges((cr, cc))
+
+    def cluster_of(self, cell):
+        """Return the (cluster_row, cluster_col) containing a cell."""
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def cluster_bounds(self, cluster):
+        """Return (row0, col0, row1, col1), the half-open cell range of a cluster."""
+        row0 = cluster[0] * self.cluster_size
+        col0 = cluster[1] * self.cluster_size
+        return (row0, col0,
+                min(row0 + self.cluster_size, self.rows),
+                min(col0 + self.cluster_size, self.cols))
+
+    def cluster_nodes(self, cluster):
+        """Return the abstract nodes lying inside a cluster."""
+        return list(self.intra_edges.get(cluster, {}))
+
+    def _neighbour_clusters(self, cluster):
+        cr, cc = cluster
+        for nr, nc in ((cr - 1, cc), (cr + 1, cc), (cr, cc - 1), (cr, cc + 1)):
+            if 0 <= nr < self.cluster_rows and 0 <= nc < self.cluster_cols:
+                yield (nr, nc)
+
+    def _border_key(self, a, b):
+        return (a, b) if a < b else (b, a)
+
+    def _build_border(self, cluster_a, cluster_b):
+        """(Re)compute the transitions across the border between two clusters."""
+        key = self._border_key(cluster_a, cluster_b)
+        upper, lower = key
+        row0, col0, row1, col1 = self.cluster_bounds(upper)
+
+        # Pairs of facing cells across the border, in order along it
+        if upper[0] != lower[0]:
+            pairs = [((row1 - 1, c), (row1, c)) for c in range(col0, col1)]
+        else:
+            pairs = [((r, col1 - 1), (r, col1)) for r in range(row0, row1)]
+
+        for cell_a, cell_b in self.borders.pop(key, []):
+            self.inter_edges.get(cell_a, set()).discard(cell_b)
+            self.inter_edges.get(cell_b, set()).discard(cell_a)
+
+        transitions = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and self.grid[pair[0][0]][pair[0][1]] == 0 \
+                    and self.grid[pair[1][0]][pair[1][1]] == 0:
+                run.append(pair)
+                continue
+            if run:
+                if len(run) > MAX_ENTRANCE_WIDTH:
+                    transitions.extend([run[0], run[-1]])
+                else:
+                    transitions.append(run[len(run) // 2])
+                run = []
+
+        self.borders[key] = transitions
+        for cell_a, cell_b in transitions:
+            self.inter_edges.setdefault(cell_a, set()).add(cell_b)
+            self.inter_edges.setdefault(cell_b, set()).add(cell_a)
+
+    def _local_distances(self, source, cluster):
+        """BFS distances from a cell to every cell of its cluster, staying inside it."""
+        row0, col0, row1, col1 = self.cluster_bounds(cluster)
+        dist = {source: 0}
+        queue = deque([source])
+        while queue:
+            row, col = queue.popleft()
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                new_row, new_col = row + dr, col + dc
+                if (row0 <= new_row < row1 and col0 <= new_col < col1 and
+                        self.grid[new_row][new_col] == 0 and
+                        (new_row, new_col) not in dist):
+                    dist[(new_row, new_col)] = dist[(row, col)] + 1
+                    queue.append((new_row, new_col))
+        return dist
+
+    def _build_intra_edges(self, cluster):
+        """(Re)compute the node-to-node costs inside a cluster."""
+        nodes = set()
+        for neighbour in self._neighbour_clusters(cluster):
+            for cell_a, cell_b in self.borders.get(self._border_key(cluster, neighbour), []):
+                nodes.add(cell_a if self.cluster_of(cell_a) == cluster else cell_b)
+
+        edges = {}
+        for node in nodes:
+            dist = self._local_distances(node, cluster)
+            edges[node] = {other: dist[other] for other in nodes
+                           if other != node and other in dist}
+        self.intra_edges[cluster] = edges
+
+    def set_cell(self, row, col, value):
+        """
+        Change one cell and repair the abstraction locally.
+
+        Only the borders of the cluster containing the cell and the intra
+        costs of that cluster and its direct neighbours are recomputed.
+
+        Args:
+            row (int): Cell row
+            col (int): Cell column
+            value (int): New cell value (0 = walkable, 1 = wall)
+        """
+        if self.grid[row][col] == value:
+            return
+        self.grid[row][col] = value
+
+        cluster = self.cluster_of((row, col))
+        neighbours = list(self._neighbour_clusters(cluster))
+        for neighbour in neighbours:
+            self._build_border(cluster, neighbour)
+        for affected in [cluster] + neighbours:
+            self._build_intra_edges(affected)
+
+    def _local_path(self, source, target, cluster):
+        """Refine one abstract edge with astar on the cluster's sub-grid."""
+        row0, col0, row1, col1 = self.cluster_bounds(cluster)
+        sub_grid = [self.grid[r][col0:col1] for r in range(row0, row1)]
+        local = astar(sub_grid, (source[0] - row0, source[1] - col0),
+                      (target[0] - row0, target[1] - col0))
+        if local is None:
+            return None
+        return [(r + row0, c + col0) for r, c in local]
+
+    def _abstract_neighbours(self, node, extra):
+        for other, cost in self.intra_edges[self.cluster_of(node)].get(node, {}).items():
+            yield other, cost
+        for other in self.inter_edges.get(node, ()):
+            yield other, 1
+        for other, cost in extra.get(node, {}).items():
+            yield other, cost
+
+    def find_path(self, start, end):
+        """
+        Find a near-optimal path with a hierarchical query.
+
+        Args:
+            start (tuple): Starting position (row, col)
+            end (tuple): Target position (row, col)
+
+        Returns:
+            list: Path from start to end as list of (row, col) tuples, or None if no path exists
+        """
+        if self.grid[start[0]][start[1]] != 0 or self.grid[end[0]][end[1]] != 0:
+            return None
+        if start == end:
+            return [start]
+
+        # Temporary edges linking start and goal into the abstract graph
+        extra = {}
+
+        def link(cell):
+            cluster = self.cluster_of(cell)
+            dist = self._local_distances(cell, cluster)
+            for node in self.intra_edges[cluster]:
+                if node in dist and node != cell:
+                    extra.setdefault(cell, {})[node] = dist[node]
+                    extra.setdefault(node, {})[cell] = dist[node]
+            return dist
+
+        start_dist = link(start)
+        link(end)
+        if self.cluster_of(start) == self.cluster_of(end) and end in start_dist:
+            extra.setdefault(start, {})[end] = start_dist[end]
+
+        # A* over the abstract graph
+        pq = [(heuristic(start, end), 0, start)]
+        g_scores = {start: 0}
+        came_from = {}
+        closed = set()
+        while pq:
+            _, g, node = heapq.heappop(pq)
+            if node in closed:
+                continue
+            if node == end:
+                break
+            closed.add(node)
+            for other, cost in self._abstract_neighbours(node, extra):
+                tentative_g = g + cost
+                if tentative_g < g_scores.get(other, float('inf')):
+                    g_scores[other] = tentative_g
+                    came_from[other] = node
+                    heapq.heappush(pq, (tentative_g + heuristic(other, end), tentative_g, other))
+        else:
+            return None
+
+        abstract_path = [end]
+        while abstract_path[-1] != start:
+            abstract_path.append(came_from[abstract_path[-1]])
+        abstract_path.reverse()
+
+        # Refine each abstract edge inside the single cluster it crosses
+        path = [start]
+        for source, target in zip(abstract_path, abstract_path[1:]):
+            if self.cluster_of(source) != self.cluster_of(target):
+                path.append(target)
+                continue
+            segment = self._local_path(source, target, self.cluster_of(source))
+            if segment is None:
+                return None
+            path.extend(segment[1:])
+        return path
+
+
+def hpa_star(grid, start, end, cluster_size=16):
+    """
+    One-shot HPA* query (builds the abstraction, then searches).
+
+    Build a HierarchicalGrid once and call find_path() to amortize the
+    preprocessing over many queries.
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        cluster_size (int): Side length of the square clusters
+
+    Returns:
+        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+    """
+    return HierarchicalGrid(grid, cluster_size).find_path(start, end)
+
+
+# Example usage and test
+if __name__ == "__main__":
+    import random
+    import time
+    from astar import astar_search
+
+    # Rooms map: 16x16 rooms with one or two doors in every wall
+    rng = random.Random(7)
+    size, room = 256, 16
+    rooms = [[0] * size for _ in range(size)]
+    for r in range(0, size, room):
+        for c in range(size):
+            rooms[r][c] = 1
+            rooms[c][r] = 1
+    for r in range(0, size, room):
+        for c in range(0, size, room):
+            for _ in range(2):
+                rooms[r][c + rng.randrange(1, room)] = 0
+                rooms[r + rng.randrange(1, room)][c] = 0
+
+    start_pos, end_pos = (1, 1), (size - 2, size - 2)
+
+    t0 = time.perf_counter()
+    hierarchy = HierarchicalGrid(rooms, cluster_size=room)
+    t1 = time.perf_counter()
+    path = hierarchy.find_path(start_pos, end_pos)
+    t2 = time.perf_counter()
+    optimal = astar_search(rooms, start_pos, end_pos)
+    t3 = time.perf_counter()
+
+    nodes = sum(len(edges) for edges in hierarchy.intra_edges.values())
+    print(f"Abstract graph: {nodes} nodes, built in {t1 - t0:.3f}s")
+    print(f"HPA* query: {len(path) - 1} steps in {(t2 - t1) * 1000:.1f}ms")
+    print(f"A* query:   {optimal.cost} steps in {(t3 - t2) * 1000:.1f}ms "
+          f"({optimal.expansions} expansions)")
+
+    # Close a door and repair only the affected clusters
+    row, col = path[len(path) // 2]
+    t0 = time.perf_counter()
+    hierarchy.set_cell(row, col, 1)
+    t1 = time.perf_counter()
+    repaired = hierarchy.find_path(start_pos, end_pos)
+    print(f"Wall at {(row, col)}: local repair {(t1 - t0) * 1000:.1f}ms, "
+          f"new path {len(repaired) - 1 if repaired else None} steps")
@@ -1,51 +1,372 @@
-def ida_star(grid, start, end, rows, cols):
-    def manhattan_distance(a, b):
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-    def search(path, g, threshold):
-        current = path[-1]
-        f = g + manhattan_distance(current, end)
-
-        if f > threshold:
-            return False, f
-            
-        if current == end:
-            return True, f
-
-        min_threshold = float('inf')
-        
-        # Directions: Up, Down, Left, Right
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        
-        for dr, dc in directions:
-            next_node = (current[0] + dr, current[1] + dc)
-            
-            if (0 <= next_node[0] < rows and 
-                0 <= next_node[1] < cols and 
-                next_node not in path):
-                
-                path.append(next_node)
-                found, next_threshold = search(path, g + 1, threshold)
-                
-                if found:
-                    return True, next_threshold
-                    
-                if next_threshold < min_threshold:
-                    min_threshold = next_threshold
-                    
-                path.pop()
-
-        return False, min_threshold
+from collections import OrderedDict, namedtuple
 
+# Result of an IDA* run: the path, its cost and, for every threshold
+# iteration, a (threshold, nodes_expanded) pair
+IDAStarResult = namedtuple('IDAStarResult', ['path', 'cost', 'iterations'])
+
+# Default number of cells remembered by the transposition table
+DEFAULT_TABLE_SIZE = 1 << 16
+
+# Step events of ida_star_steps(): cell pushed on the DFS stack, cell
+# backtracked from, cell on the final path (the same codes in every
+# pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+
+def manhattan_distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def ida_star_search(grid, start, end, rows, cols, table_size=DEFAULT_TABLE_SIZE, components=None,
+                    stats=None):
+    """
+    Iterative IDA* engine.
+
+    Each threshold iteration is a depth-first search driven by an explicit
+    stack of (cell, g, next direction) frames, so long paths never hit the
+    recursion limit. Cells on the current path are marked in a flat
+    bytearray for O(1) cycle checks, walls are read from the grid, and a
+    bounded transposition table (cell -> best g seen in this iteration,
+    LRU eviction) cuts re-expansions of cells already reached as cheaply
+    within the same iteration.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        rows (int): Number of rows
+        cols (int): Number of columns
+        table_size (int): Maximum transposition table entries (0 disables it)
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented copy of the search records its counters
+            (the frontier is the DFS stack, stale entries are transposition
+            table cutoffs and reopenings are cells expanded more than once)
+
+    Returns:
+        IDAStarResult: (path, cost, iterations); path and cost are None if
+        no path exists
+    """
+    iterations = []
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return IDAStarResult(None, None, iterations)
+    if components is not None and not components.connected(start, end):
+        return IDAStarResult(None, None, iterations)
+    if start == end:
+        return IDAStarResult([start], 0, iterations)
+    if stats is not None:
+        return _ida_star_with_stats(grid, start, end, rows, cols, table_size, stats)
+
+    # Directions: Up, Down, Left, Right
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    end_index = end[0] * cols + end[1]
+    on_path = bytearray(rows * cols)
+    threshold = manhattan_distance(start, end)
+
+    while True:
+        table = OrderedDict()
+        next_threshold = float('inf')
+        nodes = 1
+
+        start_index = start[0] * cols + start[1]
+        on_path[start_index] = 1
+        table[start_index] = 0
+        # Frames: [cell index, g, index of the next direction to try]
+        stack = [[start_index, 0, 0]]
+
+        while stack:
+            frame = stack[-1]
+            index, g, direction = frame
+            if direction == 4:
+                on_path[index] = 0
+                stack.pop()
+                continue
+            frame[2] += 1
+
+            row, col = divmod(index, cols)
+            new_row, new_col = row + directions[direction][0], col + directions[direction][1]
+            if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] != 0:
+                continue
+            new_index = new_row * cols + new_col
+            if on_path[new_index]:
+                continue
+
+            new_g = g + 1
+            if table_size:
+                seen = table.get(new_index)
+                if seen is not None:
+                    table.move_to_end(new_index)
+                    if seen <= new_g:
+                        continue
+
+            f = new_g + abs(new_row - end[0]) + abs(new_col - end[1])
+            if f > threshold:
+                if f < next_threshold:
+                    next_threshold = f
+                continue
+
+            nodes += 1
+            if new_index == end_index:
+                iterations.append((threshold, nodes))
+                path = [divmod(frame[0], cols) for frame in stack]
+                path.append(end)
+                for frame in stack:
+                    on_path[frame[0]] = 0
+                return IDAStarResult(path, new_g, iterations)
+
+            if table_size:
+                table[new_index] = new_g
+                if len(table) > table_size:
+                    table.popitem(last=False)
+            on_path[new_index] = 1
+            stack.append([new_index, new_g, 0])
+
+        iterations.append((threshold, nodes))
+        if next_threshold == float('inf'):
+            return IDAStarResult(None, None, iterations)
+        threshold = next_threshold
+
+
+def ida_star_steps(grid, start, end, rows, cols, table_size=DEFAULT_TABLE_SIZE):
+    """
+    Step-by-step IDA* for visualizers and streaming servers.
+
+    A generator with the same search order as ida_star_search() that
+    yields one event per search step instead of running to completion:
+    stop iterating to pause, iterate again to resume and call close() to
+    cancel. Memory stays at the DFS stack plus the transposition table.
+    Every threshold iteration starts over from the start cell, so cells
+    are opened and closed again in later iterations.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        rows (int): Number of rows
+        cols (int): Number of columns
+        table_size (int): Maximum transposition table entries (0 disables it)
+
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN (pushed on the stack), EVENT_CLOSE
+        (backtracked from) or EVENT_PATH (the path cells from start to end)
+
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+    """
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    start_index = start[0] * cols + start[1]
+    end_index = end[0] * cols + end[1]
+    if start_index == end_index:
+        yield start_index, EVENT_PATH
+        return [start]
+    on_path = bytearray(rows * cols)
     threshold = manhattan_distance(start, end)
-    path = [start]
 
     while True:
-        found, next_threshold = search(path, 0, threshold)
-        if found:
-            return path
+        table = OrderedDict()
+        next_threshold = float('inf')
+        on_path[start_index] = 1
+        table[start_index] = 0
+        stack = [[start_index, 0, 0]]
+        yield start_index, EVENT_OPEN
+
+        while stack:
+            frame = stack[-1]
+            index, g, direction = frame
+            if direction == 4:
+                on_path[index] = 0
+                stack.pop()
+                yield index, EVENT_CLOSE
+                continue
+            frame[2] += 1
+
+            row, col = divmod(index, cols)
+            new_row, new_col = row + directions[direction][0], col + directions[direction][1]
+            if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] != 0:
+                continue
+            new_index = new_row * cols + new_col
+            if on_path[new_index]:
+                continue
+
+            new_g = g + 1
+            if table_size:
+                seen = table.get(new_index)
+                if seen is not None:
+                    table.move_to_end(new_index)
+                    if seen <= new_g:
+                        continue
+
+            f = new_g + abs(new_row - end[0]) + abs(new_col - end[1])
+            if f > threshold:
+                if f < next_threshold:
+                    next_threshold = f
+                continue
+
+            if new_index == end_index:
+                path = [divmod(frame[0], cols) for frame in stack]
+                path.append(end)
+                for frame in stack:
+                    yield frame[0], EVENT_PATH
+                yield end_index, EVENT_PATH
+                return path
+
+            if table_size:
+                table[new_index] = new_g
+                if len(table) > table_size:
+                    table.popitem(last=False)
+            on_path[new_index] = 1
+            stack.append([new_index, new_g, 0])
+            yield new_index, EVENT_OPEN
+
         if next_threshold == float('inf'):
             return None
         threshold = next_threshold
 
 
+def _ida_star_with_stats(grid, start, end, rows, cols, table_size, stats):
+    """ida_star_search() with counters; a separate copy so the plain search pays nothing."""
+    iterations = []
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    end_index = end[0] * cols + end[1]
+    on_path = bytearray(rows * cols)
+    # Cells expanded in any iteration so far
+    expanded = bytearray(rows * cols)
+    threshold = manhattan_distance(start, end)
+    expansions = pushes = pops = stale = peak = reopenings = 0
+
+    try:
+        while True:
+            table = OrderedDict()
+            next_threshold = float('inf')
+            nodes = 1
+
+            start_index = start[0] * cols + start[1]
+            on_path[start_index] = 1
+            table[start_index] = 0
+            stack = [[start_index, 0, 0]]
+            pushes += 1
+            peak = max(peak, 1)
+
+            while stack:
+                frame = stack[-1]
+                index, g, direction = frame
+                if direction == 0:
+                    expansions += 1
+                    if expanded[index]:
+                        reopenings += 1
+                    expanded[index] = 1
+                if direction == 4:
+                    on_path[index] = 0
+                    stack.pop()
+                    pops += 1
+                    continue
+                frame[2] += 1
+
+                row, col = divmod(index, cols)
+                new_row, new_col = row + directions[direction][0], col + directions[direction][1]
+                if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] != 0:
+                    continue
+                new_index = new_row * cols + new_col
+                if on_path[new_index]:
+                    continue
+
+                new_g = g + 1
+                if table_size:
+                    seen = table.get(new_index)
+                    if seen is not None:
+                        table.move_to_end(new_index)
+                        if seen <= new_g:
+                            stale += 1
+                            continue
+
+                f = new_g + abs(new_row - end[0]) + abs(new_col - end[1])
+                if f > threshold:
+                    if f < next_threshold:
+                        next_threshold = f
+                    continue
+
+                nodes += 1
+                if new_index == end_index:
+                    iterations.append((threshold, nodes))
+                    path = [divmod(frame[0], cols) for frame in stack]
+                    path.append(end)
+                    return IDAStarResult(path, new_g, iterations)
+
+                if table_size:
+                    table[new_index] = new_g
+                    if len(table) > table_size:
+                        table.popitem(last=False)
+                on_path[new_index] = 1
+                stack.append([new_index, new_g, 0])
+                pushes += 1
+                if len(stack) > peak:
+                    peak = len(stack)
+
+            iterations.append((threshold, nodes))
+            if next_threshold == float('inf'):
+                return IDAStarResult(None, None, iterations)
+            threshold = next_threshold
+    finally:
+        stats.record(expansions, pushes, pops, stale, peak, reopenings)
+
+
+def ida_star(grid, start, end, rows, cols, components=None, stats=None):
+    """
+    Iterative Deepening A* (IDA*) Pathfinding Algorithm
+    Time Complexity: O(b^d) where b is branching factor and d is depth
+    Space Complexity: O(d) plus the bounded transposition table
+
+    IDA* runs depth-first searches bounded by an f = g + h threshold and
+    raises the threshold to the smallest f that exceeded it until the goal
+    is found. See ida_star_search() for the per-iteration node counts.
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        rows (int): Number of rows
+        cols (int): Number of columns
+        components (GridComponents): Optional component index from
+            grid_components.py; unreachable queries return at once
+        stats (SearchStats): Optional collector from search_stats.py
+
+    Returns:
+        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+    """
+    return ida_star_search(grid, start, end, rows, cols, components=components, stats=stats).path
+
+
+# Example usage and test
+if __name__ == "__main__":
+    test_grid = [
+        [0, 0, 0, 0, 0],
+        [0, 1, 1, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 1, 1, 0],
+        [0, 0, 0, 0, 0]
+    ]
+
+    result = ida_star_search(test_grid, (0, 0), (4, 4), 5, 5)
+    print(f"Path: {result.path}")
+    print(f"Cost: {result.cost}")
+
+    # A cup-shaped wall between start and goal: the search must climb out
+    # around either side, and both routes reach the same cells at equal cost
+    cup = [[0] * 9 for _ in range(9)]
+    for c in range(1, 8):
+        cup[4][c] = 1
+    for r in range(2, 5):
+        cup[r][1] = cup[r][7] = 1
+
+    for table_size in (0, DEFAULT_TABLE_SIZE):
+        result = ida_star_search(cup, (3, 4), (6, 4), 9, 9, table_size)
+        total = sum(nodes for _, nodes in result.iterations)
+        print(f"\nTransposition table size {table_size}: cost {result.cost}, {total} nodes")
+        for threshold, nodes in result.iterations:
+            print(f"  threshold {threshold}: {nodes} nodes")
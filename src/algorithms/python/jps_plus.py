@@ -0,0 +1,349 @@
+"""
+JPS+ (Jump Point Search with precomputed jump distances)
+
+Online JPS (jump_point_search.py) scans the grid cell by cell every time it
+expands a node, and each diagonal step spawns two straight scans. On maps
+that rarely change all of that work can be done once: for every cell and
+each of the 8 directions JPS+ stores how far the next jump point is
+(positive distance) or how far the next wall or map edge is (zero or
+negative distance). A query is then plain A* over jump points where every
+successor is one table lookup, plus a cheap check for the goal lying on the
+scanned ray.
+
+Movement matches jump_point_search: 8-connected, straight steps cost 1,
+diagonal steps cost sqrt(2), and a diagonal step only needs its target
+cell to be walkable.
+
+Preprocessing: O(8 * V) time, 8 signed 16-bit (or 32-bit) entries per cell
+Query: A* over jump points with O(1) successor generation
+"""
+
+import heapq
+import math
+import struct
+from array import array
+
+from alt_landmarks import grid_checksum
+from jump_point_search import (
+    expand_path,
+    heuristic as octile_distance,
+    identify_forced_neighbors,
+    pruned_directions,
+)
+
+SQRT2 = math.sqrt(2)
+
+# Direction index -> (dy, dx), same order as jump_point_search
+DIRECTIONS = [
+    (-1, 0),   # up
+    (1, 0),    # down
+    (0, -1),   # left
+    (0, 1),    # right
+    (-1, -1),  # up-left
+    (-1, 1),   # up-right
+    (1, -1),   # down-left
+    (1, 1),    # down-right
+]
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+
+_MAGIC = b'JPS+'
+_HEADER = struct.Struct('<4sIIcI')
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+class JumpTable:
+    """
+    Precomputed JPS+ jump distances for one static grid.
+
+    Entry (row * cols + col) * 8 + d holds, for direction DIRECTIONS[d]:
+    - n > 0: the next jump point is n steps away
+    - n <= 0: no jump point; -n walkable steps remain before a wall or the edge
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall), kept by reference
+        distances (array): Flat jump distance table
+        checksum (int): grid_checksum() of the grid the table was built for
+    """
+
+    def __init__(self, grid, distances, checksum):
+        self.grid = grid
+        self.rows, self.cols = len(grid), len(grid[0])
+        self.distances = distances
+        self.checksum = checksum
+
+    @classmethod
+    def build(cls, grid):
+        """
+        Precompute jump distances for every cell and direction.
+
+        Each direction is swept against its travel order, so the entry of
+        the next cell along the ray is always known when a cell is filled.
+
+        Args:
+            grid (list): 2D grid (0 = walkable, 1 = wall)
+
+        Returns:
+            JumpTable: The precomputed table
+
+        Raises:
+            ValueError: If the grid is empty
+        """
+        if not grid or not grid[0]:
+            raise ValueError("Grid cannot be empty")
+
+        rows, cols = len(grid), len(grid[0])
+        typecode = 'h' if max(rows, cols) < 2 ** 15 else 'i'
+        distances = array(typecode, bytes(array(typecode).itemsize * rows * cols * 8))
+
+        def free(row, col):
+            return 0 <= row < rows and 0 <= col < cols and grid[row][col] == 0
+
+        def forced(row, col, dy, dx):
+            return bool(identify_forced_neighbors(row, col, dx, dy, rows, cols, grid))
+
+        def sweep(index):
+            dy, dx = DIRECTIONS[index]
+            row_order = range(rows - 1, -1, -1) if dy > 0 else range(rows)
+            col_order = range(cols - 1, -1, -1) if dx > 0 else range(cols)
+            diagonal = dy != 0 and dx != 0
+            if diagonal:
+                horizontal = DIRECTION_INDEX[(0, dx)]
+                vertical = DIRECTION_INDEX[(dy, 0)]
+
+            for row in row_order:
+                for col in col_order:
+                    if grid[row][col] != 0:
+                        continue
+                    next_row, next_col = row + dy, col + dx
+                    if not free(next_row, next_col):
+                        continue  # Entry stays 0: blocked right away
+                    base = (next_row * cols + next_col) * 8
+                    if diagonal:
+                        is_jump_point = (forced(next_row, next_col, dy, dx) or
+                                         distances[base + horizontal] > 0 or
+                                         distances[base + vertical] > 0)
+                    else:
+                        is_jump_point = forced(next_row, next_col, dy, dx)
+
+                    ahead = distances[base + index]
+                    if is_jump_point:
+                        value = 1
+                    elif ahead > 0:
+                        value = ahead + 1
+                    else:
+                        value = ahead - 1
+                    distances[(row * cols + col) * 8 + index] = value
+
+        # Straight directions first: diagonal entries read them
+        for index in range(8):
+            sweep(index)
+
+        return cls(grid, distances, grid_checksum(grid))
+
+    def save(self, path):
+        """
+        Write the table to a binary file (header + little-endian entries).
+
+        Args:
+            path (str): Destination file path
+        """
+        distances = array(self.distances.typecode, self.distances)
+        if struct.pack('=I', 1) != struct.pack('<I', 1):
+            distances.byteswap()
+        with open(path, 'wb') as handle:
+            handle.write(_HEADER.pack(_MAGIC, self.rows, self.cols,
+                                      distances.typecode.encode(), self.checksum))
+            distances.tofile(handle)
+
+    @classmethod
+    def load(cls, path, grid):
+        """
+        Read a table written by save() for the given grid.
+
+        Args:
+            path (str): Source file path
+            grid (list): The grid the table was built for
+
+        Returns:
+            JumpTable: The loaded table
+
+        Raises:
+            ValueError: If the file is not a JPS+ table or belongs to another grid
+        """
+        with open(path, 'rb') as handle:
+            magic, rows, cols, typecode, checksum = _HEADER.unpack(handle.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a JPS+ table file")
+            distances = array(typecode.decode())
+            distances.fromfile(handle, rows * cols * 8)
+        if struct.pack('=I', 1) != struct.pack('<I', 1):
+            distances.byteswap()
+        if (len(grid), len(grid[0])) != (rows, cols) or grid_checksum(grid) != checksum:
+            raise ValueError("JPS+ table does not match the grid")
+        return cls(grid, distances, checksum)
+
+    def _free(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.grid[row][col] == 0
+
+    def successor(self, row, col, dy, dx, end):
+        """
+        Next node reached from (row, col) in direction (dy, dx).
+
+        Args:
+            row (int): Current row
+            col (int): Current column
+            dy (int): Row direction (-1, 0 or 1)
+            dx (int): Column direction (-1, 0 or 1)
+            end (tuple): Goal position, stopped at if it lies on the ray
+
+        Returns:
+            tuple|None: ((row, col), steps) or None if the ray is empty
+        """
+        value = self.distances[(row * self.cols + col) * 8 + DIRECTION_INDEX[(dy, dx)]]
+        reach = value if value > 0 else -value
+        goal_dr, goal_dc = end[0] - row, end[1] - col
+
+        if dy == 0 or dx == 0:
+            # Goal straight ahead within reach
+            if ((dy == 0 and goal_dr == 0 and _sign(goal_dc) == dx and abs(goal_dc) <= reach) or
+                    (dx == 0 and goal_dc == 0 and _sign(goal_dr) == dy and abs(goal_dr) <= reach)):
+                return end, abs(goal_dr) + abs(goal_dc)
+        elif _sign(goal_dr) == dy and _sign(goal_dc) == dx:
+            # Goal in this quadrant: stop where the diagonal meets its row or
+            # column (a "target jump point") unless a real jump point comes first
+            steps = min(abs(goal_dr), abs(goal_dc))
+            if steps <= reach and not (value > 0 and value < steps):
+                return (row + steps * dy, col + steps * dx), steps
+
+        if value > 0:
+            return (row + value * dy, col + value * dx), value
+        return None
+
+    def find_path(self, start, end):
+        """
+        Answer one query with A* over table lookups.
+
+        Args:
+            start (tuple): Starting position (row, col)
+            end (tuple): Target position (row, col)
+
+        Returns:
+            list: Every cell of the path from start to end as (row, col)
+            tuples, or None if no path exists
+        """
+        if not self._free(*start) or not self._free(*end):
+            return None
+
+        pq = [(octile_distance(start, end), 0, start)]
+        g_scores = {start: 0}
+        came_from = {}
+        closed = set()
+
+        while pq:
+            _, current_g, current = heapq.heappop(pq)
+            if current in closed:
+                continue
+            closed.add(current)
+
+            if current == end:
+                jump_points = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    jump_points.append(current)
+                return expand_path(jump_points[::-1])
+
+            row, col = current
+            if current in came_from:
+                parent = came_from[current]
+                directions = pruned_directions(
+                    row, col, (_sign(row - parent[0]), _sign(col - parent[1])),
+                    self.rows, self.cols, self.grid)
+            else:
+                directions = DIRECTIONS
+
+            for dy, dx in directions:
+                found = self.successor(row, col, dy, dx, end)
+                if found is None:
+                    continue
+                node, steps = found
+                if node in closed:
+                    continue
+                tentative_g = current_g + steps * (SQRT2 if dy != 0 and dx != 0 else 1)
+                if tentative_g < g_scores.get(node, float('inf')):
+                    g_scores[node] = tentative_g
+                    came_from[node] = current
+                    heapq.heappush(pq, (tentative_g + octile_distance(node, end), tentative_g, node))
+
+        return None
+
+
+def jps_plus(grid, start, end, table=None):
+    """
+    JPS+ pathfinding with the same signature as jump_point_search.
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        table (JumpTable): Precomputed table for this grid; built on the fly
+            if omitted, which only pays off when it is reused
+
+    Returns:
+        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+    """
+    if table is None:
+        table = JumpTable.build(grid)
+    return table.find_path(start, end)
+
+
+# Example usage and benchmark
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+    from jump_point_search import jump, jump_point_search
+
+    rng = random.Random(3)
+    size = 128
+    test_grid = [[1 if rng.random() < 0.2 else 0 for _ in range(size)] for _ in range(size)]
+    free_cells = [(r, c) for r in range(size) for c in range(size) if test_grid[r][c] == 0]
+    queries = [(rng.choice(free_cells), rng.choice(free_cells)) for _ in range(50)]
+
+    t0 = time.perf_counter()
+    table = JumpTable.build(test_grid)
+    t1 = time.perf_counter()
+    print(f"Table for {size}x{size}: built in {t1 - t0:.2f}s, "
+          f"{len(table.distances) * table.distances.itemsize} bytes")
+
+    # Raw jump resolution: online jump() scan vs one table lookup
+    probes = [(r, c, d) for r, c in rng.sample(free_cells, 2000) for d in DIRECTIONS]
+    t0 = time.perf_counter()
+    for r, c, (dy, dx) in probes:
+        jump(r, c, dx, dy, (-1, -1), size, size, test_grid, set())
+    t1 = time.perf_counter()
+    for r, c, (dy, dx) in probes:
+        table.successor(r, c, dy, dx, (-1, -1))
+    t2 = time.perf_counter()
+    print(f"Jump resolution x{len(probes)}: jump() {(t1 - t0) * 1000:.0f}ms, "
+          f"table {(t2 - t1) * 1000:.0f}ms ({(t1 - t0) / (t2 - t1):.1f}x faster)")
+
+    # Full queries
+    t0 = time.perf_counter()
+    online = [jump_point_search(test_grid, s, e) for s, e in queries]
+    t1 = time.perf_counter()
+    precomputed = [table.find_path(s, e) for s, e in queries]
+    t2 = time.perf_counter()
+    assert [p and len(p) for p in online] == [p and len(p) for p in precomputed]
+    print(f"{len(queries)} queries: JPS {(t1 - t0) * 1000:.0f}ms, "
+          f"JPS+ {(t2 - t1) * 1000:.0f}ms ({(t1 - t0) / (t2 - t1):.1f}x faster)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'map.jpsplus')
+        table.save(path)
+        loaded = JumpTable.load(path, test_grid)
+        assert loaded.distances == table.distances
+        print(f"Saved and reloaded table ({os.path.getsize(path)} bytes)")
@@ -1,18 +1,28 @@
 import heapq
 import math
 
+# Step events of jump_point_search_steps(): jump point pushed on the heap,
+# jump point expanded, cell on the final path (the same codes in every
+# pathfinder module)
+EVENT_OPEN = 0
+EVENT_CLOSE = 1
+EVENT_PATH = 2
+
+
 def heuristic(a, b):
     """
-    Calculate Manhattan distance heuristic between two points.
+    Calculate octile distance heuristic between two points: the exact cost
+    on an open 8-connected grid with diagonal steps costing sqrt(2).
     
     Args:
         a (tuple): First point (row, col)
         b (tuple): Second point (row, col)
         
     Returns:
-        int: Manhattan distance
+        float: Octile distance
     """
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+    dr, dc = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dr, dc) + (math.sqrt(2) - 1) * min(dr, dc)
 
 
 def is_valid(row, col, rows, cols):
@@ -73,24 +83,20 @@ def identify_forced_neighbors(row, col, dx, dy, rows, cols, grid):
            is_walkable(row + 1, col + dx, grid):
             forced_neighbors.append((row + 1, col + dx))
     else:
-        # Diagonal movement
-        natural_row = row + dy
-        natural_col = col
-        natural_row2 = row
-        natural_col2 = col + dx
-        
-        natural1_blocked = not is_valid(natural_row, natural_col, rows, cols) or \
-                          not is_walkable(natural_row, natural_col, grid)
-        natural2_blocked = not is_valid(natural_row2, natural_col2, rows, cols) or \
-                          not is_walkable(natural_row2, natural_col2, grid)
+        # Diagonal movement: a blocked cell behind the move on either
+        # axis forces the diagonal that wraps around it
+        behind_x_blocked = not is_valid(row, col - dx, rows, cols) or \
+                          not is_walkable(row, col - dx, grid)
+        behind_y_blocked = not is_valid(row - dy, col, rows, cols) or \
+                          not is_walkable(row - dy, col, grid)
         
         # Forced neighbors for diagonal
-        if natural1_blocked and is_valid(natural_row, col + dx, rows, cols) and \
-           is_walkable(natural_row, col + dx, grid):
-            forced_neighbors.append((natural_row, col + dx))
-        if natural2_blocked and is_valid(row + dy, natural_col2, rows, cols) and \
-           is_walkable(row + dy, natural_col2, grid):
-            forced_neighbors.append((row + dy, natural_col2))
+        if behind_x_blocked and is_valid(row + dy, col - dx, rows, cols) and \
+           is_walkable(row + dy, col - dx, grid):
+            forced_neighbors.append((row + dy, col - dx))
+        if behind_y_blocked and is_valid(row - dy, col + dx, rows, cols) and \
+           is_walkable(row - dy, col + dx, grid):
+            forced_neighbors.append((row - dy, col + dx))
     
     return forced_neighbors
 
@@ -143,7 +149,7 @@ def jump(row, col, dx, dy, end, rows, cols, grid, closed):
         if dx != 0 and dy != 0:
             # Try jumping in X direction
             jump_x = jump(
-                current_row, current_col - dx, dx, 0,
+                current_row, current_col, dx, 0,
                 end, rows, cols, grid, closed
             )
             if jump_x:
@@ -151,14 +157,184 @@ def jump(row, col, dx, dy, end, rows, cols, grid, closed):
             
             # Try jumping in Y direction
             jump_y = jump(
-                current_row - dy, current_col, 0, dy,
+                current_row, current_col, 0, dy,
                 end, rows, cols, grid, closed
             )
             if jump_y:
                 return (current_row, current_col)
 
 
-def jump_point_search(grid, start, end):
+class BitGrid:
+    """
+    Bit-parallel view of a grid for block-based jump scanning (Block JPS).
+    
+    Each row is stored as a Python int whose bit c is set when cell
+    (row, c) is walkable, and each column likewise as an int over rows.
+    A straight jump then finds the first wall, the first forced-neighbor
+    candidate and the goal for a whole row or column at once with shifts,
+    `& ~` and `bit_length()`, instead of calling is_valid/is_walkable per
+    cell. Diagonal jumps still step one cell at a time but run their two
+    straight sub-scans as bit operations.
+    
+    Building the masks is a single pass over the grid; there is no other
+    preprocessing.
+    
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+    """
+    
+    def __init__(self, grid):
+        self.grid = grid
+        self.rows, self.cols = len(grid), len(grid[0])
+        self.row_bits = [self._pack(row) for row in grid]
+        self.col_bits = [self._pack(column) for column in zip(*grid)]
+    
+    # Byte translation: 0 (walkable) -> '1', wall values -> '0'
+    _WALKABLE_DIGITS = bytes([ord('1')] + [ord('0')] * 255)
+    
+    @classmethod
+    def _pack(cls, cells):
+        """Pack one line of cells into an int, bit i set if cell i is walkable."""
+        return int(bytes(cells[::-1]).translate(cls._WALKABLE_DIGITS), 2)
+    
+    def _line(self, lines, index):
+        """Mask of a neighbouring line; off-grid lines are all walls."""
+        return lines[index] if 0 <= index < len(lines) else 0
+    
+    def _scan(self, lines, line, position, step, goal_position):
+        """
+        First jump point along one row or column.
+        
+        Args:
+            lines (list): row_bits for horizontal scans, col_bits for vertical
+            line (int): Index of the scanned line
+            position (int): Start position on the line (excluded from the scan)
+            step (int): +1 or -1
+            goal_position (int|None): Goal position if the goal is on this line
+            
+        Returns:
+            int|None: Position of the jump point, or None if a wall comes first
+        """
+        free = lines[line]
+        before = self._line(lines, line - 1)
+        after = self._line(lines, line + 1)
+        
+        # Forced candidates: a wall beside the cell and a free cell beside
+        # the next one in the travel direction
+        if step > 0:
+            forced = (~before & (before >> 1)) | (~after & (after >> 1))
+            walls = ~free >> (position + 1)
+            events = (forced | (1 << goal_position if goal_position is not None else 0)) >> (position + 1)
+            wall_at = (walls & -walls).bit_length() - 1
+            if events:
+                event_at = (events & -events).bit_length() - 1
+                if event_at < wall_at:
+                    return position + 1 + event_at
+            return None
+        
+        forced = (~before & (before << 1)) | (~after & (after << 1))
+        below = (1 << position) - 1
+        walls = ~free & below
+        events = (forced | (1 << goal_position if goal_position is not None else 0)) & below
+        wall_at = walls.bit_length() - 1
+        event_at = events.bit_length() - 1
+        if event_at >= 0 and event_at > wall_at:
+            return event_at
+        return None
+    
+    def jump(self, row, col, dx, dy, end):
+        """
+        Block-based equivalent of jump().
+        
+        Args:
+            row (int): Starting row
+            col (int): Starting column
+            dx (int): X direction (-1, 0, or 1)
+            dy (int): Y direction (-1, 0, or 1)
+            end (tuple): End position (row, col)
+            
+        Returns:
+            tuple|None: Jump point position (row, col) or None
+        """
+        if dy == 0:
+            hit = self._scan(self.row_bits, row, col, dx, end[1] if end[0] == row else None)
+            return None if hit is None else (row, hit)
+        if dx == 0:
+            hit = self._scan(self.col_bits, col, row, dy, end[0] if end[1] == col else None)
+            return None if hit is None else (hit, col)
+        
+        row_bits, rows, cols = self.row_bits, self.rows, self.cols
+        while True:
+            row += dy
+            col += dx
+            if not (0 <= row < rows and 0 <= col < cols) or not (row_bits[row] >> col) & 1:
+                return None
+            if (row, col) == end:
+                return (row, col)
+            
+            # Diagonal forced neighbors: blocked cell behind on either axis
+            behind_x = 0 <= col - dx < cols and (row_bits[row] >> (col - dx)) & 1
+            behind_y = 0 <= row - dy < rows and (row_bits[row - dy] >> col) & 1
+            if ((not behind_x and 0 <= col - dx < cols and 0 <= row + dy < rows and
+                    (row_bits[row + dy] >> (col - dx)) & 1) or
+                    (not behind_y and 0 <= row - dy < rows and 0 <= col + dx < cols and
+                     (row_bits[row - dy] >> (col + dx)) & 1)):
+                return (row, col)
+            
+            if self.jump(row, col, dx, 0, end) or self.jump(row, col, 0, dy, end):
+                return (row, col)
+
+
+def pruned_directions(row, col, direction, rows, cols, grid):
+    """
+    Directions worth exploring from a jump point reached while moving in
+    `direction`: the natural neighbors plus the forced ones.
+    
+    Args:
+        row (int): Current row
+        col (int): Current column
+        direction (tuple): Normalized travel direction (dy, dx)
+        rows (int): Total rows
+        cols (int): Total columns
+        grid (list): Grid with cell weights
+        
+    Returns:
+        list: Directions as (dy, dx) tuples
+    """
+    dy, dx = direction
+    if dx != 0 and dy != 0:
+        natural = [(dy, dx), (dy, 0), (0, dx)]
+    else:
+        natural = [(dy, dx)]
+    
+    forced = [
+        (r - row, c - col)
+        for r, c in identify_forced_neighbors(row, col, dx, dy, rows, cols, grid)
+    ]
+    return natural + forced
+
+
+def expand_path(jump_points):
+    """
+    Fill in the straight and diagonal runs between consecutive jump points.
+    
+    Args:
+        jump_points (list): Jump points from start to end
+        
+    Returns:
+        list: Every cell of the path as (row, col) tuples
+    """
+    path = [jump_points[0]]
+    for (row, col), (next_row, next_col) in zip(jump_points, jump_points[1:]):
+        dy = (next_row > row) - (next_row < row)
+        dx = (next_col > col) - (next_col < col)
+        while (row, col) != (next_row, next_col):
+            row, col = row + dy, col + dx
+            path.append((row, col))
+    return path
+
+
+def jump_point_search(grid, start, end, heuristic_fn=None, scan='cell', components=None, stats=None):
     """
     Jump Point Search (JPS) Pathfinding Algorithm
     Time Complexity: O(E) where E is number of edges
@@ -171,14 +347,42 @@ def jump_point_search(grid, start, end):
         grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
         start (tuple): Starting position (row, col)
         end (tuple): Target position (row, col)
+        heuristic_fn (callable): Optional h(a, b) replacing octile distance,
+            e.g. an octile LandmarkTable from alt_landmarks.py built with
+            corner_cutting=True
+        scan (str): 'cell' scans with jump() one cell at a time, 'block'
+            uses BitGrid to scan whole rows and columns with bit operations
+        components (GridComponents): Optional component index from
+            grid_components.py built with diagonal=True; unreachable
+            queries return at once
+        stats (SearchStats): Optional collector from search_stats.py; when
+            given, an instrumented copy of the search records its counters
+            (expansions count jump points)
         
     Returns:
         list: Path from start to end as list of (row, col) tuples, or None if no path exists
+        
+    Raises:
+        ValueError: If the scan mode is unknown or components were built
+            without diagonal connectivity
     """
+    if scan not in ('cell', 'block'):
+        raise ValueError(f"Unknown scan mode: {scan}")
+    if components is not None:
+        # Jumps cut corners, so 4-connected labels would reject real paths
+        if not getattr(components, 'diagonal', True):
+            raise ValueError("components must be built with diagonal=True")
+        if not components.connected(start, end):
+            return None
+    if stats is not None:
+        return _jump_point_search_with_stats(grid, start, end, heuristic_fn or heuristic, scan, stats)
+    
     rows, cols = len(grid), len(grid[0])
+    h = heuristic_fn or heuristic
+    bit_grid = BitGrid(grid) if scan == 'block' else None
     
     # Priority queue: stores (f_score, g_score, row, col)
-    pq = [(heuristic(start, end), 0, start[0], start[1])]
+    pq = [(h(start, end), 0, start[0], start[1])]
     
     # Dictionary to store g_score (cost from start) for each cell
     g_scores = {start: 0}
@@ -218,21 +422,27 @@ def jump_point_search(grid, start, end):
                 path.append(current)
                 current = came_from[current]
             path.append(start)
-            return path[::-1]  # Reverse to get start -> end
+            return expand_path(path[::-1])  # Reverse to get start -> end
         
-        # Get parent direction (if exists)
-        parent_dir = None
+        # Explore neighbors: all 8 directions from the start, otherwise only
+        # the natural and forced neighbors of the normalized parent direction
         if current in came_from:
             parent = came_from[current]
-            parent_dir = (current[0] - parent[0], current[1] - parent[1])
-        
-        # Explore neighbors (pruning: only check parent direction if exists)
-        neighbors_to_check = [parent_dir] if parent_dir else directions
+            parent_dir = (
+                (row > parent[0]) - (row < parent[0]),
+                (col > parent[1]) - (col < parent[1]),
+            )
+            neighbors_to_check = pruned_directions(row, col, parent_dir, rows, cols, grid)
+        else:
+            neighbors_to_check = directions
         
         for dy, dx in neighbors_to_check:
-            jump_point = jump(
-                row, col, dx, dy, end, rows, cols, grid, closed
-            )
+            if bit_grid is not None:
+                jump_point = bit_grid.jump(row, col, dx, dy, end)
+            else:
+                jump_point = jump(
+                    row, col, dx, dy, end, rows, cols, grid, closed
+                )
             
             if not jump_point:
                 continue
@@ -242,9 +452,11 @@ def jump_point_search(grid, start, end):
             if (new_row, new_col) in closed:
                 continue
             
-            # Calculate cost (diagonal vs cardinal)
+            # Calculate cost: the jump covers max(|dr|, |dc|) steps, each
+            # costing sqrt(2) if diagonal and 1 if cardinal
             is_diagonal = dx != 0 and dy != 0
-            move_cost = math.sqrt(2) if is_diagonal else 1
+            steps = max(abs(new_row - row), abs(new_col - col))
+            move_cost = steps * (math.sqrt(2) if is_diagonal else 1)
             tentative_g = current_g + move_cost
             
             if tentative_g < g_scores.get((new_row, new_col), float('inf')):
@@ -252,7 +464,7 @@ def jump_point_search(grid, start, end):
                 g_scores[(new_row, new_col)] = tentative_g
                 
                 # Calculate f_score = g + h
-                h_score = heuristic((new_row, new_col), end)
+                h_score = h((new_row, new_col), end)
                 f_score = tentative_g + h_score
                 
                 heapq.heappush(pq, (f_score, tentative_g, new_row, new_col))
@@ -261,6 +473,163 @@ def jump_point_search(grid, start, end):
     return None
 
 
+def jump_point_search_steps(grid, start, end, heuristic_fn=None, scan='cell'):
+    """
+    Step-by-step Jump Point Search for visualizers and streaming servers.
+    
+    A generator with the same search order as jump_point_search() that
+    yields one event per search step instead of running to completion:
+    stop iterating to pause, iterate again to resume and call close() to
+    cancel. Nothing but the search state is kept. Open and close events
+    are reported for jump points only; the cells a jump skips over are
+    never touched by the search.
+    
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        heuristic_fn (callable): Optional h(a, b) replacing octile distance
+        scan (str): 'cell' or 'block' (see jump_point_search)
+        
+    Yields:
+        tuple: (cell_index, event_code) with cell_index = row * cols + col
+        and event_code EVENT_OPEN, EVENT_CLOSE or EVENT_PATH (every cell
+        of the expanded path from start to end)
+        
+    Returns:
+        list: The path (StopIteration.value), or None if no path exists
+        
+    Raises:
+        ValueError: If the scan mode is unknown
+    """
+    if scan not in ('cell', 'block'):
+        raise ValueError(f"Unknown scan mode: {scan}")
+    rows, cols = len(grid), len(grid[0])
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    h = heuristic_fn or heuristic
+    bit_grid = BitGrid(grid) if scan == 'block' else None
+    
+    pq = [(h(start, end), 0, start[0], start[1])]
+    g_scores = {start: 0}
+    came_from = {}
+    closed = set()
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    yield start[0] * cols + start[1], EVENT_OPEN
+    
+    while pq:
+        current_f, current_g, row, col = heapq.heappop(pq)
+        current = (row, col)
+        if current in closed:
+            continue
+        closed.add(current)
+        
+        if current == end:
+            jump_points = [end]
+            while jump_points[-1] in came_from:
+                jump_points.append(came_from[jump_points[-1]])
+            path = expand_path(jump_points[::-1])
+            for path_row, path_col in path:
+                yield path_row * cols + path_col, EVENT_PATH
+            return path
+        
+        yield row * cols + col, EVENT_CLOSE
+        if current in came_from:
+            parent = came_from[current]
+            parent_dir = (
+                (row > parent[0]) - (row < parent[0]),
+                (col > parent[1]) - (col < parent[1]),
+            )
+            neighbors_to_check = pruned_directions(row, col, parent_dir, rows, cols, grid)
+        else:
+            neighbors_to_check = directions
+        
+        for dy, dx in neighbors_to_check:
+            if bit_grid is not None:
+                jump_point = bit_grid.jump(row, col, dx, dy, end)
+            else:
+                jump_point = jump(row, col, dx, dy, end, rows, cols, grid, closed)
+            if not jump_point or jump_point in closed:
+                continue
+            
+            new_row, new_col = jump_point
+            is_diagonal = dx != 0 and dy != 0
+            steps = max(abs(new_row - row), abs(new_col - col))
+            tentative_g = current_g + steps * (math.sqrt(2) if is_diagonal else 1)
+            if tentative_g < g_scores.get(jump_point, float('inf')):
+                came_from[jump_point] = current
+                g_scores[jump_point] = tentative_g
+                heapq.heappush(pq, (tentative_g + h(jump_point, end), tentative_g, new_row, new_col))
+                yield new_row * cols + new_col, EVENT_OPEN
+    
+    return None
+
+
+def _jump_point_search_with_stats(grid, start, end, h, scan, stats):
+    """jump_point_search() with counters; a separate copy so the plain search pays nothing."""
+    rows, cols = len(grid), len(grid[0])
+    bit_grid = BitGrid(grid) if scan == 'block' else None
+    pq = [(h(start, end), 0, start[0], start[1])]
+    g_scores = {start: 0}
+    came_from = {}
+    closed = set()
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    expansions, pushes, pops, stale, peak = 0, 1, 0, 0, 1
+    
+    try:
+        while pq:
+            current_f, current_g, row, col = heapq.heappop(pq)
+            pops += 1
+            current = (row, col)
+            if current in closed:
+                stale += 1
+                continue
+            closed.add(current)
+            
+            if current == end:
+                path = []
+                while current in came_from:
+                    path.append(current)
+                    current = came_from[current]
+                path.append(start)
+                return expand_path(path[::-1])
+            
+            expansions += 1
+            if current in came_from:
+                parent = came_from[current]
+                parent_dir = (
+                    (row > parent[0]) - (row < parent[0]),
+                    (col > parent[1]) - (col < parent[1]),
+                )
+                neighbors_to_check = pruned_directions(row, col, parent_dir, rows, cols, grid)
+            else:
+                neighbors_to_check = directions
+            
+            for dy, dx in neighbors_to_check:
+                if bit_grid is not None:
+                    jump_point = bit_grid.jump(row, col, dx, dy, end)
+                else:
+                    jump_point = jump(row, col, dx, dy, end, rows, cols, grid, closed)
+                if not jump_point or jump_point in closed:
+                    continue
+                
+                new_row, new_col = jump_point
+                is_diagonal = dx != 0 and dy != 0
+                steps = max(abs(new_row - row), abs(new_col - col))
+                tentative_g = current_g + steps * (math.sqrt(2) if is_diagonal else 1)
+                if tentative_g < g_scores.get(jump_point, float('inf')):
+                    came_from[jump_point] = current
+                    g_scores[jump_point] = tentative_g
+                    heapq.heappush(pq, (tentative_g + h(jump_point, end), tentative_g, new_row, new_col))
+                    pushes += 1
+            if len(pq) > peak:
+                peak = len(pq)
+        return None
+    finally:
+        # Closed jump points are never reopened
+        stats.record(expansions, pushes, pops, stale, peak, 0)
+
+
 # Example usage and test
 if __name__ == "__main__":
     # Create a sample grid (0 = walkable, 1 = wall)
@@ -277,7 +646,7 @@ if __name__ == "__main__":
     
     print(f"Grid size: {len(test_grid)}x{len(test_grid[0])}")
     print(f"Start: {start_pos}, End: {end_pos}")
-    print(f"Heuristic (Manhattan distance): {heuristic(start_pos, end_pos)}")
+    print(f"Heuristic (octile distance): {heuristic(start_pos, end_pos):.2f}")
     
     path = jump_point_search(test_grid, start_pos, end_pos)
     
@@ -301,4 +670,7 @@ if __name__ == "__main__":
                 else:
                     row_str += ". "
             print(row_str)
-
+    
+    # Bit-parallel scanning finds the same path (see jps_benchmark.py for timings)
+    block_path = jump_point_search(test_grid, start_pos, end_pos, scan='block')
+    print(f"\nscan='block' path length: {len(block_path) if block_path else None}")
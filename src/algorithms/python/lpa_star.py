@@ -0,0 +1,128 @@
+"""
+Lifelong Planning A* (LPA*)
+
+LPA* answers the same (start, goal) query over and over while the grid is
+edited. It keeps g-values (settled costs) and rhs-values (one-step
+lookahead costs) between calls; an edit only makes the edited cell and its
+neighbours inconsistent, and the next search repairs just the vertices
+whose cost actually changes instead of rerunning A* from scratch.
+
+D* Lite is LPA* searching backward from the goal plus a key modifier km
+for a moving start. With a start that never moves km stays 0, so LPAStar
+is a DStarLitePlanner from d_star_lite.py that exposes the LPA* interface
+(apply_edits() and a vertex_updates counter). Grid edges are undirected, so
+searching from the goal returns the same shortest paths as searching from
+the start.
+
+Time Complexity: O((V + E) log V) for the first search; each later search
+only touches vertices whose g-value changes (and their neighbours)
+Space Complexity: O(V)
+"""
+
+from d_star_lite import DStarLitePlanner, heuristic
+
+
+class LPAStar(DStarLitePlanner):
+    """
+    Incremental shortest-path engine for a fixed start and goal on an edited grid.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall); kept by reference and
+            edited through apply_edits()
+        start (tuple): Starting position (row, col)
+        goal (tuple): Target position (row, col)
+        heuristic_fn (callable): Admissible, consistent h(a, b)
+
+    Raises:
+        ValueError: If grid is empty or positions are out of bounds
+    """
+
+    def __init__(self, grid, start, goal, heuristic_fn=heuristic):
+        # Vertex re-evaluations, cumulative since construction (expansions
+        # is counted by DStarLitePlanner)
+        self.vertex_updates = 0
+        super().__init__(grid, start, goal, heuristic_fn)
+
+    def _update_vertex(self, node):
+        self.vertex_updates += 1
+        super()._update_vertex(node)
+
+    def apply_edits(self, cells):
+        """
+        Apply wall edits and repair the shortest path.
+
+        Args:
+            cells (iterable): ((row, col), value) pairs, value 0 = walkable, 1 = wall
+
+        Returns:
+            list: The repaired path from start to goal, or None if no path exists
+        """
+        self.update_cells(cells)
+        return self.path()
+
+
+def lpa_star(grid, start, end):
+    """
+    One-shot LPA* search with the same signature as astar.
+
+    Keep an LPAStar instance and call apply_edits() to benefit from
+    incremental repairs.
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+
+    Returns:
+        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+    """
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return None
+    return LPAStar(grid, start, end).path()
+
+
+# Example usage and benchmark
+if __name__ == "__main__":
+    import random
+    from astar import astar_search
+
+    rng = random.Random(12)
+    size = 80
+    editor_grid = [[1 if rng.random() < 0.25 else 0 for _ in range(size)] for _ in range(size)]
+    start_pos, end_pos = (0, 0), (size - 1, size - 1)
+    editor_grid[0][0] = editor_grid[size - 1][size - 1] = 0
+
+    engine = LPAStar([row[:] for row in editor_grid], start_pos, end_pos)
+    engine.path()
+    print(f"Initial search: {engine.expansions} expansions, "
+          f"{engine.vertex_updates} vertex updates")
+
+    # The editor toggles one cell at a time; start and goal stay open
+    applied = 0
+    lpa_expansions = lpa_updates = astar_expansions = scratch_updates = 0
+    for _ in range(50):
+        cell = (rng.randrange(size), rng.randrange(size))
+        if cell in (start_pos, end_pos):
+            continue
+        applied += 1
+        value = 1 - editor_grid[cell[0]][cell[1]]
+        editor_grid[cell[0]][cell[1]] = value
+
+        before = (engine.expansions, engine.vertex_updates)
+        repaired = engine.apply_edits([(cell, value)])
+        lpa_expansions += engine.expansions - before[0]
+        lpa_updates += engine.vertex_updates - before[1]
+
+        full = astar_search(editor_grid, start_pos, end_pos)
+        astar_expansions += full.expansions
+        scratch = LPAStar([row[:] for row in editor_grid], start_pos, end_pos)
+        scratch.path()
+        scratch_updates += scratch.vertex_updates
+        assert (repaired is None) == (full.path is None)
+        assert repaired is None or len(repaired) == len(full.path)
+
+    print(f"Per edit, averaged over {applied} single-cell edits:")
+    print(f"  LPA* repair:            {lpa_expansions / applied:.1f} expansions, "
+          f"{lpa_updates / applied:.1f} vertex updates")
+    print(f"  LPA* from scratch:      {scratch_updates / applied:.1f} vertex updates")
+    print(f"  astar full recompute:   {astar_expansions / applied:.1f} expansions")
@@ -0,0 +1,343 @@
+"""
+Path Query Cache
+
+UIs and APIs ask for the same (grid, start, end) path over and over, and
+every pathfinder recomputes it from scratch. PathCache wraps any
+pathfinder of this package in an LRU cache.
+
+Keys are (grid fingerprint, algorithm name, start, end, extra arguments).
+The fingerprint is a Zobrist hash of the wall layout: the XOR of a random
+64-bit key for every wall cell. It is computed once for the tracked grid
+and then updated in O(1) per edit (XOR the cell's key in or out). Other
+grids of the same size are hashed in full, so equal copies of the map hit
+the same entries.
+
+Edits to the tracked grid go through add_wall/remove_wall/set_cell:
+- a new wall only breaks the cached paths that pass through it (or step
+  diagonally past it); a reverse cell -> entries index finds them, they
+  are dropped and every other entry is carried over to the new
+  fingerprint. Adding walls never makes another path shorter, and "no
+  path" stays "no path"
+- a removed wall can open a shortcut for any query, so nothing is carried
+  over; the old entries stay keyed by the old fingerprint (valid again if
+  the edit is undone) until the LRU evicts them
+
+Eviction keeps both the number of entries and the approximate bytes of
+the cached paths under their limits, least recently used first.
+"""
+
+import random
+import sys
+from array import array
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Approximate size of one (row, col) tuple of a cached path
+_CELL_BYTES = sys.getsizeof((0, 0))
+
+# A cached query: its key, the pathfinder's result, the path in it and the
+# bytes counted for it
+_Entry = namedtuple('_Entry', ['key', 'result', 'path', 'size'])
+
+
+def zobrist_keys(rows, cols, seed=0):
+    """
+    Random 64-bit key for every cell.
+
+    Args:
+        rows (int): Grid height
+        cols (int): Grid width
+        seed (int): Random seed
+
+    Returns:
+        array: array('Q') indexed by row * cols + col
+    """
+    keys = array('Q')
+    keys.frombytes(random.Random(seed).randbytes(keys.itemsize * rows * cols))
+    return keys
+
+
+def path_bytes(path):
+    """
+    Approximate memory held by a cached path.
+
+    Args:
+        path: List of (row, col) tuples, a CompactPath or None
+
+    Returns:
+        int: Bytes counted against the cache limit
+    """
+    if path is None:
+        return 0
+    if isinstance(path, list):
+        return sys.getsizeof(path) + len(path) * _CELL_BYTES
+    # CompactPath and other encodings: the object and its encoded runs
+    return sys.getsizeof(path) + sys.getsizeof(getattr(path, 'runs', b''))
+
+
+class PathCache:
+    """
+    LRU cache of pathfinder results, kept valid as the tracked grid changes.
+
+    Attributes:
+        grid (list): The tracked grid; edit it through add_wall,
+            remove_wall or set_cell so the fingerprint follows
+        fingerprint (int): Zobrist hash of the tracked grid's walls
+        bytes (int): Approximate bytes of the cached paths
+        hits (int): Queries answered from the cache
+        misses (int): Queries passed on to the pathfinder
+    """
+
+    def __init__(self, grid, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, seed=0):
+        """
+        Track a grid with an empty cache.
+
+        Args:
+            grid (list): 2D grid (0 = walkable, anything else = wall)
+            max_entries (int): Most cached queries
+            max_bytes (int): Most bytes of cached paths
+            seed (int): Seed of the Zobrist keys
+
+        Raises:
+            ValueError: If the grid is empty, its rows differ in length or a
+                limit is below 1
+        """
+        if not grid or not grid[0]:
+            raise ValueError("Grid cannot be empty")
+        self.rows, self.cols = len(grid), len(grid[0])
+        if any(len(row) != self.cols for row in grid):
+            raise ValueError("All grid rows must have the same length")
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache limits must be at least 1")
+        self.grid = grid
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._keys = zobrist_keys(self.rows, self.cols, seed)
+        self.fingerprint = self.hash_grid(grid)
+
+        # Entry id -> _Entry, least recently used first
+        self._entries = OrderedDict()
+        # Key -> entry id
+        self._lookup = {}
+        # Fingerprint -> ids of the entries keyed by it
+        self._by_fingerprint = {}
+        # Cell -> ids of the entries whose path passes through it
+        self._through = {}
+        self._next_id = 0
+        self.bytes = 0
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def hash_grid(self, grid):
+        """
+        Zobrist fingerprint of a grid's walls.
+
+        Args:
+            grid (list): 2D grid of the tracked grid's size
+
+        Returns:
+            int: XOR of the keys of all wall cells
+
+        Raises:
+            ValueError: If the grid has another size
+        """
+        if len(grid) != self.rows or any(len(row) != self.cols for row in grid):
+            raise ValueError("Grid size differs from the cached grid")
+        fingerprint = 0
+        keys, cols = self._keys, self.cols
+        for row, line in enumerate(grid):
+            base = row * cols
+            for col, cell in enumerate(line):
+                if cell:
+                    fingerprint ^= keys[base + col]
+        return fingerprint
+
+    def wrap(self, search, name=None):
+        """
+        Cached version of a pathfinder.
+
+        The wrapper has the pathfinder's signature. Extra positional and
+        keyword arguments are part of the key, so they must be hashable;
+        results are shared between hits and must not be modified.
+
+        Args:
+            search (callable): search(grid, start, end, ...) returning a path
+                or a result with a `path` field
+            name (str): Algorithm name in the key (search.__name__ by default)
+
+        Returns:
+            callable: cached(grid, start, end, *args, **kwargs)
+        """
+        name = search.__name__ if name is None else name
+
+        @wraps(search)
+        def cached(grid, start, end, *args, **kwargs):
+            fingerprint = self.fingerprint if grid is self.grid else self.hash_grid(grid)
+            key = (fingerprint, name, tuple(start), tuple(end), args, tuple(sorted(kwargs.items())))
+            entry_id = self._lookup.get(key)
+            if entry_id is not None:
+                self._entries.move_to_end(entry_id)
+                self.hits += 1
+                return self._entries[entry_id].result
+            self.misses += 1
+            result = search(grid, start, end, *args, **kwargs)
+            self._store(key, result)
+            return result
+
+        return cached
+
+    def add_wall(self, cell):
+        """
+        Make a cell of the tracked grid a wall.
+
+        Entries whose path crosses the cell are dropped; the others are
+        carried over to the new fingerprint.
+
+        Args:
+            cell (tuple): Position (row, col)
+        """
+        self.set_cell(cell, 1)
+
+    def remove_wall(self, cell):
+        """
+        Make a cell of the tracked grid walkable.
+
+        Args:
+            cell (tuple): Position (row, col)
+        """
+        self.set_cell(cell, 0)
+
+    def set_cell(self, cell, value):
+        """
+        Write a cell of the tracked grid and update the fingerprint.
+
+        Args:
+            cell (tuple): Position (row, col)
+            value (int): New cell value (0 = walkable, anything else = wall)
+        """
+        row, col = cell
+        was_wall = bool(self.grid[row][col])
+        self.grid[row][col] = value
+        if was_wall == bool(value):
+            return
+
+        old = self.fingerprint
+        self.fingerprint ^= self._keys[row * self.cols + col]
+        if was_wall:
+            # A shortcut may have opened: nothing carries over
+            return
+
+        carried = self._by_fingerprint.pop(old, set())
+        for entry_id in self._blocked_by((row, col)) & carried:
+            carried.discard(entry_id)
+            self._drop(entry_id)
+        group = self._by_fingerprint.setdefault(self.fingerprint, set())
+        for entry_id in carried:
+            entry = self._entries[entry_id]
+            del self._lookup[entry.key]
+            key = (self.fingerprint,) + entry.key[1:]
+            if key in self._lookup:
+                # Already cached for the new layout (an undone edit)
+                self._drop(entry_id)
+                continue
+            self._entries[entry_id] = entry._replace(key=key)
+            self._lookup[key] = entry_id
+            group.add(entry_id)
+        if not group:
+            del self._by_fingerprint[self.fingerprint]
+
+    def clear(self):
+        """Drop every entry (the hit and miss counters are kept)."""
+        self._entries.clear()
+        self._lookup.clear()
+        self._by_fingerprint.clear()
+        self._through.clear()
+        self.bytes = 0
+
+    def _blocked_by(self, cell):
+        """Ids of entries whose path a wall at cell breaks."""
+        row, col = cell
+        blocked = set(self._through.get(cell, ()))
+        # Diagonal steps between two neighbours of the cell squeeze past it
+        for first, second in (((-1, 0), (0, -1)), ((-1, 0), (0, 1)),
+                              ((1, 0), (0, -1)), ((1, 0), (0, 1))):
+            a = self._through.get((row + first[0], col + first[1]))
+            b = self._through.get((row + second[0], col + second[1]))
+            if a and b:
+                blocked |= a & b
+        return blocked
+
+    def _store(self, key, result):
+        path = getattr(result, 'path', result)
+        size = path_bytes(path)
+        if size > self.max_bytes:
+            return
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(key, result, path, size)
+        self._lookup[key] = entry_id
+        self._by_fingerprint.setdefault(key[0], set()).add(entry_id)
+        if path is not None:
+            for cell in path:
+                self._through.setdefault(cell, set()).add(entry_id)
+        self.bytes += size
+
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        if self._lookup.get(entry.key) == entry_id:
+            del self._lookup[entry.key]
+        group = self._by_fingerprint.get(entry.key[0])
+        if group is not None:
+            group.discard(entry_id)
+            if not group:
+                del self._by_fingerprint[entry.key[0]]
+        if entry.path is not None:
+            for cell in entry.path:
+                ids = self._through.get(cell)
+                if ids is not None:
+                    ids.discard(entry_id)
+                    if not ids:
+                        del self._through[cell]
+        self.bytes -= entry.size
+
+
+# Example usage and benchmark
+if __name__ == "__main__":
+    import time
+    from astar import astar
+    from pathfinding_benchmark import random_map, random_queries
+
+    grid = random_map(200, seed=8)
+    queries = random_queries(grid, 50, seed=8)
+    cache = PathCache(grid, max_entries=1000)
+    cached_astar = cache.wrap(astar)
+
+    for label in ("cold", "warm"):
+        t0 = time.perf_counter()
+        paths = [cached_astar(grid, start, end) for start, end in queries]
+        elapsed = time.perf_counter() - t0
+        print(f"{label}: {len(queries)} queries in {elapsed * 1000:.1f}ms "
+              f"({cache.hits} hits, {cache.misses} misses, ~{cache.bytes:,} bytes)")
+
+    # A wall on the first path: only the paths through it are recomputed
+    path = next(path for path in paths if path and len(path) > 2)
+    cache.add_wall(path[len(path) // 2])
+    kept, before = len(cache), cache.misses
+    for start, end in queries:
+        cached_astar(grid, start, end)
+    print(f"after a wall on one path: {kept} entries kept, "
+          f"{cache.misses - before} queries recomputed")
+
+    # An equal copy of the grid (e.g. sent again by a client) hits too
+    copy = [list(row) for row in grid]
+    before = cache.hits
+    cached_astar(copy, *queries[-1])
+    print(f"equal grid copy: {'hit' if cache.hits > before else 'miss'}")
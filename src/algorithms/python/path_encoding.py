@@ -0,0 +1,283 @@
+"""
+Compact Path Encoding
+
+A path across a big map is millions of (row, col) tuples that are usually
+serialized again right away. CompactPath stores the start cell and the
+moves as a run-length `bytes` string instead: every byte is one run of
+up to MAX_RUN steps in one of eight directions (direction in the top three
+bits, run length - 1 in the low five). A straight corridor of a thousand
+cells takes 32 bytes.
+
+CompactPath is a read-only Sequence of (row, col) tuples:
+- len() is O(1) and iteration decodes the cells lazily
+- `a + b` joins a path with one that starts where it ends by
+  concatenating the run strings
+- indexing walks the runs; slices return lists of tuples, so code that
+  expects a list of tuples (zip(path, path[1:]), `cell in path`, ...)
+  keeps working
+- encode()/decode() give a flat bytes form for storage or transport
+
+astar, dijkstra and bfs build one directly from their parent links when
+passed `path_builder=CompactPath.from_parents`, without creating the
+tuple list first.
+"""
+
+import struct
+from collections.abc import Sequence
+
+# Direction codes: (row step, col step) -> code
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+DIRECTION_CODES = {step: code for code, step in enumerate(DIRECTIONS)}
+
+# Longest run a single byte can hold
+MAX_RUN = 32
+
+# encode() header: start row, start col
+_START = struct.Struct('<ii')
+
+
+def _runs_of(codes, runs):
+    """Append the run bytes for a stream of direction codes to a bytearray."""
+    last, count = None, 0
+    for code in codes:
+        if code == last and count < MAX_RUN:
+            count += 1
+            continue
+        if last is not None:
+            runs.append(last << 5 | (count - 1))
+        last, count = code, 1
+    if last is not None:
+        runs.append(last << 5 | (count - 1))
+    return runs
+
+
+def _step_code(a, b):
+    code = DIRECTION_CODES.get((b[0] - a[0], b[1] - a[1]))
+    if code is None:
+        raise ValueError(f"Cells {a} and {b} are not neighbours")
+    return code
+
+
+class CompactPath(Sequence):
+    """
+    Path stored as a start cell plus run-length encoded moves.
+
+    Attributes:
+        start (tuple): First cell (row, col)
+        end (tuple): Last cell (row, col)
+        runs (bytes): One byte per run: direction << 5 | (length - 1)
+    """
+
+    __slots__ = ('start', 'end', 'runs', '_length')
+
+    def __init__(self, start, runs=b''):
+        """
+        Wrap an encoded path.
+
+        Args:
+            start (tuple): First cell (row, col)
+            runs (bytes): Run bytes as produced by this class
+        """
+        self.start = tuple(start)
+        self.runs = bytes(runs)
+        length = 1
+        row, col = self.start
+        for run in self.runs:
+            dr, dc = DIRECTIONS[run >> 5]
+            steps = (run & 31) + 1
+            length += steps
+            row, col = row + dr * steps, col + dc * steps
+        self.end = (row, col)
+        self._length = length
+
+    @classmethod
+    def _from_parts(cls, start, end, runs, length):
+        """Wrap runs whose end cell and length are already known, without decoding them."""
+        path = cls.__new__(cls)
+        path.start, path.end, path.runs, path._length = start, end, runs, length
+        return path
+
+    @classmethod
+    def from_cells(cls, cells):
+        """
+        Encode a path given as cells.
+
+        Args:
+            cells (iterable): Cells (row, col), each a neighbour (8-connected)
+                of the previous one
+
+        Returns:
+            CompactPath: The encoded path
+
+        Raises:
+            ValueError: If cells is empty or two consecutive cells are not
+                neighbours
+        """
+        iterator = iter(cells)
+        try:
+            start = tuple(next(iterator))
+        except StopIteration:
+            raise ValueError("A path needs at least one cell") from None
+
+        def codes():
+            previous = start
+            for cell in iterator:
+                yield _step_code(previous, cell)
+                previous = cell
+
+        return cls(start, _runs_of(codes(), bytearray()))
+
+    @classmethod
+    def from_parents(cls, start, end, parents):
+        """
+        Encode the path to end by walking parent links back to start.
+
+        Has the path_builder signature of astar, dijkstra and bfs.
+
+        Args:
+            start (tuple): First cell (row, col)
+            end (tuple): Last cell (row, col)
+            parents (dict): Cell -> previous cell on the path
+
+        Returns:
+            CompactPath: The encoded path from start to end
+        """
+        def codes():
+            cell = end
+            while cell != start:
+                parent = parents[cell]
+                yield _step_code(parent, cell)
+                cell = parent
+
+        # Runs come out end-first; every byte is a whole run, so reversing
+        # the byte order gives the start-first encoding
+        runs = _runs_of(codes(), bytearray())
+        runs.reverse()
+        return cls(start, runs)
+
+    @classmethod
+    def decode(cls, data):
+        """
+        Rebuild a path from encode() output.
+
+        Args:
+            data (bytes): Encoded path
+
+        Returns:
+            CompactPath: The decoded path
+
+        Raises:
+            ValueError: If data is too short to hold a start cell
+        """
+        if len(data) < _START.size:
+            raise ValueError("Encoded path is too short")
+        return cls(_START.unpack_from(data), data[_START.size:])
+
+    def encode(self):
+        """
+        Flat bytes form: start row and col (int32 each) followed by the runs.
+
+        Returns:
+            bytes: Encoded path
+        """
+        return _START.pack(*self.start) + self.runs
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        row, col = self.start
+        yield row, col
+        for run in self.runs:
+            dr, dc = DIRECTIONS[run >> 5]
+            for _ in range((run & 31) + 1):
+                row += dr
+                col += dc
+                yield row, col
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("path index out of range")
+        row, col = self.start
+        for run in self.runs:
+            if index == 0:
+                break
+            steps = min((run & 31) + 1, index)
+            dr, dc = DIRECTIONS[run >> 5]
+            row, col = row + dr * steps, col + dc * steps
+            index -= steps
+        return row, col
+
+    def __contains__(self, cell):
+        return any(cell == visited for visited in self)
+
+    def __add__(self, other):
+        """Join with a path that starts at this path's end (the shared cell appears once)."""
+        if not isinstance(other, CompactPath):
+            return NotImplemented
+        if other.start != self.end:
+            raise ValueError(f"Cannot join a path ending at {self.end} with one starting at {other.start}")
+        length = self._length + other._length - 1
+        if self.runs and other.runs:
+            last, first = self.runs[-1], other.runs[0]
+            steps = (last & 31) + (first & 31) + 2
+            if last >> 5 == first >> 5 and steps <= MAX_RUN:
+                # Same direction across the junction: merge the two runs
+                merged = bytes((last >> 5 << 5 | (steps - 1),))
+                return CompactPath._from_parts(self.start, other.end,
+                                               self.runs[:-1] + merged + other.runs[1:], length)
+        return CompactPath._from_parts(self.start, other.end, self.runs + other.runs, length)
+
+    def __eq__(self, other):
+        """Equal to any sequence of the same cells (a run may be split differently)."""
+        if isinstance(other, CompactPath):
+            if self.start != other.start or self._length != other._length:
+                return False
+            return self.runs == other.runs or all(a == b for a, b in zip(self, other))
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(other) == self._length and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CompactPath(start={self.start}, end={self.end}, length={self._length})"
+
+
+# Example usage and test
+if __name__ == "__main__":
+    import sys
+    import time
+    from astar import astar_search
+
+    # A serpentine corridor: long straight runs joined by short turns
+    size = 400
+    grid = [[0] * size for _ in range(size)]
+    for r in range(1, size - 1, 2):
+        for c in range(size):
+            grid[r][c] = 1
+        grid[r][size - 1 if (r // 2) % 2 == 0 else 0] = 0
+    start_pos, end_pos = (0, 0), (size - 1, 0 if ((size - 2) // 2) % 2 else size - 1)
+
+    for label, builder in (("tuples", None), ("CompactPath", CompactPath.from_parents)):
+        t0 = time.perf_counter()
+        result = astar_search(grid, start_pos, end_pos, path_builder=builder)
+        elapsed = time.perf_counter() - t0
+        path = result.path
+        if builder is None:
+            footprint = sys.getsizeof(path) + sum(sys.getsizeof(cell) for cell in path)
+        else:
+            footprint = sys.getsizeof(path.runs)
+        print(f"{label}: {len(path)} cells, ~{footprint:,} bytes, search {elapsed * 1000:.0f}ms")
+
+    compact = result.path
+    tuples = astar_search(grid, start_pos, end_pos).path
+    print(f"Same cells: {compact == tuples}, encoded size: {len(compact.encode())} bytes")
+
+    # Joining two legs through a waypoint
+    middle = tuples[len(tuples) // 2]
+    first = CompactPath.from_cells(tuples[:len(tuples) // 2 + 1])
+    second = CompactPath.from_cells(tuples[len(tuples) // 2:])
+    print(f"Joined at {middle}: {first + second == compact}")
@@ -0,0 +1,493 @@
+"""
+Pathfinding benchmark suite
+
+Runs the nine grid pathfinders over standard map families and records,
+per query: wall time, the work counters of search_stats.py (expansions,
+heap pushes and pops, stale skips, peak frontier, reopenings), peak traced
+memory and the gap between the returned path cost and the optimum. Wall
+time comes from the plain search; counters come from a separate untimed
+run of its instrumented code path. Results are plain JSON so two
+commits can be compared with any diff tool.
+
+With --swamps, dijkstra and astar are also run with the dead-end regions
+of swamp_pruning.py, and the records report their expansions with
+pruning and the relative expansion reduction.
+
+Map families are seeded, so the same arguments always produce the same
+maps and queries:
+- 'random': independent random obstacles
+- 'maze': perfect maze carved by randomized depth-first search
+- 'rooms': rooms with two doors in every wall segment
+- 'open': open map with a few scattered rectangular blocks
+
+MovingAI benchmark maps (https://movingai.com/benchmarks/) can be loaded
+from their `.map` and `.scen` files.
+
+Usage:
+    python pathfinding_benchmark.py --sizes 32 64 --output results.json
+    python pathfinding_benchmark.py --scen maps/arena.map.scen --output arena.json
+    python pathfinding_benchmark.py --families maze rooms --swamps
+"""
+
+import math
+import os
+import random
+import time
+import tracemalloc
+from collections import namedtuple
+
+from alt_landmarks import UNREACHABLE, landmark_distances
+from astar import astar
+from bellman_ford import bellman_ford
+from bfs import bfs
+from bidirectional_search import bidirectional_search
+from d_star_lite import d_star_lite
+from d_star_lite_benchmark import rooms_map
+from dijkstra import dijkstra
+from greedy_best_first_search import greedy_best_first_search
+from grid_components import GridComponents
+from grid_mmap import PASSABLE_TERRAIN, read_movingai_header
+from ida_star import ida_star
+from jump_point_search import jump_point_search
+from search_stats import SearchStats
+from swamp_pruning import SwampTable
+
+# One query of a MovingAI scenario file; positions are (row, col)
+Scenario = namedtuple('Scenario', ['bucket', 'map_name', 'width', 'height', 'start', 'end',
+                                   'optimal_length'])
+
+FAMILIES = ('random', 'maze', 'rooms', 'open')
+
+# Relative gaps below this are float noise from summing sqrt(2) steps in a
+# different order than the reference distances
+GAP_TOLERANCE = 1e-9
+
+# Largest map (in cells) each algorithm is run on; ida_star is exponential
+# and the bellman_ford sweep quadratic on open maps, so they are skipped on
+# bigger maps instead of dominating the run
+MAX_CELLS = {
+    'ida_star': 32 * 32,
+    'bellman_ford': 48 * 48,
+}
+
+# Algorithms that take a SwampTable as their `swamps` argument
+SWAMP_ALGORITHMS = ('dijkstra', 'astar')
+
+
+def random_map(size, seed, density=0.25):
+    """
+    Square map with independent random obstacles.
+
+    Args:
+        size (int): Side length of the map
+        seed (int): Random seed
+        density (float): Probability that a cell is a wall
+
+    Returns:
+        list: 2D grid (0 = walkable, 1 = wall)
+    """
+    rng = random.Random(seed)
+    return [[1 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+
+
+def maze_map(size, seed):
+    """
+    Perfect maze carved by randomized depth-first search.
+
+    Args:
+        size (int): Side length of the map (even sizes leave the last row
+            and column as wall)
+        seed (int): Random seed
+
+    Returns:
+        list: 2D grid (0 = walkable, 1 = wall)
+    """
+    rng = random.Random(seed)
+    grid = [[1] * size for _ in range(size)]
+    limit = size - 1 if size % 2 else size - 2
+    grid[1][1] = 0
+    stack = [(1, 1)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                   if 0 < row + dr < limit and 0 < col + dc < limit
+                   and grid[row + dr][col + dc] == 1]
+        if not options:
+            stack.pop()
+            continue
+        new_row, new_col = rng.choice(options)
+        grid[(row + new_row) // 2][(col + new_col) // 2] = grid[new_row][new_col] = 0
+        stack.append((new_row, new_col))
+    return grid
+
+
+def open_map(size, seed, blocks=None):
+    """
+    Open map with a few scattered rectangular blocks.
+
+    Args:
+        size (int): Side length of the map
+        seed (int): Random seed
+        blocks (int): Number of blocks (size // 8 by default)
+
+    Returns:
+        list: 2D grid (0 = walkable, 1 = wall)
+    """
+    rng = random.Random(seed)
+    grid = [[0] * size for _ in range(size)]
+    for _ in range(size // 8 if blocks is None else blocks):
+        height, width = rng.randint(1, max(1, size // 6)), rng.randint(1, max(1, size // 6))
+        top, left = rng.randrange(size - height + 1), rng.randrange(size - width + 1)
+        for row in range(top, top + height):
+            for col in range(left, left + width):
+                grid[row][col] = 1
+    return grid
+
+
+def generate_map(family, size, seed):
+    """
+    Build a map of one of the standard families.
+
+    Args:
+        family (str): 'random', 'maze', 'rooms' or 'open'
+        size (int): Side length of the map
+        seed (int): Random seed
+
+    Returns:
+        list: 2D grid (0 = walkable, 1 = wall)
+
+    Raises:
+        ValueError: If the family is unknown
+    """
+    if family == 'random':
+        return random_map(size, seed)
+    if family == 'maze':
+        return maze_map(size, seed)
+    if family == 'rooms':
+        return rooms_map(size, room=max(4, size // 8), seed=seed)
+    if family == 'open':
+        return open_map(size, seed)
+    raise ValueError(f"Unknown map family: {family}")
+
+
+def load_movingai_map(path):
+    """
+    Load a MovingAI `.map` file.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        list: 2D grid (0 = walkable, 1 = wall)
+
+    Raises:
+        ValueError: If the header is malformed or the map has the wrong size
+    """
+    with open(path) as handle:
+        height, width = read_movingai_header(handle, path)
+        rows = [line.rstrip('\r\n') for line in handle]
+
+    rows = [row for row in rows if row][:height]
+    if len(rows) != height or any(len(row) != width for row in rows):
+        raise ValueError(f"{path}: expected {height} rows of {width} cells")
+    return [[0 if terrain in PASSABLE_TERRAIN else 1 for terrain in row] for row in rows]
+
+
+def load_movingai_scenarios(path):
+    """
+    Load a MovingAI `.scen` file.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        list: Scenario records; MovingAI (x, y) coordinates are converted
+        to (row, col)
+
+    Raises:
+        ValueError: If a line is malformed
+    """
+    scenarios = []
+    with open(path) as handle:
+        for number, line in enumerate(handle, 1):
+            fields = line.split()
+            if not fields or fields[0] == 'version':
+                continue
+            if len(fields) != 9:
+                raise ValueError(f"{path}:{number}: expected 9 fields")
+            bucket, map_name = int(fields[0]), fields[1]
+            width, height, start_x, start_y, end_x, end_y = map(int, fields[2:8])
+            scenarios.append(Scenario(bucket, map_name, width, height, (start_y, start_x),
+                                      (end_y, end_x), float(fields[8])))
+    return scenarios
+
+
+def random_queries(grid, count, seed):
+    """
+    Pick reachable (start, end) pairs of distinct walkable cells.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+        count (int): Number of queries
+        seed (int): Random seed
+
+    Returns:
+        list: (start, end) pairs; fewer than count if the map has no
+        component with two cells
+    """
+    rng = random.Random(seed)
+    components = GridComponents(grid)
+    free = [(row, col) for row, line in enumerate(grid) for col, cell in enumerate(line) if cell == 0]
+    by_label = {}
+    for cell in free:
+        by_label.setdefault(components.label(cell), []).append(cell)
+    cells = [cell for cell in free if len(by_label[components.label(cell)]) > 1]
+    queries = []
+    for _ in range(count if cells else 0):
+        start = rng.choice(cells)
+        end = start
+        while end == start:
+            end = rng.choice(by_label[components.label(start)])
+        queries.append((start, end))
+    return queries
+
+
+def _run_ida_star(grid, start, end, stats=None):
+    return ida_star(grid, start, end, len(grid), len(grid[0]), stats=stats)
+
+
+# name -> (search(grid, start, end, stats=None) -> path, movement model of its paths)
+ALGORITHMS = {
+    'bfs': (bfs, 'cardinal'),
+    'dijkstra': (dijkstra, 'cardinal'),
+    'astar': (astar, 'cardinal'),
+    'bidirectional_search': (bidirectional_search, 'cardinal'),
+    'greedy_best_first_search': (greedy_best_first_search, 'cardinal'),
+    'jump_point_search': (jump_point_search, 'octile_corner_cutting'),
+    'bellman_ford': (bellman_ford, 'cardinal'),
+    'ida_star': (_run_ida_star, 'cardinal'),
+    'd_star_lite': (d_star_lite, 'cardinal'),
+}
+
+
+def path_cost(path):
+    """Cost of a path of king moves: 1 per straight step, sqrt(2) per diagonal one."""
+    return sum(math.sqrt(2) if a[0] != b[0] and a[1] != b[1] else 1
+               for a, b in zip(path, path[1:]))
+
+
+def optimal_costs(grid, start, models):
+    """Exact distances from start for each movement model ('I'/'d' arrays)."""
+    tables = {}
+    for model in models:
+        if model == 'cardinal':
+            tables[model] = landmark_distances(grid, start, 'cardinal')
+        else:
+            tables[model] = landmark_distances(grid, start, 'octile', corner_cutting=True)
+    return tables
+
+
+def benchmark_query(grid, start, end, algorithms=None, trace_memory=True, swamps=None):
+    """
+    Run every algorithm on one query.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        algorithms (list): Names from ALGORITHMS (all by default)
+        trace_memory (bool): Re-run each algorithm under tracemalloc to
+            record its peak memory (the timed run is never traced)
+        swamps (SwampTable): Dead-end regions of the grid; when given, the
+            SWAMP_ALGORITHMS are also run with pruning
+
+    Returns:
+        list: One dict per algorithm with seconds, the SearchStats counters
+        (expansions, pushes, pops, stale, peak_frontier, reopenings),
+        peak_memory (bytes), found, cost, optimal_cost and gap (relative
+        excess over the optimum, None without a path); with swamps, the
+        SWAMP_ALGORITHMS also carry swamp_seconds, swamp_expansions and
+        expansion_reduction (1 - swamp_expansions / expansions); skipped
+        runs only carry a 'skipped' reason
+    """
+    names = list(ALGORITHMS) if algorithms is None else algorithms
+    cells = len(grid) * len(grid[0])
+    models = {ALGORITHMS[name][1] for name in names}
+    tables = optimal_costs(grid, start, models)
+    end_index = end[0] * len(grid[0]) + end[1]
+
+    records = []
+    for name in names:
+        search, model = ALGORITHMS[name]
+        record = {'algorithm': name}
+        records.append(record)
+        if cells > MAX_CELLS.get(name, cells):
+            record['skipped'] = f"map larger than {MAX_CELLS[name]} cells"
+            continue
+
+        t0 = time.perf_counter()
+        path = search(grid, start, end)
+        record['seconds'] = time.perf_counter() - t0
+
+        stats = SearchStats()
+        search(grid, start, end, stats=stats)
+        record.update(stats.as_dict())
+
+        if swamps is not None and name in SWAMP_ALGORITHMS:
+            t0 = time.perf_counter()
+            search(grid, start, end, swamps=swamps)
+            record['swamp_seconds'] = time.perf_counter() - t0
+            pruned = SearchStats()
+            search(grid, start, end, stats=pruned, swamps=swamps)
+            record['swamp_expansions'] = pruned.expansions
+            record['expansion_reduction'] = (1 - pruned.expansions / stats.expansions
+                                             if stats.expansions else 0.0)
+
+        if trace_memory:
+            tracemalloc.start()
+            search(grid, start, end)
+            record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        optimum = tables[model][end_index]
+        optimum = None if optimum in (UNREACHABLE, math.inf) else optimum
+        cost = None if path is None else path_cost(path)
+        record['found'] = cost is not None
+        record['cost'] = cost
+        record['optimal_cost'] = optimum
+        if cost is None or optimum is None:
+            record['gap'] = None
+        else:
+            gap = (cost - optimum) / optimum if optimum else 0.0
+            record['gap'] = 0.0 if abs(gap) < GAP_TOLERANCE else gap
+    return records
+
+
+def run_suite(families=FAMILIES, sizes=(32, 64), queries=5, seed=1, algorithms=None,
+              trace_memory=True, swamps=False):
+    """
+    Benchmark the algorithms over every map family and size.
+
+    Args:
+        families (tuple): Map families (see FAMILIES)
+        sizes (tuple): Map side lengths
+        queries (int): Random reachable queries per map
+        seed (int): Seed for maps and queries
+        algorithms (list): Names from ALGORITHMS (all by default)
+        trace_memory (bool): Record peak traced memory (see benchmark_query)
+        swamps (bool): Also run the SWAMP_ALGORITHMS with dead-end pruning
+
+    Returns:
+        dict: {'config': ..., 'results': [...]}, ready for json.dump
+    """
+    results = []
+    for family in families:
+        for size in sizes:
+            grid = generate_map(family, size, seed)
+            table = SwampTable.build(grid) if swamps else None
+            for number, (start, end) in enumerate(random_queries(grid, queries, seed)):
+                for record in benchmark_query(grid, start, end, algorithms, trace_memory, table):
+                    results.append({'map': f"{family}-{size}", 'query': number,
+                                    'start': start, 'end': end, **record})
+    config = {'families': list(families), 'sizes': list(sizes), 'queries': queries,
+              'seed': seed, 'algorithms': algorithms or list(ALGORITHMS), 'swamps': swamps}
+    return {'config': config, 'results': results}
+
+
+def run_scenarios(scen_path, map_dir=None, limit=None, algorithms=None, trace_memory=True,
+                  swamps=False):
+    """
+    Benchmark the algorithms on a MovingAI scenario file.
+
+    Args:
+        scen_path (str): Path to the `.scen` file
+        map_dir (str): Directory with the `.map` files (the scenario file's
+            directory by default)
+        limit (int): Only run the first `limit` scenarios
+        algorithms (list): Names from ALGORITHMS (all by default)
+        trace_memory (bool): Record peak traced memory (see benchmark_query)
+        swamps (bool): Also run the SWAMP_ALGORITHMS with dead-end pruning
+
+    Returns:
+        dict: {'config': ..., 'results': [...]}, ready for json.dump
+    """
+    map_dir = os.path.dirname(scen_path) if map_dir is None else map_dir
+    scenarios = load_movingai_scenarios(scen_path)[:limit]
+    grids = {}
+    tables = {}
+    results = []
+    for number, scenario in enumerate(scenarios):
+        if scenario.map_name not in grids:
+            grids[scenario.map_name] = load_movingai_map(
+                os.path.join(map_dir, os.path.basename(scenario.map_name)))
+            tables[scenario.map_name] = SwampTable.build(grids[scenario.map_name]) if swamps else None
+        grid = grids[scenario.map_name]
+        for record in benchmark_query(grid, scenario.start, scenario.end, algorithms, trace_memory,
+                                      tables[scenario.map_name]):
+            results.append({'map': scenario.map_name, 'query': number, 'bucket': scenario.bucket,
+                            'start': scenario.start, 'end': scenario.end, **record})
+    config = {'scenarios': scen_path, 'limit': limit, 'algorithms': algorithms or list(ALGORITHMS),
+              'swamps': swamps}
+    return {'config': config, 'results': results}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="Benchmark the grid pathfinders")
+    parser.add_argument('--families', nargs='+', default=list(FAMILIES), choices=FAMILIES)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[32, 64])
+    parser.add_argument('--queries', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS))
+    parser.add_argument('--scen', help="MovingAI .scen file to run instead of generated maps")
+    parser.add_argument('--map-dir', help="Directory of the .map files (default: next to --scen)")
+    parser.add_argument('--limit', type=int, help="Max scenarios from --scen")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc runs")
+    parser.add_argument('--swamps', action='store_true',
+                        help="Also run dijkstra and astar with dead-end pruning")
+    parser.add_argument('--output', help="JSON output file (default: stdout)")
+    args = parser.parse_args()
+
+    if args.scen:
+        report = run_scenarios(args.scen, args.map_dir, args.limit, args.algorithms,
+                               not args.no_memory, args.swamps)
+    else:
+        report = run_suite(args.families, args.sizes, args.queries, args.seed, args.algorithms,
+                           not args.no_memory, args.swamps)
+
+    text = json.dumps(report, indent=1, allow_nan=False)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(text + '\n')
+    else:
+        sys.stdout.write(text + '\n')
+
+    # Summary per algorithm on stderr, so stdout stays pure JSON
+    totals = {}
+    for record in report['results']:
+        if 'seconds' in record:
+            entry = totals.setdefault(record['algorithm'], [0.0, 0, 0, 0])
+            entry[0] += record['seconds']
+            entry[1] += 1
+            entry[2] += bool(record['gap'])
+            entry[3] += not record['found'] and record['optimal_cost'] is not None
+    for name, (seconds, runs, suboptimal, missed) in totals.items():
+        print(f"{name:26} {runs:4} runs {seconds * 1000:9.1f}ms total, "
+              f"{suboptimal} suboptimal, {missed} missed", file=sys.stderr)
+
+    pruning = {}
+    for record in report['results']:
+        if 'swamp_expansions' in record:
+            entry = pruning.setdefault(record['algorithm'], [0, 0, 0.0, 0.0])
+            entry[0] += record['expansions']
+            entry[1] += record['swamp_expansions']
+            entry[2] += record['seconds']
+            entry[3] += record['swamp_seconds']
+    for name, (expansions, pruned, seconds, pruned_seconds) in pruning.items():
+        reduction = 1 - pruned / expansions if expansions else 0.0
+        print(f"{name:26} with swamps: {expansions} -> {pruned} expansions "
+              f"({reduction:.0%} fewer), {seconds * 1000:.1f} -> {pruned_seconds * 1000:.1f}ms",
+              file=sys.stderr)
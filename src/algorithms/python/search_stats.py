@@ -0,0 +1,112 @@
+"""
+Search Statistics
+
+Counters for capacity planning: how much work a pathfinder did to answer
+one query. Pass a SearchStats as the `stats` argument of bfs, dijkstra,
+astar/astar_search, bidirectional_search, greedy_best_first_search,
+jump_point_search, bellman_ford, ida_star/ida_star_search or d_star_lite.
+
+Collection costs nothing when it is off. Every pathfinder checks `stats`
+once per call and, when it is given, runs a separate instrumented copy of
+its search loop that counts in local variables and reports them once at
+the end through record(). The default loop has no counters and no per-node
+checks. Pathfinders only call record(), so any object with that method
+works as a collector.
+
+Counters (all summed over the calls a collector is passed to, except
+peak_frontier, which keeps the maximum):
+- expansions: nodes whose successors were generated
+- pushes: entries added to the frontier (heap, queue or stack)
+- pops: entries taken off the frontier, stale ones included
+- stale: popped entries skipped because the node was already expanded or
+  a cheaper entry superseded them
+- peak_frontier: most entries in the frontier at once, stale ones included
+- reopenings: expanded nodes put back on the frontier with a lower cost
+  (or, for D* Lite, made inconsistent again)
+"""
+
+COUNTERS = ('expansions', 'pushes', 'pops', 'stale', 'peak_frontier', 'reopenings')
+
+
+class SearchStats:
+    """
+    Work counters filled in by the pathfinders' instrumented code paths.
+
+    Attributes:
+        expansions (int): Nodes expanded
+        pushes (int): Frontier insertions
+        pops (int): Frontier removals, stale entries included
+        stale (int): Popped entries skipped as outdated
+        peak_frontier (int): Largest frontier size seen
+        reopenings (int): Expanded nodes put back on the frontier
+    """
+
+    __slots__ = COUNTERS
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Set every counter back to zero."""
+        for name in COUNTERS:
+            setattr(self, name, 0)
+
+    def record(self, expansions=0, pushes=0, pops=0, stale=0, peak_frontier=0, reopenings=0):
+        """
+        Add the counts of one search.
+
+        Args:
+            expansions (int): Nodes expanded
+            pushes (int): Frontier insertions
+            pops (int): Frontier removals
+            stale (int): Outdated entries skipped
+            peak_frontier (int): Largest frontier size of this search
+            reopenings (int): Expanded nodes put back on the frontier
+        """
+        self.expansions += expansions
+        self.pushes += pushes
+        self.pops += pops
+        self.stale += stale
+        self.peak_frontier = max(self.peak_frontier, peak_frontier)
+        self.reopenings += reopenings
+
+    def as_dict(self):
+        """
+        Current counters.
+
+        Returns:
+            dict: Counter name -> value
+        """
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)}" for name in COUNTERS)
+        return f"SearchStats({fields})"
+
+
+# Example usage and test
+if __name__ == "__main__":
+    from astar import astar_search
+    from bfs import bfs
+    from d_star_lite import d_star_lite
+    from dijkstra import dijkstra
+    from jump_point_search import jump_point_search
+
+    # A long wall with gaps at both ends between start and goal
+    size = 120
+    grid = [[0] * size for _ in range(size)]
+    for row in range(10, size - 10):
+        grid[row][size // 2] = 1
+    start_pos, end_pos = (size // 2, 0), (size // 2, size - 1)
+
+    searches = (
+        ("bfs", bfs),
+        ("dijkstra", dijkstra),
+        ("astar", astar_search),
+        ("jump_point_search", jump_point_search),
+        ("d_star_lite", d_star_lite),
+    )
+    for name, search in searches:
+        stats = SearchStats()
+        search(grid, start_pos, end_pos, stats=stats)
+        print(f"{name}: {stats}")
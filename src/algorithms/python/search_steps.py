@@ -0,0 +1,140 @@
+"""
+Step-by-step Pathfinding
+
+Every grid pathfinder has a generator variant (bfs_steps, astar_steps,
+...) that yields compact (cell_index, event_code) pairs of ints instead
+of running to completion, with cell_index = row * cols + col:
+- EVENT_OPEN (0): the cell entered the frontier
+- EVENT_CLOSE (1): the cell was expanded
+- EVENT_PATH (2): the cell is on the final path; path cells come last,
+  in order from start to end
+
+The generator holds only the search state, never a trace, so a UI or a
+server can stream a search over a huge map frame by frame: take a bounded
+number of events per frame, stop taking to pause, continue to resume and
+close the generator to cancel. The path is also the generator's return
+value.
+
+StepRunner wraps one of these generators with that frame-by-frame API.
+"""
+
+from itertools import islice
+
+from astar import EVENT_CLOSE, EVENT_OPEN, EVENT_PATH, astar_steps
+from bellman_ford import bellman_ford_steps
+from bfs import bfs_steps
+from bidirectional_search import bidirectional_search_steps
+from d_star_lite import d_star_lite_steps
+from dijkstra import dijkstra_steps
+from greedy_best_first_search import greedy_best_first_search_steps
+from ida_star import ida_star_steps
+from jump_point_search import jump_point_search_steps
+
+EVENT_NAMES = {EVENT_OPEN: 'open', EVENT_CLOSE: 'close', EVENT_PATH: 'path'}
+
+
+def _ida_star_steps(grid, start, end):
+    return ida_star_steps(grid, start, end, len(grid), len(grid[0]))
+
+
+# Pathfinder name -> step generator(grid, start, end)
+STEPPERS = {
+    'bfs': bfs_steps,
+    'dijkstra': dijkstra_steps,
+    'astar': astar_steps,
+    'bidirectional_search': bidirectional_search_steps,
+    'greedy_best_first_search': greedy_best_first_search_steps,
+    'jump_point_search': jump_point_search_steps,
+    'bellman_ford': bellman_ford_steps,
+    'ida_star': _ida_star_steps,
+    'd_star_lite': d_star_lite_steps,
+}
+
+
+class StepRunner:
+    """
+    Drives a step generator a bounded number of events at a time.
+
+    Attributes:
+        done (bool): Whether the search finished or was cancelled
+        path (list): The path once the search finished (None until then,
+            and None if no path exists)
+        events (int): Events delivered so far
+    """
+
+    def __init__(self, algorithm, grid, start, end):
+        """
+        Start a step-by-step search (nothing runs until advance()).
+
+        Args:
+            algorithm (str): Name from STEPPERS
+            grid (list): 2D grid (0 = walkable, 1 = wall)
+            start (tuple): Starting position (row, col)
+            end (tuple): Target position (row, col)
+
+        Raises:
+            ValueError: If the algorithm is unknown
+        """
+        if algorithm not in STEPPERS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        self._steps = self._track(STEPPERS[algorithm](grid, start, end))
+        self.done = False
+        self.path = None
+        self.events = 0
+
+    def _track(self, steps):
+        self.path = yield from steps
+        self.done = True
+
+    def advance(self, max_events):
+        """
+        Run the search until it produced max_events more events or finished.
+
+        Args:
+            max_events (int): Most events to return
+
+        Returns:
+            list: (cell_index, event_code) pairs, empty once done
+        """
+        if self.done:
+            return []
+        events = list(islice(self._steps, max_events))
+        self.events += len(events)
+        return events
+
+    def cancel(self):
+        """Stop the search and release its state."""
+        self._steps.close()
+        self.done = True
+
+
+# Example usage and test
+if __name__ == "__main__":
+    import random
+    import time
+
+    size = 1000
+    rng = random.Random(3)
+    grid = [[1 if rng.random() < 0.3 else 0 for _ in range(size)] for _ in range(size)]
+    start_pos, end_pos = (0, 0), (size - 1, size - 1)
+    grid[0][0] = grid[size - 1][size - 1] = 0
+
+    # Stream an A* search over a 1000x1000 map in frames of 5000 events
+    runner = StepRunner('astar', grid, start_pos, end_pos)
+    frames, slowest = 0, 0.0
+    counts = dict.fromkeys(EVENT_NAMES.values(), 0)
+    while not runner.done:
+        t0 = time.perf_counter()
+        for _, code in runner.advance(5000):
+            counts[EVENT_NAMES[code]] += 1
+        slowest = max(slowest, time.perf_counter() - t0)
+        frames += 1
+    length = None if runner.path is None else len(runner.path)
+    print(f"astar: {frames} frames, slowest {slowest * 1000:.1f}ms, {counts}, path length {length}")
+
+    # Pause after a few frames of a BFS and cancel it
+    runner = StepRunner('bfs', grid, start_pos, end_pos)
+    for _ in range(3):
+        runner.advance(1000)
+    runner.cancel()
+    print(f"bfs cancelled after {runner.events} events, done: {runner.done}")
@@ -0,0 +1,413 @@
+"""
+Simplified Memory-bounded A* (SMA*)
+
+A* keeps every generated node, so on very large maps it can run out of
+memory before it reaches the goal. SMA* keeps at most `max_nodes` search
+nodes. It generates one successor at a time and expands the deepest node
+with the lowest f. When the budget is full it prunes the shallowest leaf
+with the highest f and stores the pruned f-value in the leaf's parent, so
+the parent knows what the forgotten subtree cost and can regenerate it
+when it becomes promising again. A node whose successors have all been
+generated backs the smallest f among them up to its ancestors.
+
+A node that cannot reach the goal within max_nodes cells (its depth plus
+the fewest moves left exceeds the budget) gets f = INF. Forgotten f-values
+stay with the parent and only grow, so when no path fits in memory the
+root's f rises to INF and the search returns None.
+
+Duplicate detection only looks at the nodes in memory: a successor whose
+cell is already held by a node with an equal or lower g is dominated (this
+covers cycles too) and waits on that node; a strictly better path to a
+held cell discards the old node's subtree. A waiter wakes up when the
+node it waits on is pruned (it gets that node's f as a forgotten value,
+so f-values only grow) or when the cell is taken over by a worse path.
+
+Properties:
+- never holds more than max_nodes nodes (and at most twice as many heap
+  entries)
+- optimal whenever the optimal path fits in memory (fewer than max_nodes
+  cells); otherwise it returns the best path it can fit, or None
+- below the budget it behaves like A* with the same movement model
+
+Movement models are astar's ('cardinal', 'octile', 'diagonal'), with the
+same no-corner-cutting rule.
+"""
+
+import heapq
+import itertools
+from collections import namedtuple
+
+from astar import MOVEMENT_MODELS, chebyshev_heuristic, heuristic
+
+# Result of an SMA* run: the path and its cost plus telemetry: node
+# generations, pruned leaves, regenerated (previously pruned) nodes and the
+# most nodes held at once
+SMAStarResult = namedtuple(
+    'SMAStarResult',
+    ['path', 'cost', 'expansions', 'prunes', 'reexpansions', 'peak_nodes'],
+)
+
+INF = float('inf')
+
+# Default node budget for sma_star()
+DEFAULT_MAX_NODES = 1 << 16
+
+
+class _Node:
+    """One search node; children and forgotten f-values are keyed by cell."""
+
+    __slots__ = ('cell', 'g', 'f', 'base_f', 'depth', 'parent', 'children', 'forgotten',
+                 'dominated', 'successors', 'stamp', 'in_open', 'alive')
+
+    def __init__(self, cell, g, f, depth, parent):
+        self.cell = cell
+        self.g = g
+        self.f = f
+        # f when generated, before any backup
+        self.base_f = f
+        self.depth = depth
+        self.parent = parent
+        self.children = {}
+        self.forgotten = {}
+        # Successor cells held elsewhere by a better path -> g through here
+        self.dominated = {}
+        self.successors = None
+        self.stamp = 0
+        self.in_open = False
+        self.alive = True
+
+
+def sma_star_search(grid, start, end, max_nodes=DEFAULT_MAX_NODES, movement='cardinal'):
+    """
+    SMA* search engine.
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        max_nodes (int): Most search nodes held in memory at once
+        movement (str): 'cardinal', 'octile' or 'diagonal' (see astar)
+
+    Returns:
+        SMAStarResult: (path, cost, expansions, prunes, reexpansions,
+        peak_nodes); path and cost are None if no path fits in memory
+
+    Raises:
+        ValueError: If the movement model is unknown or max_nodes < 2
+    """
+    if movement not in MOVEMENT_MODELS:
+        raise ValueError(f"Unknown movement model: {movement}")
+    if max_nodes < 2:
+        raise ValueError("max_nodes must be at least 2")
+
+    moves, h = MOVEMENT_MODELS[movement]
+    # Fewest moves between two cells, whatever they cost
+    steps = heuristic if movement == 'cardinal' else chebyshev_heuristic
+    rows, cols = len(grid), len(grid[0])
+    telemetry = {'expansions': 0, 'prunes': 0, 'reexpansions': 0}
+    peak_nodes = 0
+
+    def result(path, cost):
+        return SMAStarResult(path, cost, telemetry['expansions'], telemetry['prunes'],
+                             telemetry['reexpansions'], peak_nodes)
+
+    if grid[start[0]][start[1]] != 0 or grid[end[0]][end[1]] != 0:
+        return result(None, None)
+
+    # The deepest path that fits in memory has max_nodes cells: a node
+    # that cannot reach the goal within that depth has f = INF
+    max_depth = max_nodes - 1
+    counter = itertools.count()
+
+    # Open nodes live in two lazily invalidated heaps: best (lowest f,
+    # deepest) for expansion and worst (highest f, shallowest) for pruning.
+    # An entry is live while its stamp matches the node's; stale entries
+    # are swept out once a heap grows past twice the node budget.
+    best_heap = []
+    worst_heap = []
+
+    # Nodes in memory by cell (at most one per cell) and, per cell, the
+    # nodes whose successor there is dominated by the held node (dicts used
+    # as ordered sets, so waiters wake in a reproducible order)
+    memory = {}
+    waiting = {}
+
+    def successors(node):
+        if node.successors is None:
+            row, col = node.cell
+            node.successors = []
+            for dr, dc, step_cost in moves:
+                new_row, new_col = row + dr, col + dc
+                if not (0 <= new_row < rows and 0 <= new_col < cols) or grid[new_row][new_col] != 0:
+                    continue
+                if dr != 0 and dc != 0 and (grid[row][new_col] != 0 or grid[new_row][col] != 0):
+                    continue
+                node.successors.append(((new_row, new_col), step_cost))
+        return node.successors
+
+    def pending(node):
+        """Successors the node can still generate, fresh or forgotten."""
+        return [(cell, cost) for cell, cost in successors(node)
+                if cell not in node.children and cell not in node.dominated]
+
+    def open_node(node):
+        # Key: the f of the best successor this node can still generate.
+        # Never-generated successors are bounded by f itself; if only
+        # forgotten ones remain, their stored f-values are the better bound
+        key = node.f
+        candidates = pending(node)
+        if candidates and all(cell in node.forgotten for cell, _ in candidates):
+            key = max(node.f, min(node.forgotten[cell] for cell, _ in candidates))
+        node.stamp += 1
+        node.in_open = True
+        order = next(counter)
+        heapq.heappush(best_heap, (key, -node.depth, order, node.stamp, node))
+        heapq.heappush(worst_heap, (-key, node.depth, order, node.stamp, node))
+        if len(best_heap) > 2 * max_nodes or len(worst_heap) > 2 * max_nodes:
+            compact()
+
+    def compact():
+        # Stale entries would keep pruned nodes alive past the budget
+        for heap in (best_heap, worst_heap):
+            heap[:] = [entry for entry in heap if entry[3] == entry[4].stamp and entry[4].in_open]
+            heapq.heapify(heap)
+
+    def close_node(node):
+        node.stamp += 1
+        node.in_open = False
+
+    def peek(heap):
+        while heap and (heap[0][3] != heap[0][4].stamp or not heap[0][4].in_open):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def backup(node):
+        # Propagate the smallest f of fully generated nodes up the tree;
+        # dominated successors are covered by the node that holds their cell
+        while node is not None and all(cell in node.forgotten for cell, _ in pending(node)):
+            new_f = min(
+                itertools.chain((child.f for child in node.children.values()),
+                                (f for cell, f in node.forgotten.items()
+                                 if cell not in node.children and cell not in node.dominated)),
+                default=INF,
+            )
+            # f only grows: a woken successor was covered by its holder all along
+            if new_f <= node.f:
+                return
+            node.f = new_f
+            if node.in_open:
+                open_node(node)
+            node = node.parent
+
+    def refresh(node):
+        """Keep a node open while it can still generate a successor or is a leaf."""
+        if pending(node) or not node.children:
+            open_node(node)
+        else:
+            close_node(node)
+        backup(node)
+
+    def waiters(cell):
+        return [waiter for waiter in waiting.pop(cell, ())
+                if waiter.alive and cell in waiter.dominated]
+
+    def wake(waiter, cell, f):
+        # The successor is no longer covered: remember a lower bound for it
+        del waiter.dominated[cell]
+        remember(waiter, cell, max(waiter.base_f, f))
+        refresh(waiter)
+
+    def forget(node):
+        """Take a node out of memory and out of the waiting lists it is on."""
+        node.alive = False
+        close_node(node)
+        del memory[node.cell]
+        node.children = {}
+        for cell in node.dominated:
+            nodes = waiting.get(cell)
+            if nodes is not None:
+                nodes.pop(node, None)
+                if not nodes:
+                    del waiting[cell]
+
+    def release(node):
+        """Take a pruned node out of memory and wake the nodes waiting on its cell."""
+        forget(node)
+        for waiter in waiters(node.cell):
+            wake(waiter, node.cell, node.f)
+
+    def remember(node, cell, f):
+        # Forgotten f-values only grow, so what a node has learned about a
+        # successor survives pruning, regeneration and waiting
+        node.forgotten[cell] = max(f, node.forgotten.get(cell, f))
+
+    def wait_on(node, cell, g):
+        node.dominated[cell] = g
+        waiting.setdefault(cell, {})[node] = None
+
+    def prune(keep):
+        """Forget the worst open leaf other than `keep`; False if none exists."""
+        skipped = []
+        victim = None
+        while peek(worst_heap) is not None:
+            entry = heapq.heappop(worst_heap)
+            candidate = entry[4]
+            if candidate.children:
+                # Not a leaf; it is pushed again if it becomes one
+                continue
+            if candidate is keep or candidate is root:
+                skipped.append(entry)
+                continue
+            victim = candidate
+            break
+        for entry in skipped:
+            heapq.heappush(worst_heap, entry)
+        if victim is None:
+            return False
+
+        parent = victim.parent
+        release(victim)
+        del parent.children[victim.cell]
+        remember(parent, victim.cell, victim.f)
+        telemetry['prunes'] += 1
+        refresh(parent)
+        return True
+
+    def discard(node):
+        """
+        Drop a node reached by a worse path, with its whole subtree. Nodes
+        waiting on the dropped cells keep waiting: the better path reaches
+        them with a lower g, and a worse holder wakes them (see below).
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            stack.extend(current.children.values())
+            forget(current)
+        del node.parent.children[node.cell]
+        remember(node.parent, node.cell, node.f)
+        wait_on(node.parent, node.cell, node.g)
+        refresh(node.parent)
+
+    root = _Node(start, 0, h(start, end) if steps(start, end) <= max_depth else INF, 0, None)
+    memory[start] = root
+    open_node(root)
+    peak_nodes = 1
+
+    while True:
+        top = peek(best_heap)
+        if top is None or top[0] == INF:
+            return result(None, None)
+        node = top[4]
+
+        if node.cell == end:
+            path = []
+            current = node
+            while current is not None:
+                path.append(current.cell)
+                current = current.parent
+            return result(path[::-1], node.g)
+
+        # Next successor not in memory: a never-generated one first,
+        # otherwise the forgotten one with the lowest stored f
+        candidates = pending(node)
+        if not candidates:
+            refresh(node)
+            continue
+        fresh = [(cell, cost) for cell, cost in candidates if cell not in node.forgotten]
+        if fresh:
+            cell, step_cost = fresh[0]
+        else:
+            cell, step_cost = min(candidates, key=lambda item: node.forgotten[item[0]])
+
+        g = node.g + step_cost
+        held = memory.get(cell)
+        if held is not None and held.g <= g:
+            # Dominated (this also rules out cycles)
+            wait_on(node, cell, g)
+            refresh(node)
+            continue
+        if held is not None:
+            # Strictly better path: the old subtree is dominated
+            discard(held)
+
+        if len(memory) >= max_nodes and not prune(node):
+            return result(None, None)
+
+        depth = node.depth + 1
+        if depth + steps(cell, end) > max_depth:
+            f = INF
+        else:
+            f = max(node.f, g + h(cell, end))
+        if cell in node.forgotten:
+            f = max(f, node.forgotten[cell])
+            telemetry['reexpansions'] += 1
+        child = _Node(cell, g, f, depth, node)
+        node.children[cell] = child
+        memory[cell] = child
+        # Waiters with a better path than the new holder are not covered
+        remaining = {}
+        for waiter in waiters(cell):
+            if waiter.dominated[cell] < g:
+                wake(waiter, cell, waiter.base_f)
+            else:
+                remaining[waiter] = None
+        if remaining:
+            waiting[cell] = remaining
+        open_node(child)
+        telemetry['expansions'] += 1
+        peak_nodes = max(peak_nodes, len(memory))
+        refresh(node)
+
+
+def sma_star(grid, start, end, max_nodes=DEFAULT_MAX_NODES):
+    """
+    SMA* pathfinding with the same signature as astar plus a node budget.
+
+    Args:
+        grid (list): 2D grid representing the map (0 = walkable, 1 = wall)
+        start (tuple): Starting position (row, col)
+        end (tuple): Target position (row, col)
+        max_nodes (int): Most search nodes held in memory at once
+
+    Returns:
+        list: Path from start to end as list of (row, col) tuples, or None if no path exists
+    """
+    return sma_star_search(grid, start, end, max_nodes).path
+
+
+# Example usage and test
+if __name__ == "__main__":
+    from astar import astar_search
+
+    # Rooms joined by doors at alternating ends: the frontier spreads
+    # through every room before the goal is reached
+    def rooms_map(size, spacing):
+        grid = [[0] * size for _ in range(size)]
+        for r in range(spacing - 1, size, spacing):
+            for c in range(size):
+                grid[r][c] = 1
+            grid[r][1 if (r // spacing) % 2 == 0 else size - 2] = 0
+        return grid
+
+    size = 40
+    rooms = rooms_map(size, 6)
+
+    start_pos, end_pos = (0, 0), (size - 1, size - 1)
+    reference = astar_search(rooms, start_pos, end_pos)
+    print(f"astar: cost {reference.cost}, {reference.expansions} expansions")
+
+    for budget in (2000, 600, 300):
+        result = sma_star_search(rooms, start_pos, end_pos, max_nodes=budget)
+        print(f"SMA* max_nodes={budget}: cost {result.cost}, peak {result.peak_nodes} nodes, "
+              f"{result.expansions} generated, {result.prunes} prunes, "
+              f"{result.reexpansions} regenerated")
+
+    # Budgets below the path length: no path fits, so the root's f rises
+    # to INF and the search gives up
+    small = rooms_map(13, 3)
+    reference = astar_search(small, (0, 0), (12, 12))
+    for grid, budget in ((small, len(reference.path) - 1), ([[0] * 12 for _ in range(12)], 20)):
+        result = sma_star_search(grid, (0, 0), (len(grid) - 1, len(grid) - 1), max_nodes=budget)
+        print(f"{len(grid)}x{len(grid)} map, max_nodes={budget}: path {result.path}, "
+              f"{result.expansions} generated, {result.prunes} prunes")
@@ -0,0 +1,336 @@
+"""
+Dead-end and Swamp Pruning
+
+On maps made of rooms and corridors most of a search's expansions are
+spent inside rooms that cannot lie on the path: a region that is joined to
+the rest of the map through a single door cell can only be entered and
+left through that door, so a simple path between two cells outside the
+region never passes through it. Such a region (a dead end, the simplest
+kind of swamp) only has to be searched when the start or the goal lies
+inside it.
+
+Preprocessing finds these regions with one depth-first search over the
+grid (Tarjan's articulation points): the DFS subtree below a door cell
+that none of its cells can bypass is a region. Regions nest (a closet
+inside a dead-end room is a region of its own), so every cell stores the
+innermost region it belongs to in a flat `array('i')` mask, 0 for cells
+outside every region, and every region stores the region around it.
+
+At query time a region is skipped unless it contains the start or the
+goal, or encloses a region that does. The pruned grid with every region
+walled off is built once; a query reopens only the regions around its
+endpoints, so the search loop itself is unchanged. astar, astar_search and
+dijkstra take the table as their `swamps` argument.
+
+Regions are exact for 4-connected moves and for diagonal moves that never
+cut corners (astar's 'octile' and 'diagonal' models): such a diagonal step
+is only allowed when both cells it squeezes between are walkable, so it
+never bypasses a door cell.
+
+Preprocessing: O(V) time, one int per cell (plus one per region)
+Query: O(cells and rows of the reopened regions)
+"""
+
+import struct
+from array import array
+
+from alt_landmarks import grid_checksum
+
+# Region of cells outside every dead end (and of walls)
+OUTSIDE = 0
+
+_MAGIC = b'SWMP'
+_HEADER = struct.Struct('<4sIIII')
+
+
+class SwampTable:
+    """
+    Dead-end regions of one static grid.
+
+    Args:
+        grid (list): 2D grid (0 = walkable, 1 = wall), kept by reference
+        regions (array): Innermost region of every cell, indexed by
+            row * cols + col (OUTSIDE for cells in no region)
+        parents (array): Region -> the region enclosing it (OUTSIDE for
+            top-level regions); entry 0 belongs to OUTSIDE itself
+        checksum (int): grid_checksum() of the grid the table was built for
+    """
+
+    def __init__(self, grid, regions, parents, checksum):
+        self.grid = grid
+        self.rows, self.cols = len(grid), len(grid[0])
+        self.regions = regions
+        self.parents = parents
+        self.checksum = checksum
+        # The grid with every region walled off, and the cells of every region
+        self._pruned, self._cells = self._wall_off()
+
+    @classmethod
+    def build(cls, grid):
+        """
+        Find the dead-end regions of a grid.
+
+        Args:
+            grid (list): 2D grid (0 = walkable, 1 = wall)
+
+        Returns:
+            SwampTable: The regions of the grid
+
+        Raises:
+            ValueError: If the grid is empty or its rows differ in length
+        """
+        if not grid or not grid[0]:
+            raise ValueError("Grid cannot be empty")
+        rows, cols = len(grid), len(grid[0])
+        if any(len(row) != cols for row in grid):
+            raise ValueError("All grid rows must have the same length")
+
+        size = rows * cols
+        walls = bytes(1 if cell else 0 for row in grid for cell in row)
+        # DFS discovery order (0 = not visited yet), low-link, tree parent
+        disc = array('i', [0]) * size
+        low = array('i', [0]) * size
+        tree_parent = array('i', [-1]) * size
+        # Cells whose DFS subtree is cut off by their tree parent
+        cut = bytearray(size)
+        order = array('i')
+
+        def neighbours(index):
+            row, col = divmod(index, cols)
+            if row > 0 and not walls[index - cols]:
+                yield index - cols
+            if row < rows - 1 and not walls[index + cols]:
+                yield index + cols
+            if col > 0 and not walls[index - 1]:
+                yield index - 1
+            if col < cols - 1 and not walls[index + 1]:
+                yield index + 1
+
+        counter = 0
+        for root in range(size):
+            if walls[root] or disc[root]:
+                continue
+            counter += 1
+            disc[root] = low[root] = counter
+            order.append(root)
+            root_children = []
+            stack = [(root, neighbours(root))]
+            while stack:
+                index, pending = stack[-1]
+                for neighbour in pending:
+                    if not disc[neighbour]:
+                        counter += 1
+                        disc[neighbour] = low[neighbour] = counter
+                        tree_parent[neighbour] = index
+                        order.append(neighbour)
+                        if index == root:
+                            root_children.append(neighbour)
+                        stack.append((neighbour, neighbours(neighbour)))
+                        break
+                    if neighbour != tree_parent[index] and disc[neighbour] < low[index]:
+                        low[index] = disc[neighbour]
+                else:
+                    stack.pop()
+                    parent = tree_parent[index]
+                    if parent != -1:
+                        if low[index] < low[parent]:
+                            low[parent] = low[index]
+                        if low[index] >= disc[parent]:
+                            cut[index] = 1
+            if len(root_children) == 1:
+                # The root is no door when it has a single subtree: that
+                # subtree is everything else
+                cut[root_children[0]] = 0
+
+        # Innermost region of every cell, in DFS order so a cell's tree
+        # parent is labelled first
+        regions = array('i', [OUTSIDE]) * size
+        parents = array('i', [OUTSIDE])
+        for index in order:
+            parent = tree_parent[index]
+            outer = OUTSIDE if parent == -1 else regions[parent]
+            if cut[index]:
+                regions[index] = len(parents)
+                parents.append(outer)
+            else:
+                regions[index] = outer
+        return cls(grid, regions, parents, grid_checksum(grid))
+
+    def save(self, path):
+        """
+        Write the table to a binary file (header + little-endian arrays).
+
+        Args:
+            path (str): Destination file path
+        """
+        regions = array('i', self.regions)
+        parents = array('i', self.parents)
+        if struct.pack('=I', 1) != struct.pack('<I', 1):
+            regions.byteswap()
+            parents.byteswap()
+        with open(path, 'wb') as handle:
+            handle.write(_HEADER.pack(_MAGIC, self.rows, self.cols, len(parents), self.checksum))
+            regions.tofile(handle)
+            parents.tofile(handle)
+
+    @classmethod
+    def load(cls, path, grid):
+        """
+        Read a table written by save() for the given grid.
+
+        Args:
+            path (str): Source file path
+            grid (list): The grid the table was built for
+
+        Returns:
+            SwampTable: The loaded table
+
+        Raises:
+            ValueError: If the file is not a swamp table or belongs to another grid
+        """
+        with open(path, 'rb') as handle:
+            magic, rows, cols, count, checksum = _HEADER.unpack(handle.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a swamp table file")
+            regions = array('i')
+            regions.fromfile(handle, rows * cols)
+            parents = array('i')
+            parents.fromfile(handle, count)
+        if struct.pack('=I', 1) != struct.pack('<I', 1):
+            regions.byteswap()
+            parents.byteswap()
+        if (len(grid), len(grid[0])) != (rows, cols) or grid_checksum(grid) != checksum:
+            raise ValueError("Swamp table does not match the grid")
+        return cls(grid, regions, parents, checksum)
+
+    @property
+    def region_count(self):
+        """Number of dead-end regions."""
+        return len(self.parents) - 1
+
+    def region(self, cell):
+        """
+        Innermost region containing a cell.
+
+        Args:
+            cell (tuple): Position (row, col)
+
+        Returns:
+            int: Region number, OUTSIDE if the cell lies in no region
+        """
+        return self.regions[cell[0] * self.cols + cell[1]]
+
+    def prune(self, grid, start, end):
+        """
+        The grid as a search between start and end needs to see it.
+
+        Every region that contains neither endpoint reads as wall. Rows
+        without reopened cells are shared between queries, so the result
+        must not be modified.
+
+        Args:
+            grid (list): The grid the table was built for
+            start (tuple): Starting position (row, col)
+            end (tuple): Target position (row, col)
+
+        Returns:
+            list: 2D grid (0 = walkable, 1 = wall)
+
+        Raises:
+            ValueError: If grid is not the grid the table was built for
+        """
+        if grid is not self.grid:
+            raise ValueError("Swamp table was built for a different grid")
+        reopened = self._reopened(start, end)
+        if not reopened:
+            return self._pruned
+
+        view = list(self._pruned)
+        cols = self.cols
+        for region in reopened:
+            for index in self._cells[region]:
+                row, col = divmod(index, cols)
+                line = view[row]
+                if line is self._pruned[row]:
+                    line = view[row] = list(line)
+                line[col] = 0
+        return view
+
+    def _reopened(self, start, end):
+        """Regions around the endpoints, which the query has to search."""
+        reopened = set()
+        for row, col in (start, end):
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                continue
+            region = self.regions[row * self.cols + col]
+            while region != OUTSIDE and region not in reopened:
+                reopened.add(region)
+                region = self.parents[region]
+        return reopened
+
+    def _wall_off(self):
+        """The grid with every region read as wall, and the cells of every region."""
+        cols = self.cols
+        cells = [array('i') for _ in self.parents]
+        pruned = []
+        for row, line in enumerate(self.grid):
+            base = row * cols
+            copy = None
+            for col in range(cols):
+                region = self.regions[base + col]
+                if region != OUTSIDE:
+                    cells[region].append(base + col)
+                    if copy is None:
+                        copy = list(line)
+                    copy[col] = 1
+            pruned.append(line if copy is None else copy)
+        return pruned, cells
+
+
+# Example usage and benchmark
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    from astar import astar_search
+    from pathfinding_benchmark import maze_map
+    from search_stats import SearchStats
+
+    # Corridors with rooms hanging off them through a single door
+    size = 121
+    rng = random.Random(4)
+    test_grid = [[1] * size for _ in range(size)]
+    for row in range(0, size, 12):
+        for col in range(size):
+            test_grid[row][col] = 0
+    for col in range(0, size, 24):
+        for row in range(size):
+            test_grid[row][col] = 0
+    for top in range(2, size - 10, 12):
+        for left in range(2, size - 10, 12):
+            for row in range(top, top + 9):
+                for col in range(left, left + 9):
+                    test_grid[row][col] = 0
+            # One door to the corridor above
+            test_grid[top - 1][left + rng.randrange(9)] = 0
+
+    maps = (("rooms", test_grid), ("maze", maze_map(121, 4)))
+    for name, grid in maps:
+        table = SwampTable.build(grid)
+        free_cells = [(r, c) for r in range(size) for c in range(size) if grid[r][c] == 0]
+        queries = [(rng.choice(free_cells), rng.choice(free_cells)) for _ in range(30)]
+        plain, pruned = SearchStats(), SearchStats()
+        for start_pos, end_pos in queries:
+            expected = astar_search(grid, start_pos, end_pos, stats=plain)
+            result = astar_search(grid, start_pos, end_pos, stats=pruned, swamps=table)
+            assert result.cost == expected.cost
+        reduction = 1 - pruned.expansions / plain.expansions
+        print(f"{name}: {table.region_count} regions, astar expansions "
+              f"{plain.expansions} -> {pruned.expansions} ({reduction:.0%} fewer)")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'map.swamps')
+            table.save(path)
+            loaded = SwampTable.load(path, grid)
+            assert loaded.regions == table.regions and loaded.parents == table.parents
+            print(f"  saved and reloaded table ({os.path.getsize(path)} bytes)")